@@ -0,0 +1,72 @@
+# benchmarks/bench_async_db.py
+
+"""
+Benchmark: Blocking vs Async DB Access
+--------------------------------------
+
+Measures how many bot updates per second a single event loop can serve
+when every update performs one DB round trip.
+
+ - "blocking" calls the driver directly inside the coroutine
+   (what the handlers did before core/async_database.py)
+ - "async"    routes the same call through core.async_database.run_sync
+
+The DB round trip is simulated with time.sleep() so the benchmark runs
+without a MongoDB server; pymongo blocks the calling thread in exactly
+the same way.
+
+Run via:
+    python benchmarks/bench_async_db.py
+    python benchmarks/bench_async_db.py --updates 500 --latency-ms 5
+"""
+
+import sys
+sys.path.append(".")
+
+import argparse
+import asyncio
+import time
+
+from core.async_database import run_sync, shutdown_executor
+
+
+def fake_round_trip(latency: float):
+    time.sleep(latency)
+    return {"ok": 1}
+
+
+async def handle_blocking(latency: float):
+    return fake_round_trip(latency)
+
+
+async def handle_async(latency: float):
+    return await run_sync(fake_round_trip, latency)
+
+
+async def run(handler, updates: int, latency: float) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(handler(latency) for _ in range(updates)))
+    elapsed = time.perf_counter() - start
+    return updates / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Blocking vs async DB access")
+    parser.add_argument("--updates", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+
+    blocking = asyncio.run(run(handle_blocking, args.updates, latency))
+    non_blocking = asyncio.run(run(handle_async, args.updates, latency))
+    shutdown_executor()
+
+    print(f"updates={args.updates} latency={args.latency_ms}ms")
+    print(f"blocking : {blocking:10.1f} updates/sec")
+    print(f"async    : {non_blocking:10.1f} updates/sec")
+    print(f"speedup  : {non_blocking / blocking:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
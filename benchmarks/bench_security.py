@@ -0,0 +1,200 @@
+# benchmarks/bench_security.py
+
+"""
+Benchmark + Regression Check: Security Primitives
+-------------------------------------------------
+
+Measures ops/sec and p99 latency of every primitive that runs on each
+deep-link / redirect request, across realistic payload sizes:
+
+ - TokenEncryptor.encode_payload / decode_payload (uncached + cached)
+ - SignatureChecker.generate_signature / pack / unpack_and_verify
+ - HashUtils.sha256 / sha1_short / checksum / verify_sha256
+
+Results are compared against benchmarks/security_thresholds.json:
+
+{
+  "<case>": {"min_ops_per_sec": 10000, "max_p99_us": 150.0},
+  ...
+}
+
+The process exits with status 1 if any case is slower than its
+threshold, so it can gate CI.
+
+Run via:
+    python benchmarks/bench_security.py
+    python benchmarks/bench_security.py --iterations 20000 --json results.json
+    python benchmarks/bench_security.py --write-thresholds   # re-baseline
+"""
+
+import sys
+sys.path.append(".")
+
+import argparse
+import json
+import os
+import time
+
+from core.security.token_encryptor import TokenEncryptor
+from core.security.signature_checker import SignatureChecker
+from core.utils.hashing import HashUtils
+
+
+DEFAULT_THRESHOLDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "security_thresholds.json")
+
+# Re-baseline margins: keep headroom for noisy CI machines
+OPS_MARGIN = 0.5
+P99_MARGIN = 3.0
+# Sub-microsecond ops are dominated by timer/scheduler jitter at p99
+P99_FLOOR_US = 20.0
+
+
+# -----------------------------------------------------------
+# REALISTIC PAYLOADS
+# -----------------------------------------------------------
+FILE_ID = "BQACAgUAAxkBAAIBZ2Vx3f1kR8yq0Qm5cZ2Y7u9sTQABAh4LAAJvF1lVbq1nCqXgH3AzBA"
+
+PAYLOADS = {
+    # get_ / click_ links in public posts
+    "small": {"action": "get", "file_id": FILE_ID, "post_no": 19},
+    # verify_ / verified_ tokens
+    "medium": {"action": "verify", "user_id": 5123456789, "file_id": FILE_ID, "post_no": 19, "ts": 1760000000},
+    # worst case: long metadata
+    "large": {"action": "get", "file_id": FILE_ID, "post_no": 19, "note": "x" * 900},
+}
+
+
+def build_cases() -> list:
+    """
+    Returns [(name, callable)], each callable runs ONE operation.
+    """
+    cases = []
+
+    for size, payload in PAYLOADS.items():
+        token = TokenEncryptor.encode_payload(payload)
+        data = json.dumps(payload, separators=(",", ":"))
+        packet = SignatureChecker.pack(token)
+        digest = HashUtils.sha256(data)
+
+        cases += [
+            (f"encode_payload[{size}]", lambda p=payload: TokenEncryptor.encode_payload(p)),
+            (f"decode_payload_uncached[{size}]", lambda t=token: TokenEncryptor.decode_payload(t, use_cache=False)),
+            (f"decode_payload_cached[{size}]", lambda t=token: TokenEncryptor.decode_payload(t)),
+            (f"generate_signature[{size}]", lambda d=data: SignatureChecker.generate_signature(d)),
+            (f"pack[{size}]", lambda t=token: SignatureChecker.pack(t)),
+            (f"unpack_and_verify[{size}]", lambda p=packet: SignatureChecker.unpack_and_verify(p)),
+            (f"sha256[{size}]", lambda d=data: HashUtils.sha256(d)),
+            (f"sha1_short[{size}]", lambda d=data: HashUtils.sha1_short(d)),
+            (f"checksum[{size}]", lambda d=data: HashUtils.checksum(d)),
+            (f"verify_sha256[{size}]", lambda d=data, h=digest: HashUtils.verify_sha256(d, h)),
+        ]
+
+    return cases
+
+
+# -----------------------------------------------------------
+# MEASUREMENT
+# -----------------------------------------------------------
+def measure(fn, iterations: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        fn()
+
+    timer = time.perf_counter_ns
+    samples = [0] * iterations
+
+    start = timer()
+    for i in range(iterations):
+        t0 = timer()
+        fn()
+        samples[i] = timer() - t0
+    elapsed = (timer() - start) / 1e9
+
+    samples.sort()
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+
+    return {
+        "ops_per_sec": iterations / elapsed,
+        "p50_us": samples[len(samples) // 2] / 1000,
+        "p99_us": p99 / 1000,
+    }
+
+
+def check(results: dict, thresholds: dict) -> list:
+    """
+    Returns list of regression messages.
+    """
+    failures = []
+    for name, result in results.items():
+        limit = thresholds.get(name)
+        if not limit:
+            continue
+
+        if result["ops_per_sec"] < limit.get("min_ops_per_sec", 0):
+            failures.append(
+                f"{name}: {result['ops_per_sec']:.0f} ops/s < {limit['min_ops_per_sec']:.0f}"
+            )
+        if result["p99_us"] > limit.get("max_p99_us", float("inf")):
+            failures.append(
+                f"{name}: p99 {result['p99_us']:.1f} us > {limit['max_p99_us']:.1f}"
+            )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Security primitives benchmark / regression check")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=500)
+    parser.add_argument("--filter", default="", help="only run cases containing this text")
+    parser.add_argument("--thresholds", default=DEFAULT_THRESHOLDS)
+    parser.add_argument("--write-thresholds", action="store_true",
+                        help="write thresholds from this run (with safety margins) and exit 0")
+    parser.add_argument("--json", help="also write raw results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'case':40} {'ops/sec':>12} {'p50 us':>9} {'p99 us':>9}")
+    for name, fn in build_cases():
+        if args.filter and args.filter not in name:
+            continue
+        result = measure(fn, args.iterations, args.warmup)
+        results[name] = result
+        print(f"{name:40} {result['ops_per_sec']:12.0f} {result['p50_us']:9.1f} {result['p99_us']:9.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.write_thresholds:
+        thresholds = {
+            name: {
+                "min_ops_per_sec": round(result["ops_per_sec"] * OPS_MARGIN),
+                "max_p99_us": round(max(result["p99_us"] * P99_MARGIN, P99_FLOOR_US), 1),
+            }
+            for name, result in results.items()
+        }
+        with open(args.thresholds, "w") as f:
+            json.dump(thresholds, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nThresholds written to {args.thresholds}")
+        return 0
+
+    if not os.path.exists(args.thresholds):
+        print(f"\nNo thresholds file ({args.thresholds}); nothing to check.")
+        return 0
+
+    with open(args.thresholds) as f:
+        thresholds = json.load(f)
+
+    failures = check(results, thresholds)
+    if failures:
+        print("\nREGRESSIONS:")
+        for failure in failures:
+            print(f"  ✖ {failure}")
+        return 1
+
+    print(f"\nAll {len(results)} cases within thresholds ✔")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+# benchmarks/load_redirect.py
+
+"""
+Load Test: Redirect Server Verification Flow
+--------------------------------------------
+
+Drives the full /redirect → /return flow the way a browser does and
+reports how many verifications per second the server sustains.
+
+Every flow:
+ 1. GET /redirect?token=<token>      (visit ticket arrives as a cookie;
+    with REDIRECT_STATIC_PAGE the page is token-free, so the flow
+    POSTs /visit?token=<token> for the cookie, like the page script)
+ 2. optional wait (--dwell)
+ 3. GET /return?result=verified&token=<token>   (cookie sent back)
+ 4. classify the outcome from the Telegram deep-link in Location:
+    verified / bypass, or replay / invalid / http / error
+
+Tokens are created up front with `encode_payload`, one per flow (the
+server rejects reused verification links), so the server must share
+TOKEN_SECRET / TOKEN_KEYS with this process (same .env).
+
+Targets:
+    --url http://host:port        an already running server
+    --serve memory                spawn a server on an in-memory Mongo
+                                  stand-in (needs `mongomock`)
+    --serve mongod                spawn a server against MONGO_URI
+
+Spawned servers run with VERIFY_MIN_DWELL_SECONDS=--dwell (default 0),
+otherwise every flow faster than the countdown counts as a bypass.
+
+Run via:
+    python benchmarks/load_redirect.py --serve memory --flows 5000 --concurrency 100
+    python benchmarks/load_redirect.py --url http://127.0.0.1:5000 --json run1.json
+"""
+
+import sys
+sys.path.append(".")
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import subprocess
+import time
+from urllib.parse import parse_qs, urlparse
+
+import aiohttp
+
+
+OUTCOMES = ("verified", "bypass", "replay", "invalid", "http", "error")
+
+
+# -----------------------------------------------------------
+# SERVER (spawned in a child process)
+# -----------------------------------------------------------
+def serve(mode: str, port: int, workers: int):
+    """
+    Child process entry: run the redirect app on 127.0.0.1:<port>.
+    """
+    import uvicorn
+    from core import database
+
+    if mode == "memory":
+        try:
+            import mongomock
+        except ImportError:
+            sys.exit("--serve memory needs `pip install mongomock` (or use --serve mongod)")
+
+        def init_memory_db():
+            database.db = mongomock.MongoClient()[database.config.MONGO_DB_NAME]
+            return database.db
+
+        # redirect_main imports init_db by name: patch before importing it
+        database.init_db = init_memory_db
+        workers = 1     # each worker would get its own empty database
+
+    from redirect_server.redirect_main import app
+
+    if workers > 1:
+        uvicorn.run("redirect_server.redirect_main:app", host="127.0.0.1", port=port,
+                    workers=workers, log_level="warning")
+    else:
+        uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def spawn_server(mode: str, port: int, workers: int, dwell: float) -> subprocess.Popen:
+    if mode == "memory" and importlib.util.find_spec("mongomock") is None:
+        sys.exit("--serve memory needs `pip install mongomock` (or use --serve mongod)")
+
+    env = dict(os.environ, VERIFY_MIN_DWELL_SECONDS=str(int(dwell)))
+    # Per-request log lines still go to logs/redirect_server.log (as in
+    # production), only the console copy is dropped
+    return subprocess.Popen(
+        [sys.executable, __file__, "--_server", mode, "--port", str(port), "--workers", str(workers)],
+        env=env,
+        stderr=subprocess.DEVNULL
+    )
+
+
+async def wait_ready(url: str, server: subprocess.Popen = None, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            if server is not None and server.poll() is not None:
+                raise RuntimeError(f"Server exited with code {server.returncode}")
+            try:
+                async with session.get(f"{url}/") as resp:
+                    if resp.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not become ready in {timeout}s")
+
+
+# -----------------------------------------------------------
+# TOKENS
+# -----------------------------------------------------------
+def build_tokens(count: int) -> list:
+    from core.security.token_encryptor import TokenEncryptor
+
+    base_user = 7_000_000_000
+    return [
+        TokenEncryptor.encode_payload({
+            "user_id": base_user + i,
+            "file_id": "BQACAgUAAxkBAAIBZ2Vx3f1kR8yq0Qm5cZ2Y7u9sTQABAh4LAAJvF1lVbq1nCqXgH3AzBA",
+            "post_no": i % 500 + 1
+        })
+        for i in range(count)
+    ]
+
+
+# -----------------------------------------------------------
+# ONE FLOW
+# -----------------------------------------------------------
+def classify(location: str) -> str:
+    start = parse_qs(urlparse(location).query).get("start", [""])[0]
+    if start.startswith("verified_"):
+        return "verified"
+    if start.startswith("bypass_"):
+        return "bypass"
+    return "invalid"
+
+
+async def run_flow(session: aiohttp.ClientSession, url: str, token: str, dwell: float, stats: dict):
+    t0 = time.perf_counter()
+    try:
+        async with session.get(f"{url}/redirect", params={"token": token}) as resp:
+            page = await resp.read()
+            if resp.status != 200:
+                stats["outcomes"]["http"] += 1
+                return
+        if b"STATIC_PAGE = true" in page:
+            async with session.post(f"{url}/visit", params={"token": token}) as resp:
+                await resp.read()
+                if resp.status != 200:
+                    stats["outcomes"]["invalid" if resp.status == 400 else "http"] += 1
+                    return
+        t1 = time.perf_counter()
+        stats["redirect"].append(t1 - t0)
+
+        if dwell:
+            await asyncio.sleep(dwell)
+
+        t2 = time.perf_counter()
+        async with session.get(
+            f"{url}/return",
+            params={"result": "verified", "token": token},
+            allow_redirects=False
+        ) as resp:
+            body = await resp.read()
+            t3 = time.perf_counter()
+
+            if resp.status in (302, 303, 307):
+                outcome = classify(resp.headers.get("Location", ""))
+            elif resp.status == 200 and b"already used" in body:
+                outcome = "replay"
+            elif resp.status == 200:
+                outcome = "invalid"
+            else:
+                outcome = "http"
+
+        stats["return"].append(t3 - t2)
+        stats["flow"].append((t1 - t0) + (t3 - t2))
+        stats["outcomes"][outcome] += 1
+
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        stats["outcomes"]["error"] += 1
+
+
+async def worker(url: str, queue: asyncio.Queue, dwell: float, stats: dict):
+    # One cookie jar per simulated browser; unsafe=True keeps cookies for IP hosts
+    async with aiohttp.ClientSession(
+        cookie_jar=aiohttp.CookieJar(unsafe=True),
+        timeout=aiohttp.ClientTimeout(total=30)
+    ) as session:
+        while True:
+            try:
+                token = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await run_flow(session, url, token, dwell, stats)
+
+
+# -----------------------------------------------------------
+# REPORT
+# -----------------------------------------------------------
+def percentile(samples: list, q: float) -> float:
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def summarize(samples: list) -> dict:
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "max_ms": (samples[-1] * 1000) if samples else 0.0,
+    }
+
+
+async def run(args) -> dict:
+    url = args.url.rstrip("/")
+    server = None
+
+    if args.serve:
+        url = f"http://127.0.0.1:{args.port}"
+        server = spawn_server(args.serve, args.port, args.workers, args.dwell)
+
+    try:
+        await wait_ready(url, server)
+
+        tokens = build_tokens(args.flows)
+        queue = asyncio.Queue()
+        for token in tokens:
+            queue.put_nowait(token)
+
+        stats = {
+            "redirect": [], "return": [], "flow": [],
+            "outcomes": {name: 0 for name in OUTCOMES}
+        }
+
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            worker(url, queue, args.dwell, stats) for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    outcomes = stats["outcomes"]
+    failed = sum(outcomes[name] for name in ("replay", "invalid", "http", "error"))
+
+    return {
+        "config": {
+            "target": url,
+            "serve": args.serve,
+            "workers": args.workers if args.serve else None,
+            "flows": args.flows,
+            "concurrency": args.concurrency,
+            "dwell": args.dwell,
+        },
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "elapsed_sec": elapsed,
+        "flows_per_sec": args.flows / elapsed,
+        "verified_per_sec": outcomes["verified"] / elapsed,
+        "error_rate": failed / args.flows if args.flows else 0.0,
+        "bypass_rate": outcomes["bypass"] / args.flows if args.flows else 0.0,
+        "outcomes": outcomes,
+        "latency": {
+            "redirect": summarize(stats["redirect"]),
+            "return": summarize(stats["return"]),
+            "flow": summarize(stats["flow"]),
+        },
+    }
+
+
+def print_report(result: dict):
+    cfg = result["config"]
+    print(f"target={cfg['target']} flows={cfg['flows']} concurrency={cfg['concurrency']} dwell={cfg['dwell']}s")
+    print(f"elapsed      : {result['elapsed_sec']:.2f} s")
+    print(f"throughput   : {result['flows_per_sec']:.1f} flows/sec "
+          f"({result['verified_per_sec']:.1f} verified/sec)")
+    print(f"error rate   : {result['error_rate']:.2%}   bypass rate: {result['bypass_rate']:.2%}")
+    print("outcomes     : " + "  ".join(f"{k}={v}" for k, v in result["outcomes"].items()))
+    print(f"\n{'latency':10} {'count':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, s in result["latency"].items():
+        print(f"{name:10} {s['count']:8} {s['p50_ms']:9.2f} {s['p95_ms']:9.2f} {s['p99_ms']:9.2f} {s['max_ms']:9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Redirect server load test (/redirect → /return)")
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="running server to test")
+    parser.add_argument("--serve", choices=["memory", "mongod"],
+                        help="spawn a server instead of using --url")
+    parser.add_argument("--port", type=int, default=5055, help="port for --serve")
+    parser.add_argument("--workers", type=int, default=1, help="server workers for --serve mongod")
+    parser.add_argument("--flows", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--dwell", type=float, default=0.0,
+                        help="seconds between /redirect and /return")
+    parser.add_argument("--json", help="also write results to this file")
+    parser.add_argument("--_server", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args._server:
+        serve(args._server, args.port, args.workers)
+        return 0
+
+    result = asyncio.run(run(args))
+    print_report(result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+    return 0 if result["error_rate"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
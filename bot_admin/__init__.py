@@ -15,6 +15,7 @@ from bot_admin.handlers.order_management import router as order_router
 from bot_admin.handlers.shortener_settings import router as shortener_router
 from bot_admin.handlers.stats import router as stats_router
 from bot_admin.handlers.grant_verify import router as grant_verify_router
+from bot_admin.handlers.broadcast import router as broadcast_router
 
 
 def setup_admin_handlers() -> Router:
@@ -38,6 +39,7 @@ def setup_admin_handlers() -> Router:
     admin_router.include_router(shortener_router)
     admin_router.include_router(stats_router)
     admin_router.include_router(grant_verify_router)
+    admin_router.include_router(broadcast_router)
 
     return admin_router
 
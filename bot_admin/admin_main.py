@@ -7,6 +7,8 @@ from aiogram.enums import ParseMode
 from bot_admin import setup_admin_handlers
 from core.config import config
 from core.database import init_db
+from core.async_database import shutdown_executor
+from bot_admin.services.broadcast_service import BroadcastService
 
 
 async def main():
@@ -38,6 +40,13 @@ async def main():
     # ---------------------------------------------------
     dp.include_router(setup_admin_handlers())
 
+    # ---------------------------------------------------
+    # RESUME BROADCASTS INTERRUPTED BY A RESTART
+    # ---------------------------------------------------
+    resumed = await BroadcastService.resume_pending(bot)
+    if resumed:
+        logging.info(f"Resumed {resumed} interrupted broadcast(s)")
+
     logging.info("Admin Bot Started Successfully 🚀")
 
     # ---------------------------------------------------
@@ -47,6 +56,9 @@ async def main():
         await dp.start_polling(bot)
     except Exception as e:
         logging.error(f"Error while polling: {e}")
+    finally:
+        await bot.session.close()
+        shutdown_executor(wait=False)
 
 
 if __name__ == "__main__":
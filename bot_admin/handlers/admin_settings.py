@@ -2,7 +2,7 @@
 
 from aiogram import Router, types
 from aiogram.filters import Command
-from core.database import db
+from core.settings_cache import settings_cache
 from core.config import config
 from core.utils.logger import log
 from core.utils.time_utils import now
@@ -29,11 +29,7 @@ async def add_admin(message: types.Message):
         return await message.reply("❌ Invalid user ID.")
 
     # Insert into DB if not exists
-    db.settings.update_one(
-        {"key": "admins"},
-        {"$addToSet": {"value": new_admin}},
-        upsert=True
-    )
+    await settings_cache.add_to_set("admins", new_admin)
 
     await message.reply(f"✅ Added admin: `{new_admin}`", parse_mode="Markdown")
 
@@ -55,10 +51,7 @@ async def remove_admin(message: types.Message):
     except:
         return await message.reply("❌ Invalid user ID.")
 
-    db.settings.update_one(
-        {"key": "admins"},
-        {"$pull": {"value": remove_admin_id}}
-    )
+    await settings_cache.pull("admins", remove_admin_id)
 
     await message.reply(f"🗑 Removed admin: `{remove_admin_id}`", parse_mode="Markdown")
 
@@ -71,8 +64,8 @@ async def list_admins(message: types.Message):
     if not await is_admin(message.from_user.id):
         return
 
-    doc = db.settings.find_one({"key": "admins"})
-    admins = doc["value"] if doc else []
+    settings = await settings_cache.get()
+    admins = settings.admins
 
     if not admins:
         return await message.reply("⚠ No admins set.")
@@ -98,11 +91,7 @@ async def set_admin_contact(message: types.Message):
 
     admin_contact = parts[1]
 
-    db.settings.update_one(
-        {"key": "admin_contact"},
-        {"$set": {"value": admin_contact}},
-        upsert=True
-    )
+    await settings_cache.set("admin_contact", admin_contact)
 
     await message.reply(f"📞 Admin contact updated to: `{admin_contact}`", parse_mode="Markdown")
 
@@ -115,8 +104,8 @@ async def get_admin_contact(message: types.Message):
     if not await is_admin(message.from_user.id):
         return
 
-    doc = db.settings.find_one({"key": "admin_contact"})
-    contact = doc["value"] if doc else "Not set"
+    settings = await settings_cache.get()
+    contact = settings.admin_contact or "Not set"
 
     await message.reply(f"📞 Current admin contact: `{contact}`", parse_mode="Markdown")
 
@@ -1,156 +1,206 @@
 # bot_admin/handlers/broadcast.py
 
-from aiogram import Router, types
+import asyncio
+from aiogram import Router, types, F
 from aiogram.filters import Command
-from core.database import db
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import StatesGroup, State
 from bot_admin.utils.helpers import is_admin
-from aiogram.exceptions import TelegramForbiddenError, TelegramBadRequest
-import asyncio
+from bot_admin.keyboards.inline_keyboards import broadcast_confirm_keyboard
+from bot_admin.services.broadcast_service import BroadcastService
+from bot_admin.services.segment_service import SegmentService, SegmentError, SEGMENT_HELP
+from core.config import config
 
 router = Router()
 
 
 # ---------------------------------------------------
-# Helper: broadcast send function
+# STATE MACHINE FOR BROADCAST COMPOSER
 # ---------------------------------------------------
-async def broadcast_message(bot, msg, content_type="text", file=None):
-    users = db.users.find({}, {"user_id": 1})
-
-    total = 0
-    success = 0
-    failed = 0
-
-    for user in users:
-        uid = user["user_id"]
-        total += 1
-
-        try:
-            if content_type == "text":
-                await bot.send_message(uid, msg)
-            elif content_type == "photo":
-                await bot.send_photo(uid, file, caption=msg)
-            elif content_type == "file":
-                await bot.send_document(uid, file, caption=msg)
+class BroadcastStates(StatesGroup):
+    waiting_for_content = State()
+    waiting_for_confirm = State()
 
-            success += 1
 
-        except (TelegramForbiddenError, TelegramBadRequest):
-            failed += 1
-
-        await asyncio.sleep(1)   # SAFE LIMIT (1 msg per second)
-
-    return total, success, failed
+# command → (accepted content, prompt)
+# Every command broadcasts by copying the admin's message, so formatting,
+# buttons and media are kept as-is without re-uploading.
+BROADCAST_COMMANDS = {
+    "broadcast": (
+        "any",
+        "📣 **Broadcast Mode Activated**\n\n"
+        "Send me the message you want to broadcast to all users.\n"
+        "Text, photo, video, file or album are all supported.\n"
+        "⚠ Don't delete it until the broadcast is completed."
+    ),
+    "broadcastphoto": (
+        "photo",
+        "📸 Send the **photo** (or photo album) with caption to broadcast."
+    ),
+    "broadcastfile": (
+        "file",
+        "📁 Send the **document or video** with caption to broadcast."
+    ),
+}
+
+# media_group_id → message_ids received so far (albums arrive as
+# separate messages)
+_albums = {}
+
+
+def _accepts(kind: str, message: types.Message) -> bool:
+    if kind == "photo":
+        return bool(message.photo)
+    if kind == "file":
+        return bool(message.document or message.video)
+    return True
 
 
 # ---------------------------------------------------
-# /broadcast → text broadcast
+# /broadcast [segment], /broadcastphoto [segment],
+# /broadcastfile [segment] → start composer
 # ---------------------------------------------------
-@router.message(Command("broadcast"))
-async def broadcast_start(message: types.Message, bot):
+@router.message(Command(*BROADCAST_COMMANDS.keys()))
+async def broadcast_start(message: types.Message, state: FSMContext):
     if not await is_admin(message.from_user.id):
         return
 
+    parts = message.text.split()
+    command = parts[0].lstrip("/").split("@")[0].lower()
+    kind, prompt = BROADCAST_COMMANDS[command]
+
+    try:
+        query, label = SegmentService.build(parts[1:])
+    except SegmentError as e:
+        return await message.reply(f"❌ {e}\n\n{SEGMENT_HELP}", parse_mode="Markdown")
+
+    estimated = await SegmentService.estimate(query)
+
+    await state.set_state(BroadcastStates.waiting_for_content)
+    await state.update_data(kind=kind, query=query, segment=label, estimated=estimated)
+
     await message.reply(
-        "📣 **Broadcast Mode Activated**\n\n"
-        "Send me the message you want to broadcast to all users.\n"
-        "⚠ Only text is allowed in this command.\n",
+        f"{prompt}\n\n"
+        f"🎯 Segment: **{label}**\n"
+        f"👥 Estimated recipients: `{estimated}`\n\n"
+        "Send /cancel to abort.",
         parse_mode="Markdown"
     )
 
-    @router.message()
-    async def process_broadcast_text(msg: types.Message):
-        if not await is_admin(msg.from_user.id):
-            return
-        
-        text = msg.text
-        await msg.reply("📤 Broadcasting... This may take a while.")
-
-        total, success, failed = await broadcast_message(bot, text)
 
-        return await msg.reply(
-            f"📊 **Broadcast Completed**\n\n"
-            f"👥 Total Users: {total}\n"
-            f"✅ Delivered: {success}\n"
-            f"❌ Failed: {failed}",
-            parse_mode="Markdown"
-        )
+# ---------------------------------------------------
+# /cancel → leave composer
+# ---------------------------------------------------
+@router.message(BroadcastStates.waiting_for_content, Command("cancel"))
+@router.message(BroadcastStates.waiting_for_confirm, Command("cancel"))
+async def broadcast_abort(message: types.Message, state: FSMContext):
+    await state.clear()
+    await message.reply("❌ Broadcast cancelled.")
 
 
 # ---------------------------------------------------
-# /broadcastphoto → photo broadcast
+# STEP 1 — RECEIVE CONTENT → PREVIEW
 # ---------------------------------------------------
-@router.message(Command("broadcastphoto"))
-async def broadcast_photo(message: types.Message, bot):
+@router.message(BroadcastStates.waiting_for_content)
+async def broadcast_content(message: types.Message, state: FSMContext, bot):
     if not await is_admin(message.from_user.id):
         return
 
-    await message.reply(
-        "📸 Send the **photo** with caption to broadcast.\n"
-        "⚠ Only one photo allowed.",
-        parse_mode="Markdown"
-    )
+    data = await state.get_data()
+    kind = data.get("kind", "any")
 
-    @router.message()
-    async def process_broadcast_photo(msg: types.Message):
-        if not await is_admin(msg.from_user.id):
+    if message.media_group_id:
+        # Album: the first message waits for the rest, the others return
+        album = _albums.setdefault(message.media_group_id, [])
+        album.append(message.message_id)
+        if len(album) > 1:
             return
 
-        if not msg.photo:
-            return await msg.reply("❌ Please send a photo.")
+        if not _accepts(kind, message):
+            _albums.pop(message.media_group_id, None)
+            return await message.reply("❌ This content is not allowed in this command.")
+
+        await asyncio.sleep(config.BROADCAST_ALBUM_WAIT_SECONDS)
+        message_ids = sorted(_albums.pop(message.media_group_id))
+
+    else:
+        if not _accepts(kind, message):
+            return await message.reply("❌ This content is not allowed in this command.")
+        message_ids = [message.message_id]
 
-        photo = msg.photo[-1].file_id
-        caption = msg.caption or ""
+    payload = {
+        "mode": "copy",
+        "from_chat_id": message.chat.id,
+        "message_ids": message_ids,
+    }
 
-        await msg.reply("📤 Broadcasting photo...")
+    await state.update_data(payload=payload)
+    await state.set_state(BroadcastStates.waiting_for_confirm)
 
-        total, success, failed = await broadcast_message(
-            bot, caption, content_type="photo", file=photo
-        )
+    await message.answer("👁 **Preview** — users will receive:", parse_mode="Markdown")
+    await BroadcastService.preview(bot, message.chat.id, payload)
 
-        return await msg.reply(
-            f"📊 **Broadcast Completed**\n\n"
-            f"👥 Total Users: {total}\n"
-            f"✅ Delivered: {success}\n"
-            f"❌ Failed: {failed}",
-            parse_mode="Markdown"
-        )
+    # Re-count: the segment may have changed while composing
+    estimated = await SegmentService.estimate(data.get("query"))
+
+    await message.answer(
+        f"🎯 Segment: **{data.get('segment', 'All users')}**\n"
+        f"👥 Estimated recipients: `{estimated}`\n\n"
+        "Send this broadcast?",
+        reply_markup=broadcast_confirm_keyboard(),
+        parse_mode="Markdown"
+    )
 
 
 # ---------------------------------------------------
-# /broadcastfile → documents/videos broadcast
+# STEP 2 — CONFIRM / CANCEL
 # ---------------------------------------------------
-@router.message(Command("broadcastfile"))
-async def broadcast_file(message: types.Message, bot):
-    if not await is_admin(message.from_user.id):
-        return
-    
-    await message.reply(
-        "📁 Send the **document or video** with caption to broadcast.\n"
-        "⚠ Only one file allowed.",
+@router.callback_query(BroadcastStates.waiting_for_confirm, F.data == "broadcast_confirm")
+async def broadcast_confirm(callback: types.CallbackQuery, state: FSMContext, bot):
+    if not await is_admin(callback.from_user.id):
+        return await callback.answer()
+
+    data = await state.get_data()
+    await state.clear()
+
+    await callback.message.edit_reply_markup(reply_markup=None)
+    await callback.answer("📤 Broadcast started")
+
+    broadcast_id = await BroadcastService.start(
+        bot,
+        data["payload"],
+        callback.message.chat.id,
+        query=data.get("query"),
+        segment=data.get("segment")
+    )
+
+    await callback.message.answer(
+        f"Use `/stopbroadcast {broadcast_id}` to stop it.",
         parse_mode="Markdown"
     )
 
-    @router.message()
-    async def process_broadcast_doc(msg: types.Message):
-        if not await is_admin(msg.from_user.id):
-            return
 
-        if not msg.document and not msg.video:
-            return await msg.reply("❌ Please send a document or video.")
+@router.callback_query(F.data == "broadcast_cancel")
+async def broadcast_cancel(callback: types.CallbackQuery, state: FSMContext):
+    await state.clear()
+    await callback.message.edit_reply_markup(reply_markup=None)
+    await callback.answer("Cancelled")
+    await callback.message.answer("❌ Broadcast cancelled.")
+
 
-        file = msg.document.file_id if msg.document else msg.video.file_id
-        caption = msg.caption or ""
+# ---------------------------------------------------
+# /stopbroadcast <id> → stop a running broadcast
+# ---------------------------------------------------
+@router.message(Command("stopbroadcast"))
+async def stop_broadcast(message: types.Message):
+    if not await is_admin(message.from_user.id):
+        return
 
-        await msg.reply("📤 Broadcasting file...")
+    parts = message.text.split()
+    if len(parts) != 2:
+        return await message.reply("Usage: `/stopbroadcast BC-XXXXXXXX`", parse_mode="Markdown")
 
-        total, success, failed = await broadcast_message(
-            bot, caption, content_type="file", file=file
-        )
+    if await BroadcastService.cancel(parts[1]):
+        return await message.reply("⛔ Broadcast will stop after the current batch.")
 
-        return await msg.reply(
-            f"📊 **Broadcast Completed**\n\n"
-            f"👥 Total Users: {total}\n"
-            f"✅ Delivered: {success}\n"
-            f"❌ Failed: {failed}",
-            parse_mode="Markdown"
-        )
+    await message.reply("❌ No running broadcast with that ID.")
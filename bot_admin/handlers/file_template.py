@@ -2,9 +2,9 @@
 
 from aiogram import Router, types
 from aiogram.filters import Command
-from core.database import db
+from core.async_database import adb
 from bot_admin.utils.helpers import is_admin
-from core.security.token_encryptor import encode_payload
+from core.security.compact_tokens import encode_token
 from core.config import config
 
 router = Router()
@@ -36,7 +36,7 @@ async def generate_template(message: types.Message):
     file_db_id = parts[1]
 
     # Fetch file from DB
-    file_data = db.files.find_one({"file_db_id": file_db_id})
+    file_data = await adb.files.find_one({"file_db_id": file_db_id})
     if not file_data:
         return await message.reply("❌ File not found in database.")
 
@@ -52,9 +52,9 @@ async def generate_template(message: types.Message):
         "post_no": post_no
     }
 
-    encoded = encode_payload(payload)
+    encoded = await encode_token(payload, "get")
     bot_username = config.BOT_B_USERNAME  # from .env
-    final_link = f"https://t.me/{bot_username}?start={encoded}"
+    final_link = f"https://t.me/{bot_username}?start=get_{encoded}"
 
     # ---------------------------------------------
     # Format EXACT template as you required
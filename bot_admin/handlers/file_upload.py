@@ -5,7 +5,7 @@ from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import StatesGroup, State
 from bot_admin.utils.helpers import is_admin, generate_file_db_id
-from core.database import db
+from core.async_database import adb
 
 router = Router()
 
@@ -101,7 +101,7 @@ async def receive_extra(message: types.Message, state: FSMContext):
     }
 
     # Store in DB
-    db.files.insert_one(file_info)
+    await adb.files.insert_one(file_info)
 
     await message.reply(
         f"✅ **File Saved Successfully!**\n\n"
@@ -3,7 +3,7 @@
 from aiogram import Router, types
 from aiogram.filters import Command
 from bot_admin.utils.helpers import is_admin
-from core.database import db
+from core.settings_cache import settings_cache
 
 router = Router()
 
@@ -40,11 +40,7 @@ async def add_force_sub(message: types.Message):
         "button_text": button_text
     }
 
-    db.settings.update_one(
-        {"key": "force_sub"},
-        {"$addToSet": {"value": entry}},
-        upsert=True
-    )
+    await settings_cache.add_to_set("force_sub", entry)
 
     await message.reply(
         f"✅ **Force-sub channel added**\n\n"
@@ -76,10 +72,7 @@ async def remove_force_sub(message: types.Message):
 
     channel_username = parts[1]
 
-    db.settings.update_one(
-        {"key": "force_sub"},
-        {"$pull": {"value": {"channel": channel_username}}}
-    )
+    await settings_cache.pull("force_sub", {"channel": channel_username})
 
     await message.reply(
         f"🗑 Removed force-sub channel: `{channel_username}`",
@@ -95,8 +88,8 @@ async def list_force_sub(message: types.Message):
     if not await is_admin(message.from_user.id):
         return
 
-    doc = db.settings.find_one({"key": "force_sub"})
-    channels = doc["value"] if doc else []
+    settings = await settings_cache.get()
+    channels = settings.force_sub
 
     if not channels:
         return await message.reply("⚠ No force-sub channels added yet.")
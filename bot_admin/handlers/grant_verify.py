@@ -3,9 +3,10 @@
 from aiogram import Router, types
 from aiogram.filters import Command
 from bot_admin.utils.helpers import is_admin
-from core.database import db
+from core.async_database import adb
 from datetime import datetime, timedelta
 from core.utils.time_utils import now
+from core.user_reachability import is_dead_chat_error, mark_blocked
 
 router = Router()
 
@@ -52,12 +53,13 @@ async def grant_manual_verification(message: types.Message):
     expiry_time = now() + timedelta(hours=hours)
 
     # Upsert user record
-    db.users.update_one(
+    await adb.users.update_one(
         {"user_id": user_id},
         {
             "$set": {
                 "manual_verified_until": expiry_time,
                 "is_verified": True,
+                "last_verified_at": now(),
             }
         },
         upsert=True
@@ -82,5 +84,6 @@ async def grant_manual_verification(message: types.Message):
             f"Enjoy instant file access!",
             parse_mode="Markdown"
         )
-    except:
-        pass
+    except Exception as e:
+        if is_dead_chat_error(e):
+            await mark_blocked({user_id: e.message})
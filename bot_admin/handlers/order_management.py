@@ -3,8 +3,9 @@
 from aiogram import Router, types
 from aiogram.filters import Command
 from bot_admin.utils.helpers import is_admin
-from core.database import db
+from core.async_database import adb
 from core.utils.time_utils import now
+from core.user_reachability import is_dead_chat_error, mark_blocked
 from datetime import timedelta
 
 router = Router()
@@ -32,7 +33,7 @@ async def list_orders(message: types.Message):
     else:
         query = {}  # show all
 
-    orders = list(db.orders.find(query).sort("created_at", -1).limit(30))
+    orders = await adb.orders.find(query).sort("created_at", -1).limit(30).to_list()
 
     if not orders:
         return await message.reply("⚠ No orders found.")
@@ -65,7 +66,7 @@ async def view_order(message: types.Message):
 
     order_id = parts[1]
 
-    order = db.orders.find_one({"order_id": order_id})
+    order = await adb.orders.find_one({"order_id": order_id})
     if not order:
         return await message.reply("❌ Order not found.")
 
@@ -97,7 +98,7 @@ async def confirm_order(message: types.Message):
 
     order_id = parts[1]
 
-    order = db.orders.find_one({"order_id": order_id})
+    order = await adb.orders.find_one({"order_id": order_id})
     if not order:
         return await message.reply("❌ Order not found.")
 
@@ -111,7 +112,7 @@ async def confirm_order(message: types.Message):
     # ------------------------------------------------
     # UPDATE ORDER STATUS
     # ------------------------------------------------
-    db.orders.update_one(
+    await adb.orders.update_one(
         {"order_id": order_id},
         {"$set": {"status": "paid", "paid_at": now()}}
     )
@@ -122,13 +123,13 @@ async def confirm_order(message: types.Message):
     user_id = order["user_id"]
     plan_id = order["plan_id"]
 
-    plan = db.plans.find_one({"plan_id": plan_id})
+    plan = await adb.plans.find_one({"plan_id": plan_id})
     if not plan:
         return await message.reply("❌ Plan linked to this order no longer exists.")
 
     plan_days = plan.get("days", 0)
 
-    user = db.users.find_one({"user_id": user_id})
+    user = await adb.users.find_one({"user_id": user_id})
 
     # Premium stacking logic
     if user and "premium_expiry" in user and user["premium_expiry"] > now():
@@ -139,7 +140,7 @@ async def confirm_order(message: types.Message):
         new_expiry = now() + timedelta(days=plan_days)
 
     # Update user premium status
-    db.users.update_one(
+    await adb.users.update_one(
         {"user_id": user_id},
         {
             "$set": {
@@ -168,8 +169,9 @@ async def confirm_order(message: types.Message):
             f"📅 Expires on: `{new_expiry}`",
             parse_mode="Markdown"
         )
-    except:
-        pass
+    except Exception as e:
+        if is_dead_chat_error(e):
+            await mark_blocked({user_id: e.message})
 
 
 # ---------------------------------------------------
@@ -187,11 +189,11 @@ async def refund_order(message: types.Message):
 
     order_id = parts[1]
 
-    order = db.orders.find_one({"order_id": order_id})
+    order = await adb.orders.find_one({"order_id": order_id})
     if not order:
         return await message.reply("❌ Order not found.")
 
-    db.orders.update_one(
+    await adb.orders.update_one(
         {"order_id": order_id},
         {"$set": {"status": "refunded"}}
     )
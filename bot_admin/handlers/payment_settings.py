@@ -3,7 +3,7 @@
 from aiogram import Router, types
 from aiogram.filters import Command
 from bot_admin.utils.helpers import is_admin
-from core.database import db
+from core.settings_cache import settings_cache
 
 router = Router()
 
@@ -22,11 +22,7 @@ async def set_upi(message: types.Message):
 
     upi = parts[1].strip()
 
-    db.settings.update_one(
-        {"key": "upi_id"},
-        {"$set": {"value": upi}},
-        upsert=True
-    )
+    await settings_cache.set("upi_id", upi)
 
     await message.reply(
         f"✅ **UPI ID updated successfully!**\n\n"
@@ -49,11 +45,7 @@ async def set_pay_name(message: types.Message):
 
     name = parts[1].strip()
 
-    db.settings.update_one(
-        {"key": "upi_name"},
-        {"$set": {"value": name}},
-        upsert=True
-    )
+    await settings_cache.set("upi_name", name)
 
     await message.reply(
         f"📝 **UPI Name updated successfully!**\n\n"
@@ -82,11 +74,7 @@ async def set_qr_expiry(message: types.Message):
     if minutes <= 0:
         return await message.reply("❌ Minutes must be greater than 0.")
 
-    db.settings.update_one(
-        {"key": "qr_expiry"},
-        {"$set": {"value": minutes}},
-        upsert=True
-    )
+    await settings_cache.set("qr_expiry", minutes)
 
     await message.reply(
         f"⏱ **QR Expiry Updated!**\n"
@@ -115,11 +103,7 @@ async def auto_confirm(message: types.Message):
     if mode not in ["on", "off"]:
         return await message.reply("❌ Choose `on` or `off` only.")
 
-    db.settings.update_one(
-        {"key": "auto_confirm"},
-        {"$set": {"value": mode}},
-        upsert=True
-    )
+    await settings_cache.set("auto_confirm", mode)
 
     await message.reply(
         f"🔧 Auto-Confirm is now **{mode.upper()}**.",
@@ -151,11 +135,7 @@ async def set_payment_mode(message: types.Message):
     if mode not in ["manual", "auto"]:
         return await message.reply("❌ Choose `manual` or `auto` only.")
 
-    db.settings.update_one(
-        {"key": "payment_mode"},
-        {"$set": {"value": mode}},
-        upsert=True
-    )
+    await settings_cache.set("payment_mode", mode)
 
     await message.reply(
         f"💼 Payment mode set to: **{mode.upper()}**",
@@ -183,11 +163,7 @@ async def unique_price_toggle(message: types.Message):
     if mode not in ["on", "off"]:
         return await message.reply("❌ Choose `on` or `off` only.")
 
-    db.settings.update_one(
-        {"key": "unique_paise"},
-        {"$set": {"value": mode}},
-        upsert=True
-    )
+    await settings_cache.set("unique_paise", mode)
 
     await message.reply(
         f"💰 Unique Price Mode: **{mode.upper()}**",
@@ -215,11 +191,7 @@ async def allow_proof_toggle(message: types.Message):
     if mode not in ["on", "off"]:
         return await message.reply("❌ Choose `on` or `off` only.")
 
-    db.settings.update_one(
-        {"key": "allow_proof"},
-        {"$set": {"value": mode}},
-        upsert=True
-    )
+    await settings_cache.set("allow_proof", mode)
 
     await message.reply(
         f"📷 Screenshot Proof: **{mode.upper()}**",
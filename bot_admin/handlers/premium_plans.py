@@ -3,7 +3,7 @@
 from aiogram import Router, types
 from aiogram.filters import Command
 from bot_admin.utils.helpers import is_admin, generate_plan_id
-from core.database import db
+from core.async_database import adb
 
 router = Router()
 
@@ -49,7 +49,7 @@ async def add_plan(message: types.Message):
         "price": price
     }
 
-    db.plans.insert_one(plan)
+    await adb.plans.insert_one(plan)
 
     await message.reply(
         f"✅ **Plan Added Successfully!**\n\n"
@@ -78,7 +78,7 @@ async def remove_plan(message: types.Message):
 
     plan_id = parts[1]
 
-    result = db.plans.delete_one({"plan_id": plan_id})
+    result = await adb.plans.delete_one({"plan_id": plan_id})
 
     if result.deleted_count == 0:
         return await message.reply("❌ No plan found with that ID.")
@@ -97,7 +97,7 @@ async def list_plans(message: types.Message):
     if not await is_admin(message.from_user.id):
         return
 
-    plans = list(db.plans.find().sort("days", 1))
+    plans = await adb.plans.find().sort("days", 1).to_list()
 
     if not plans:
         return await message.reply("⚠ No premium plans added yet.")
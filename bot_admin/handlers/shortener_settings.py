@@ -3,7 +3,15 @@
 from aiogram import Router, types
 from aiogram.filters import Command
 from bot_admin.utils.helpers import is_admin
-from core.database import db
+from core.settings_cache import settings_cache
+from core.shortener_health import ShortenerHealth
+
+# Circuit state → label (reported by the User Bot)
+HEALTH_LABELS = {
+    "closed": "🟢 Healthy",
+    "half_open": "🟡 Probing",
+    "open": "🔴 Circuit open",
+}
 
 router = Router()
 
@@ -37,11 +45,7 @@ async def add_shortener(message: types.Message):
         "api_key": api_key
     }
 
-    db.settings.update_one(
-        {"key": "shorteners"},
-        {"$addToSet": {"value": entry}},
-        upsert=True
-    )
+    await settings_cache.add_to_set("shorteners", entry)
 
     await message.reply(
         f"✅ **Shortener Added**\n\n"
@@ -71,10 +75,7 @@ async def remove_shortener(message: types.Message):
 
     domain = parts[1].strip().lower()
 
-    db.settings.update_one(
-        {"key": "shorteners"},
-        {"$pull": {"value": {"domain": domain}}},
-    )
+    await settings_cache.pull("shorteners", {"domain": domain})
 
     await message.reply(
         f"🗑 **Shortener Removed:** `{domain}`",
@@ -90,19 +91,33 @@ async def list_shorteners(message: types.Message):
     if not await is_admin(message.from_user.id):
         return
 
-    doc = db.settings.find_one({"key": "shorteners"})
-    items = doc["value"] if doc else []
+    settings = await settings_cache.get()
+    items = settings.shorteners
 
     if not items:
         return await message.reply("⚠ No shortener platforms added yet.")
 
+    stats = await ShortenerHealth.load_stats()
+
     text = "🔗 **Shortener Platforms:**\n\n"
 
     for i, s in enumerate(items, 1):
         text += (
             f"**{i}.** `{s['domain']}`\n"
             f"🔑 API Key: `{s['api_key']}`\n"
-            "--------------------------\n"
         )
 
+        health = stats.get(s["domain"])
+        if health:
+            text += (
+                f"{HEALTH_LABELS.get(health['state'], health['state'])}\n"
+                f"⏱ Latency: {health['latency_ms']} ms | "
+                f"✅ Success: {health['success_rate'] * 100:.0f}%\n"
+                f"📊 Requests: {health['requests']} | Failures: {health['failures']}\n"
+            )
+        else:
+            text += "⚪ No traffic yet\n"
+
+        text += "--------------------------\n"
+
     await message.reply(text, parse_mode="Markdown")
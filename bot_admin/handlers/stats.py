@@ -3,22 +3,28 @@
 from aiogram import Router, types
 from aiogram.filters import Command
 from bot_admin.utils.helpers import is_admin
-from core.database import db
+from core.async_database import adb
 from core.utils.time_utils import now
+from core.user_reachability import reachable, UNREACHABLE
 
 router = Router()
 
 
 # ---------------------------------------------------
-# /users  → total registered users
+# /users  → registered users (blocked ones counted apart)
 # ---------------------------------------------------
 @router.message(Command("users"))
 async def total_users(message: types.Message):
     if not await is_admin(message.from_user.id):
         return
 
-    count = db.users.count_documents({})
-    await message.reply(f"👥 **Total Users:** `{count}`", parse_mode="Markdown")
+    count = await adb.users.count_documents(reachable())
+    blocked = await adb.users.count_documents(UNREACHABLE)
+    await message.reply(
+        f"👥 **Total Users:** `{count}`\n"
+        f"🚫 **Blocked / Deleted:** `{blocked}`",
+        parse_mode="Markdown"
+    )
 
 
 # ---------------------------------------------------
@@ -31,10 +37,10 @@ async def verified_users(message: types.Message):
 
     current_time = now()
 
-    count = db.users.count_documents({
+    count = await adb.users.count_documents(reachable({
         "is_verified": True,
         "verified_until": {"$gt": current_time}
-    })
+    }))
 
     await message.reply(
         f"✔ **Active Verified Users:** `{count}`",
@@ -52,10 +58,10 @@ async def premium_users(message: types.Message):
 
     current_time = now()
 
-    count = db.users.count_documents({
+    count = await adb.users.count_documents(reachable({
         "is_premium": True,
         "premium_expiry": {"$gt": current_time}
-    })
+    }))
 
     await message.reply(
         f"💎 **Active Premium Users:** `{count}`",
@@ -73,22 +79,24 @@ async def full_stats(message: types.Message):
 
     current_time = now()
 
-    total_users = db.users.count_documents({})
-    verified = db.users.count_documents({
+    total_users = await adb.users.count_documents(reachable())
+    blocked_users = await adb.users.count_documents(UNREACHABLE)
+    verified = await adb.users.count_documents(reachable({
         "is_verified": True,
         "verified_until": {"$gt": current_time}
-    })
-    premium = db.users.count_documents({
+    }))
+    premium = await adb.users.count_documents(reachable({
         "is_premium": True,
         "premium_expiry": {"$gt": current_time}
-    })
-    pending_orders = db.orders.count_documents({"status": "pending"})
-    expired_orders = db.orders.count_documents({"status": "expired"})
-    total_orders = db.orders.count_documents({})
+    }))
+    pending_orders = await adb.orders.count_documents({"status": "pending"})
+    expired_orders = await adb.orders.count_documents({"status": "expired"})
+    total_orders = await adb.orders.count_documents({})
     
     text = (
         "📊 **Bot Statistics**\n\n"
         f"👥 **Total Users:** `{total_users}`\n"
+        f"🚫 **Blocked / Deleted:** `{blocked_users}`\n"
         f"✔ **Active Verified Users:** `{verified}`\n"
         f"💎 **Active Premium Users:** `{premium}`\n\n"
         f"📦 **Orders Summary:**\n"
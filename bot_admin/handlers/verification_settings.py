@@ -3,7 +3,7 @@
 from aiogram import Router, types
 from aiogram.filters import Command
 from bot_admin.utils.helpers import is_admin
-from core.database import db
+from core.settings_cache import settings_cache
 
 router = Router()
 
@@ -26,11 +26,7 @@ async def set_verify_guide(message: types.Message):
 
     url = parts[1].strip()
 
-    db.settings.update_one(
-        {"key": "verify_guide"},
-        {"$set": {"value": url}},
-        upsert=True
-    )
+    await settings_cache.set("verify_guide", url)
 
     await message.reply(
         f"📘 **Verification Guide Updated**\n\n"
@@ -47,8 +43,8 @@ async def show_verify_guide(message: types.Message):
     if not await is_admin(message.from_user.id):
         return
 
-    doc = db.settings.find_one({"key": "verify_guide"})
-    url = doc["value"] if doc else None
+    settings = await settings_cache.get()
+    url = settings.verify_guide
 
     if not url:
         return await message.reply("⚠ No verification guide has been set yet.")
@@ -84,11 +80,7 @@ async def set_free_access(message: types.Message):
     except:
         return await message.reply("❌ Hours must be a valid number.")
 
-    db.settings.update_one(
-        {"key": "free_access_hours"},
-        {"$set": {"value": hours}},
-        upsert=True
-    )
+    await settings_cache.set("free_access_hours", hours)
 
     await message.reply(
         f"⏳ **Free Access Duration Updated**\n"
@@ -150,6 +150,20 @@ def broadcast_keyboard():
     )
 
 
+# ---------------------------------------------------
+# BROADCAST CONFIRM KEYBOARD (shown under the preview)
+# ---------------------------------------------------
+def broadcast_confirm_keyboard():
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(text="✅ Send", callback_data="broadcast_confirm"),
+                InlineKeyboardButton(text="❌ Cancel", callback_data="broadcast_cancel")
+            ]
+        ]
+    )
+
+
 # ---------------------------------------------------
 # STATS KEYBOARD
 # ---------------------------------------------------
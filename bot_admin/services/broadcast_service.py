@@ -1,75 +1,341 @@
 # bot_admin/services/broadcast_service.py
 
+"""
+Broadcast Engine
+----------------
+
+ - Concurrent worker pool behind a global token bucket
+   (BROADCAST_RATE_PER_SECOND, BROADCAST_WORKERS)
+ - TelegramRetryAfter pauses ALL workers, then the user is retried
+ - Users are streamed from one cursor (projection + BROADCAST_BATCH_SIZE)
+   in ascending user_id order
+ - After every batch the progress is checkpointed in `broadcasts`,
+   so a broadcast interrupted by a restart resumes from the last batch
+   (resume_pending() is called from admin_main.py)
+ - Live progress is edited into the admin's status message
+ - Users who blocked the bot are flagged in `users` after every batch
+   and skipped by every later broadcast (core/user_reachability.py)
+ - Every payload is a "copy": any admin message (text with entities,
+   video, album, ...) fans out with copy_message / copy_messages, no
+   per-type code and no re-upload. An album costs a single API call
+   per user.
+
+Broadcast document (collection: broadcasts):
+{
+  "broadcast_id": "BC-XXXXXXXX",
+  "status": "running" | "completed" | "cancelled" | "failed",
+  "payload": {"mode": "copy", "from_chat_id": 1, "message_ids": [10, 11]},
+  "query": {...},                # users filter (segment_service.py)
+  "segment": "All users",        # segment label
+  "last_user_id": 12345,         # checkpoint
+  "total": 0, "processed": 0, "success": 0, "failed": 0, "blocked": 0,
+  "admin_chat_id": 1, "progress_message_id": 2,
+  "started_at": ..., "updated_at": ..., "finished_at": ...
+}
+"""
+
 import asyncio
-from core.database import db
-from aiogram.exceptions import TelegramForbiddenError, TelegramBadRequest
+import logging
+import time
+
+from aiogram.exceptions import (
+    TelegramForbiddenError,
+    TelegramBadRequest,
+    TelegramRetryAfter,
+    TelegramNetworkError,
+)
+
+from core.async_database import adb
+from core.config import config
+from core.utils.rate_limiter import TokenBucket
+from core.utils.time_utils import now
+from core.user_reachability import reachable, is_dead_chat_error, mark_blocked
+from bot_admin.utils.helpers import random_string
+
+logger = logging.getLogger(__name__)
+
+# Delivery outcomes
+SENT = "success"
+FAILED = "failed"
+BLOCKED = "blocked"
 
 
 class BroadcastService:
 
+    # broadcast_id -> running asyncio.Task
+    _tasks = {}
+
+    # ----------------------------------------------------------
+    # START (background)
+    # ----------------------------------------------------------
+    @staticmethod
+    async def start(bot, payload: dict, admin_chat_id: int, query: dict = None, segment: str = None) -> str:
+        """
+        Create a broadcast and run it in the background.
+        Progress is posted to `admin_chat_id`. Returns broadcast_id.
+        """
+        doc = await BroadcastService._create(payload, query, segment)
+
+        progress = await bot.send_message(
+            admin_chat_id,
+            BroadcastService.format_progress(doc),
+            parse_mode="Markdown"
+        )
+        doc["admin_chat_id"] = admin_chat_id
+        doc["progress_message_id"] = progress.message_id
+        await adb.broadcasts.update_one(
+            {"broadcast_id": doc["broadcast_id"]},
+            {"$set": {"admin_chat_id": admin_chat_id, "progress_message_id": progress.message_id}}
+        )
+
+        BroadcastService._launch(bot, doc)
+        return doc["broadcast_id"]
+
     @staticmethod
-    async def send_text(bot, text: str):
+    async def resume_pending(bot) -> int:
         """
-        Broadcast plain text message to all users.
+        Relaunch broadcasts interrupted by a restart.
         """
-        return await BroadcastService._broadcast(bot, text=text, mode="text")
+        docs = await adb.broadcasts.find({"status": "running"}).to_list()
+        for doc in docs:
+            if doc["broadcast_id"] not in BroadcastService._tasks:
+                logger.info(f"[Broadcast] Resuming {doc['broadcast_id']} after user {doc.get('last_user_id')}")
+                BroadcastService._launch(bot, doc)
+        return len(docs)
 
     @staticmethod
-    async def send_photo(bot, photo_file_id: str, caption: str = ""):
+    async def cancel(broadcast_id: str) -> bool:
         """
-        Broadcast photo with caption.
+        Stop a running broadcast after its current batch.
         """
-        return await BroadcastService._broadcast(bot, file_id=photo_file_id, text=caption, mode="photo")
+        result = await adb.broadcasts.update_one(
+            {"broadcast_id": broadcast_id, "status": "running"},
+            {"$set": {"status": "cancelled", "finished_at": now()}}
+        )
+        return result.modified_count > 0
 
     @staticmethod
-    async def send_document(bot, file_id: str, caption: str = ""):
+    async def preview(bot, chat_id: int, payload: dict):
         """
-        Broadcast document or video with caption.
+        Send the payload to the admin exactly as users will receive it.
         """
-        return await BroadcastService._broadcast(bot, file_id=file_id, text=caption, mode="file")
+        await BroadcastService._send(bot, chat_id, payload)
+
+    @staticmethod
+    async def get(broadcast_id: str):
+        return await adb.broadcasts.find_one({"broadcast_id": broadcast_id})
+
+    @staticmethod
+    async def _create(payload: dict, query: dict = None, segment: str = None) -> dict:
+        query = query or {}
+        doc = {
+            "broadcast_id": f"BC-{random_string(8)}",
+            "status": "running",
+            "payload": payload,
+            "query": query,
+            "segment": segment or "All users",
+            "last_user_id": None,
+            "total": await adb.users.count_documents(reachable(query)),
+            "processed": 0,
+            "success": 0,
+            "failed": 0,
+            "blocked": 0,
+            "admin_chat_id": None,
+            "progress_message_id": None,
+            "started_at": now(),
+            "updated_at": now(),
+            "finished_at": None,
+        }
+        await adb.broadcasts.insert_one(doc)
+        return doc
+
+    @staticmethod
+    def _launch(bot, doc: dict):
+        broadcast_id = doc["broadcast_id"]
+        task = asyncio.create_task(BroadcastService._run(bot, doc))
+        BroadcastService._tasks[broadcast_id] = task
+        task.add_done_callback(lambda _: BroadcastService._tasks.pop(broadcast_id, None))
 
     # ----------------------------------------------------------
-    # INTERNAL BROADCAST FUNCTION
+    # ENGINE
     # ----------------------------------------------------------
     @staticmethod
-    async def _broadcast(bot, text: str = "", file_id: str = None, mode: str = "text"):
+    async def _run(bot, doc: dict) -> dict:
+        broadcast_id = doc["broadcast_id"]
+        bucket = TokenBucket(config.BROADCAST_RATE_PER_SECOND)
+        stats = {key: doc.get(key, 0) for key in ("processed", SENT, FAILED, BLOCKED)}
+        last_reported = 0.0
+
+        query = reachable(doc.get("query"))
+        if doc.get("last_user_id") is not None:
+            query = {"$and": [query, {"user_id": {"$gt": doc["last_user_id"]}}]}
+
+        cursor = (
+            adb.users.find(query, {"_id": 0, "user_id": 1})
+            .sort("user_id", 1)
+            .batch_size(config.BROADCAST_BATCH_SIZE)
+        )
+
+        try:
+            batch = []
+            async for user in cursor:
+                batch.append(user["user_id"])
+                if len(batch) < config.BROADCAST_BATCH_SIZE:
+                    continue
+
+                if not await BroadcastService._process_batch(bot, doc, batch, bucket, stats):
+                    return await BroadcastService._cancelled(bot, doc, stats)
+                batch = []
+
+                if time.monotonic() - last_reported >= config.BROADCAST_PROGRESS_SECONDS:
+                    last_reported = time.monotonic()
+                    await BroadcastService._report(bot, doc, stats)
+
+            if batch and not await BroadcastService._process_batch(bot, doc, batch, bucket, stats):
+                return await BroadcastService._cancelled(bot, doc, stats)
+
+            await BroadcastService._finish(bot, doc, stats, "completed")
+
+        except asyncio.CancelledError:
+            # Process shutdown → stays "running" and resumes on next start
+            raise
+        except Exception as e:
+            logger.error(f"[Broadcast] {broadcast_id} crashed: {e}")
+            await BroadcastService._finish(bot, doc, stats, "failed")
+
+        return stats
+
+    @staticmethod
+    async def _process_batch(bot, doc: dict, user_ids: list, bucket: TokenBucket, stats: dict) -> bool:
         """
-        Core broadcast logic.
-        Sends to all users with safe rate-limiting (1 msg/sec).
+        Send to one batch, then checkpoint. Returns False if cancelled.
         """
+        semaphore = asyncio.Semaphore(config.BROADCAST_WORKERS)
+
+        async def worker(uid):
+            async with semaphore:
+                return await BroadcastService._deliver(bot, uid, doc["payload"], bucket)
 
-        users = db.users.find({}, {"user_id": 1})
+        results = await asyncio.gather(*(worker(uid) for uid in user_ids))
 
-        total = 0
-        success = 0
-        failed = 0
+        dead = {}
+        stats["processed"] += len(results)
+        for uid, (outcome, error) in zip(user_ids, results):
+            stats[outcome] += 1
+            if outcome == BLOCKED:
+                dead[uid] = error
 
-        async def send_message(uid):
-            nonlocal success, failed
+        await mark_blocked(dead)
 
+        doc["last_user_id"] = user_ids[-1]
+        checkpoint = await adb.broadcasts.find_one_and_update(
+            {"broadcast_id": doc["broadcast_id"]},
+            {"$set": {
+                "last_user_id": doc["last_user_id"],
+                "updated_at": now(),
+                **stats
+            }},
+            projection={"status": 1}
+        )
+        return bool(checkpoint) and checkpoint.get("status") == "running"
+
+    @staticmethod
+    async def _deliver(bot, uid: int, payload: dict, bucket: TokenBucket) -> tuple:
+        """
+        Returns (outcome, error text).
+        """
+        for attempt in range(config.BROADCAST_MAX_RETRIES + 1):
+            await bucket.acquire()
             try:
-                if mode == "text":
-                    await bot.send_message(uid, text)
-                elif mode == "photo":
-                    await bot.send_photo(uid, file_id, caption=text)
-                elif mode == "file":
-                    await bot.send_document(uid, file_id, caption=text)
-
-                success += 1
-
-            except (TelegramForbiddenError, TelegramBadRequest):
-                failed += 1
-
-        # Send 1 message per second to avoid flood limits
-        for user in users:
-            uid = user["user_id"]
-            total += 1
-
-            await send_message(uid)
-            await asyncio.sleep(1)
-
-        return {
-            "total": total,
-            "success": success,
-            "failed": failed
+                await BroadcastService._send(bot, uid, payload)
+                return SENT, None
+
+            except TelegramRetryAfter as e:
+                # Flood control → pause every worker, then retry this user
+                bucket.pause(e.retry_after)
+
+            except (TelegramForbiddenError, TelegramBadRequest) as e:
+                # Blocked / deactivated / chat gone → flag the user
+                return (BLOCKED if is_dead_chat_error(e) else FAILED), e.message
+
+            except TelegramNetworkError:
+                await asyncio.sleep(1 + attempt)
+
+            except Exception as e:
+                logger.warning(f"[Broadcast] Unexpected error for {uid}: {e}")
+                return FAILED, str(e)
+
+        return FAILED, "max retries exceeded"
+
+    @staticmethod
+    async def _send(bot, uid: int, payload: dict):
+        mode = payload.get("mode")
+        if mode != "copy":
+            raise ValueError(f"Unknown broadcast mode: {mode}")
+
+        message_ids = payload["message_ids"]
+        if len(message_ids) == 1:
+            await bot.copy_message(uid, payload["from_chat_id"], message_ids[0])
+        else:
+            await bot.copy_messages(uid, payload["from_chat_id"], message_ids)
+
+    # ----------------------------------------------------------
+    # PROGRESS
+    # ----------------------------------------------------------
+    @staticmethod
+    async def _finish(bot, doc: dict, stats: dict, status: str):
+        await adb.broadcasts.update_one(
+            {"broadcast_id": doc["broadcast_id"], "status": "running"},
+            {"$set": {"status": status, "finished_at": now(), "updated_at": now(), **stats}}
+        )
+        doc["status"] = status
+        await BroadcastService._report(bot, doc, stats)
+
+    @staticmethod
+    async def _cancelled(bot, doc: dict, stats: dict) -> dict:
+        """
+        Stopped by cancel(): the status is already saved, show it to the admin.
+        """
+        logger.info(f"[Broadcast] {doc['broadcast_id']} cancelled after {stats['processed']} users")
+        doc["status"] = "cancelled"
+        await BroadcastService._report(bot, doc, stats)
+        return stats
+
+    @staticmethod
+    async def _report(bot, doc: dict, stats: dict):
+        if not doc.get("admin_chat_id") or not doc.get("progress_message_id"):
+            return
+
+        try:
+            await bot.edit_message_text(
+                BroadcastService.format_progress({**doc, **stats}),
+                chat_id=doc["admin_chat_id"],
+                message_id=doc["progress_message_id"],
+                parse_mode="Markdown"
+            )
+        except Exception:
+            # "message is not modified" / message deleted
+            pass
+
+    @staticmethod
+    def format_progress(doc: dict) -> str:
+        total = doc.get("total") or 0
+        processed = doc.get("processed", 0)
+        percent = (processed / total * 100) if total else 100.0
+
+        titles = {
+            "running": "📤 **Broadcast Running**",
+            "completed": "📊 **Broadcast Completed**",
+            "cancelled": "⛔ **Broadcast Cancelled**",
+            "failed": "❌ **Broadcast Failed**",
         }
+
+        return (
+            f"{titles.get(doc.get('status'), titles['running'])}\n\n"
+            f"🆔 ID: `{doc['broadcast_id']}`\n"
+            f"🎯 Segment: {doc.get('segment') or 'All users'}\n"
+            f"👥 Progress: {processed}/{total} ({percent:.1f}%)\n"
+            f"✅ Delivered: {doc.get('success', 0)}\n"
+            f"❌ Failed: {doc.get('failed', 0)}\n"
+            f"🚫 Blocked: {doc.get('blocked', 0)}"
+        )
@@ -1,6 +1,6 @@
 # bot_admin/services/file_service.py
 
-from core.database import db
+from core.async_database import adb
 from datetime import datetime
 
 
@@ -10,7 +10,7 @@ class FileService:
     # CREATE / INSERT FILE
     # -----------------------------------------------
     @staticmethod
-    def add_file(file_db_id: str, file_id: str, post_no: int, description: str, extra_message: str):
+    async def add_file(file_db_id: str, file_id: str, post_no: int, description: str, extra_message: str):
         """
         Save file metadata in DB under 'files' collection.
         """
@@ -23,36 +23,36 @@ class FileService:
             "uploaded_at": datetime.utcnow()
         }
 
-        db.files.insert_one(file_data)
+        await adb.files.insert_one(file_data)
         return True
 
     # -----------------------------------------------
     # FETCH FILE BY ID
     # -----------------------------------------------
     @staticmethod
-    def get_file(file_db_id: str):
+    async def get_file(file_db_id: str):
         """
         Return the file document using file_db_id.
         """
-        return db.files.find_one({"file_db_id": file_db_id})
+        return await adb.files.find_one({"file_db_id": file_db_id})
 
     # -----------------------------------------------
     # LIST ALL FILES
     # -----------------------------------------------
     @staticmethod
-    def list_files(limit: int = 50):
+    async def list_files(limit: int = 50):
         """
         Return list of latest files.
         """
-        return list(db.files.find().sort("uploaded_at", -1).limit(limit))
+        return await adb.files.find().sort("uploaded_at", -1).limit(limit).to_list()
 
     # -----------------------------------------------
     # DELETE FILE BY DB ID
     # -----------------------------------------------
     @staticmethod
-    def delete_file(file_db_id: str):
+    async def delete_file(file_db_id: str):
         """
         Delete a file entry from MongoDB.
         """
-        result = db.files.delete_one({"file_db_id": file_db_id})
+        result = await adb.files.delete_one({"file_db_id": file_db_id})
         return result.deleted_count > 0
@@ -1,6 +1,6 @@
 # bot_admin/services/order_service.py
 
-from core.database import db
+from core.async_database import adb
 from core.utils.time_utils import now
 from datetime import timedelta
 
@@ -11,7 +11,7 @@ class OrderService:
     # CREATE NEW ORDER
     # ---------------------------------------------------
     @staticmethod
-    def create_order(order_id: str, user_id: int, plan_id: str, amount: float, qr_expiry_minutes: int):
+    async def create_order(order_id: str, user_id: int, plan_id: str, amount: float, qr_expiry_minutes: int):
         """
         Create new payment order (pending)
         Used by Bot B when user selects a premium plan.
@@ -33,52 +33,52 @@ class OrderService:
             "paid_at": None
         }
 
-        db.orders.insert_one(order_doc)
+        await adb.orders.insert_one(order_doc)
         return True
 
     # ---------------------------------------------------
     # GET ORDER
     # ---------------------------------------------------
     @staticmethod
-    def get_order(order_id: str):
+    async def get_order(order_id: str):
         """
         Fetch order by ID.
         """
-        return db.orders.find_one({"order_id": order_id})
+        return await adb.orders.find_one({"order_id": order_id})
 
     # ---------------------------------------------------
     # LIST ORDERS
     # ---------------------------------------------------
     @staticmethod
-    def list_orders(limit: int = 100):
+    async def list_orders(limit: int = 100):
         """
         Return latest orders.
         """
-        return list(db.orders.find().sort("created_at", -1).limit(limit))
+        return await adb.orders.find().sort("created_at", -1).limit(limit).to_list()
 
     @staticmethod
-    def list_pending():
-        return list(db.orders.find({"status": "pending"}).sort("created_at", -1).limit(100))
+    async def list_pending():
+        return await adb.orders.find({"status": "pending"}).sort("created_at", -1).limit(100).to_list()
 
     @staticmethod
-    def list_expired():
-        return list(db.orders.find({"status": "expired"}).sort("created_at", -1).limit(100))
+    async def list_expired():
+        return await adb.orders.find({"status": "expired"}).sort("created_at", -1).limit(100).to_list()
 
     @staticmethod
-    def list_paid():
-        return list(db.orders.find({"status": "paid"}).sort("paid_at", -1).limit(100))
+    async def list_paid():
+        return await adb.orders.find({"status": "paid"}).sort("paid_at", -1).limit(100).to_list()
 
     # ---------------------------------------------------
     # EXPIRE ORDER (QR expired)
     # ---------------------------------------------------
     @staticmethod
-    def expire_order(order_id: str):
+    async def expire_order(order_id: str):
         """
         Mark order as expired.
         """
-        db.orders.update_one(
+        await adb.orders.update_one(
             {"order_id": order_id},
-            {"$set": {"status": "expired"}}
+            {"$set": {"status": "expired", "expired_at": now()}}
         )
         return True
 
@@ -86,8 +86,8 @@ class OrderService:
     # CHECK IF ORDER IS EXPIRED
     # ---------------------------------------------------
     @staticmethod
-    def is_order_expired(order_id: str):
-        order = OrderService.get_order(order_id)
+    async def is_order_expired(order_id: str):
+        order = await OrderService.get_order(order_id)
         if not order:
             return True
 
@@ -97,8 +97,8 @@ class OrderService:
     # CHECK IF CONFIRM WINDOW IS EXPIRED (10 hours)
     # ---------------------------------------------------
     @staticmethod
-    def is_confirm_window_expired(order_id: str):
-        order = OrderService.get_order(order_id)
+    async def is_confirm_window_expired(order_id: str):
+        order = await OrderService.get_order(order_id)
         if not order:
             return True
 
@@ -108,11 +108,11 @@ class OrderService:
     # MARK ORDER AS PAID
     # ---------------------------------------------------
     @staticmethod
-    def mark_as_paid(order_id: str):
+    async def mark_as_paid(order_id: str):
         """
         Mark order as paid (manual admin confirmation).
         """
-        db.orders.update_one(
+        await adb.orders.update_one(
             {"order_id": order_id},
             {"$set": {"status": "paid", "paid_at": now()}}
         )
@@ -122,23 +122,27 @@ class OrderService:
     # DELETE ORDER
     # ---------------------------------------------------
     @staticmethod
-    def delete_order(order_id: str):
+    async def delete_order(order_id: str):
         """
         Remove an order permanently.
         """
-        result = db.orders.delete_one({"order_id": order_id})
+        result = await adb.orders.delete_one({"order_id": order_id})
         return result.deleted_count > 0
 
     # ---------------------------------------------------
     # UPDATE ORDER STATUS
     # ---------------------------------------------------
     @staticmethod
-    def update_status(order_id: str, status: str):
+    async def update_status(order_id: str, status: str):
         """
         General status update function.
         """
-        db.orders.update_one(
+        fields = {"status": status}
+        if status == "expired":
+            fields["expired_at"] = now()
+
+        await adb.orders.update_one(
             {"order_id": order_id},
-            {"$set": {"status": status}}
+            {"$set": fields}
         )
         return True
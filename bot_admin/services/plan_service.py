@@ -1,6 +1,6 @@
 # bot_admin/services/plan_service.py
 
-from core.database import db
+from core.async_database import adb
 
 
 class PlanService:
@@ -9,7 +9,7 @@ class PlanService:
     # ADD NEW PLAN
     # ---------------------------------------------------
     @staticmethod
-    def add_plan(plan_id: str, days: int, price: float):
+    async def add_plan(plan_id: str, days: int, price: float):
         """
         Add a new premium plan.
         """
@@ -19,68 +19,68 @@ class PlanService:
             "price": price
         }
 
-        db.plans.insert_one(doc)
+        await adb.plans.insert_one(doc)
         return True
 
     # ---------------------------------------------------
     # REMOVE PLAN
     # ---------------------------------------------------
     @staticmethod
-    def remove_plan(plan_id: str):
+    async def remove_plan(plan_id: str):
         """
         Delete a premium plan.
         """
-        result = db.plans.delete_one({"plan_id": plan_id})
+        result = await adb.plans.delete_one({"plan_id": plan_id})
         return result.deleted_count > 0
 
     # ---------------------------------------------------
     # LIST PLANS
     # ---------------------------------------------------
     @staticmethod
-    def list_plans(limit: int = 50):
+    async def list_plans(limit: int = 50):
         """
         Get all premium plans sorted by duration.
         """
-        return list(db.plans.find().sort("days", 1).limit(limit))
+        return await adb.plans.find().sort("days", 1).limit(limit).to_list()
 
     # ---------------------------------------------------
     # GET SINGLE PLAN
     # ---------------------------------------------------
     @staticmethod
-    def get_plan(plan_id: str):
+    async def get_plan(plan_id: str):
         """
         Fetch a specific plan using plan_id.
         """
-        return db.plans.find_one({"plan_id": plan_id})
+        return await adb.plans.find_one({"plan_id": plan_id})
 
     # ---------------------------------------------------
     # CHECK IF PLAN EXISTS
     # ---------------------------------------------------
     @staticmethod
-    def plan_exists(plan_id: str) -> bool:
+    async def plan_exists(plan_id: str) -> bool:
         """
         Return True if plan exists, False if not.
         """
-        return db.plans.count_documents({"plan_id": plan_id}) > 0
+        return await adb.plans.count_documents({"plan_id": plan_id}) > 0
 
     # ---------------------------------------------------
     # GET PRICE
     # ---------------------------------------------------
     @staticmethod
-    def get_price(plan_id: str):
+    async def get_price(plan_id: str):
         """
         Return price of a plan.
         """
-        plan = PlanService.get_plan(plan_id)
+        plan = await PlanService.get_plan(plan_id)
         return plan["price"] if plan else None
 
     # ---------------------------------------------------
     # GET DAYS
     # ---------------------------------------------------
     @staticmethod
-    def get_days(plan_id: str):
+    async def get_days(plan_id: str):
         """
         Return plan duration in days.
         """
-        plan = PlanService.get_plan(plan_id)
+        plan = await PlanService.get_plan(plan_id)
         return plan["days"] if plan else None
@@ -1,6 +1,6 @@
 # bot_admin/services/premium_service.py
 
-from core.database import db
+from core.async_database import adb
 from core.utils.time_utils import now
 from datetime import timedelta
 
@@ -11,7 +11,7 @@ class PremiumService:
     # ACTIVATE PREMIUM (NEW OR EXTENDED)
     # ---------------------------------------------------
     @staticmethod
-    def activate_premium(user_id: int, plan_days: int, plan_id: str):
+    async def activate_premium(user_id: int, plan_days: int, plan_id: str):
         """
         Activates premium membership for the user.
 
@@ -23,7 +23,7 @@ class PremiumService:
         """
 
         current_time = now()
-        user = db.users.find_one({"user_id": user_id})
+        user = await adb.users.find_one({"user_id": user_id})
 
         if user and "premium_expiry" in user and user["premium_expiry"] > current_time:
             # Extend existing premium (stacking)
@@ -32,7 +32,7 @@ class PremiumService:
             # New premium activation
             new_expiry = current_time + timedelta(days=plan_days)
 
-        db.users.update_one(
+        await adb.users.update_one(
             {"user_id": user_id},
             {
                 "$set": {
@@ -50,14 +50,14 @@ class PremiumService:
     # REMOVE PREMIUM STATUS (Used by CRON job)
     # ---------------------------------------------------
     @staticmethod
-    def remove_expired_premium():
+    async def remove_expired_premium():
         """
         Deactivate premium for all users whose expiry has passed.
         Called by cron job every 1 hour.
         """
         current_time = now()
 
-        db.users.update_many(
+        await adb.users.update_many(
             {"premium_expiry": {"$lte": current_time}},
             {
                 "$set": {"is_premium": False},
@@ -70,13 +70,13 @@ class PremiumService:
     # CHECK IF USER IS CURRENTLY PREMIUM
     # ---------------------------------------------------
     @staticmethod
-    def is_premium(user_id: int) -> bool:
+    async def is_premium(user_id: int) -> bool:
         """
         Returns True if user has valid premium.
         """
         current_time = now()
 
-        user = db.users.find_one(
+        user = await adb.users.find_one(
             {
                 "user_id": user_id,
                 "is_premium": True,
@@ -90,20 +90,20 @@ class PremiumService:
     # GET PREMIUM EXPIRY
     # ---------------------------------------------------
     @staticmethod
-    def get_expiry(user_id: int):
-        user = db.users.find_one({"user_id": user_id})
+    async def get_expiry(user_id: int):
+        user = await adb.users.find_one({"user_id": user_id})
         return user.get("premium_expiry") if user else None
 
     # ---------------------------------------------------
     # FORCE REMOVE PREMIUM (Admin action)
     # ---------------------------------------------------
     @staticmethod
-    def revoke_premium(user_id: int):
+    async def revoke_premium(user_id: int):
         """
         Remove premium manually.
         """
 
-        db.users.update_one(
+        await adb.users.update_one(
             {"user_id": user_id},
             {
                 "$set": {"is_premium": False},
@@ -0,0 +1,134 @@
+# bot_admin/services/segment_service.py
+
+"""
+Broadcast Segments
+------------------
+
+Compiles a segment spec (from the /broadcast command arguments) into a
+`users` query (indexes in core/database.py):
+
+    all                               → every user
+    premium                           → premium_expiry > now
+    verified <days>                   → last_verified_at >= now - days
+    unverified                        → no verification field set at all
+    joined <YYYY-MM-DD> [YYYY-MM-DD]  → joined_at range
+    post <post_no>                    → downloaded_posts contains post_no
+
+`last_verified_at` and `downloaded_posts` are written by the User Bot
+since segment targeting exists; older activity is not counted.
+"unverified" therefore also excludes users with any other verification
+field (is_verified / verified_until / manual_verified_until), so users
+verified before `last_verified_at` existed are not messaged as new.
+
+The broadcast cursor sorts by user_id and resumes with user_id > last.
+No segment may force an in-memory sort, so indexes follow the
+equality-sort-range rule:
+ - post: (downloaded_posts, user_id) → equality, then index order
+ - verified / joined / premium: (user_id, <field>) → walked in user_id
+   order, the range is checked on the index key
+ - unverified: walked in user_id order through (user_id,
+   last_verified_at); the other "never verified" conditions are checked
+   per document, so its cost grows with the users scanned, not sorted
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from core.async_database import adb
+from core.utils.time_utils import now
+from core.user_reachability import reachable
+
+
+SEGMENT_HELP = (
+    "**Segments:**\n"
+    "• `all` — every user (default)\n"
+    "• `premium` — active premium users\n"
+    "• `verified <days>` — verified in the last N days\n"
+    "• `unverified` — never verified\n"
+    "• `joined <YYYY-MM-DD> [YYYY-MM-DD]` — joined in a date range\n"
+    "• `post <post_no>` — downloaded a given post"
+)
+
+
+class SegmentError(ValueError):
+    pass
+
+
+def _parse_date(value: str) -> datetime:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    except ValueError:
+        raise SegmentError(f"Invalid date `{value}`, expected YYYY-MM-DD.")
+
+
+def _parse_int(value: str, name: str) -> int:
+    if not value.isdigit() or int(value) <= 0:
+        raise SegmentError(f"{name} must be a positive number.")
+    return int(value)
+
+
+class SegmentService:
+
+    @staticmethod
+    def build(args: list) -> tuple:
+        """
+        args = command arguments → (query, label).
+        Raises SegmentError on invalid input.
+        """
+        if not args or args[0].lower() == "all":
+            return {}, "All users"
+
+        name, params = args[0].lower(), args[1:]
+
+        if name == "premium":
+            return (
+                {"premium_expiry": {"$gt": now()}, "is_premium": True},
+                "Active premium"
+            )
+
+        if name == "verified":
+            if len(params) != 1:
+                raise SegmentError("Usage: `verified <days>`")
+            days = _parse_int(params[0], "Days")
+            return (
+                {"last_verified_at": {"$gte": now() - timedelta(days=days)}},
+                f"Verified in last {days} day(s)"
+            )
+
+        if name == "unverified":
+            return (
+                {
+                    "last_verified_at": None,
+                    "is_verified": {"$ne": True},
+                    "verified_until": None,
+                    "manual_verified_until": None,
+                },
+                "Never verified"
+            )
+
+        if name == "joined":
+            if len(params) not in (1, 2):
+                raise SegmentError("Usage: `joined <YYYY-MM-DD> [YYYY-MM-DD]`")
+            start = _parse_date(params[0])
+            # End date is inclusive
+            end = _parse_date(params[1]) + timedelta(days=1) if len(params) == 2 else now()
+            if end <= start:
+                raise SegmentError("End date must be after start date.")
+            return (
+                {"joined_at": {"$gte": start, "$lt": end}},
+                f"Joined {params[0]} → {params[1] if len(params) == 2 else 'now'}"
+            )
+
+        if name == "post":
+            if len(params) != 1:
+                raise SegmentError("Usage: `post <post_no>`")
+            post_no = _parse_int(params[0], "Post No")
+            return {"downloaded_posts": post_no}, f"Downloaded post {post_no}"
+
+        raise SegmentError(f"Unknown segment `{name}`.")
+
+    @staticmethod
+    async def estimate(query: dict) -> int:
+        """
+        Number of reachable users matching the segment.
+        """
+        return await adb.users.count_documents(reachable(query))
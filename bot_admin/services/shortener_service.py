@@ -1,8 +1,10 @@
 # bot_admin/services/shortener_service.py
 
-from core.database import db
 import random
 
+from core.settings_cache import settings_cache
+from core.shortener_health import ShortenerHealth
+
 
 class ShortenerService:
 
@@ -12,7 +14,7 @@ class ShortenerService:
     # ADD SHORTENER
     # ---------------------------------------------------
     @staticmethod
-    def add_shortener(domain: str, api_key: str):
+    async def add_shortener(domain: str, api_key: str):
         """
         Add a new shortener platform with API key.
         """
@@ -21,11 +23,7 @@ class ShortenerService:
             "api_key": api_key
         }
 
-        db.settings.update_one(
-            {"key": ShortenerService.KEY},
-            {"$addToSet": {"value": entry}},
-            upsert=True
-        )
+        await settings_cache.add_to_set(ShortenerService.KEY, entry)
 
         return True
 
@@ -33,55 +31,58 @@ class ShortenerService:
     # REMOVE SHORTENER
     # ---------------------------------------------------
     @staticmethod
-    def remove_shortener(domain: str):
+    async def remove_shortener(domain: str):
         """
         Remove a shortener platform by domain.
         """
-        db.settings.update_one(
-            {"key": ShortenerService.KEY},
-            {"$pull": {"value": {"domain": domain.lower()}}},
-        )
+        await settings_cache.pull(ShortenerService.KEY, {"domain": domain.lower()})
         return True
 
     # ---------------------------------------------------
     # LIST ALL SHORTENERS
     # ---------------------------------------------------
     @staticmethod
-    def list_shorteners():
+    async def list_shorteners():
         """
         Return all available shortener platforms.
         """
-        doc = db.settings.find_one({"key": ShortenerService.KEY})
-        return doc["value"] if doc else []
+        settings = await settings_cache.get()
+        return settings.shorteners
 
     # ---------------------------------------------------
     # GET RANDOM SHORTENER (Used by Bot B)
     # ---------------------------------------------------
     @staticmethod
-    def get_random():
+    async def get_random():
         """
-        Pick a random shortener from DB.
+        Pick a shortener from DB, weighted by the latency / success stats
+        the User Bot saved in `shortener_stats` (open circuits skipped).
         Returns: {"domain": "...", "api_key": "..."} or None
         """
-        doc = db.settings.find_one({"key": ShortenerService.KEY})
-        if not doc or "value" not in doc or len(doc["value"]) == 0:
+        settings = await settings_cache.get()
+        if not settings.shorteners:
+            return None
+
+        stats = await ShortenerHealth.load_stats()
+        weights = [
+            ShortenerHealth.stats_weight(stats.get(item.get("domain")))
+            for item in settings.shorteners
+        ]
+        if not any(weights):
             return None
 
-        return random.choice(doc["value"])
+        return random.choices(settings.shorteners, weights=weights)[0]
 
     # ---------------------------------------------------
     # GET SHORTENER BY DOMAIN
     # ---------------------------------------------------
     @staticmethod
-    def get_shortener(domain: str):
+    async def get_shortener(domain: str):
         """
         Return a shortener by domain.
         """
-        doc = db.settings.find_one({"key": ShortenerService.KEY})
-        if not doc:
-            return None
-
-        for item in doc["value"]:
+        settings = await settings_cache.get()
+        for item in settings.shorteners:
             if item["domain"].lower() == domain.lower():
                 return item
 
@@ -91,9 +92,9 @@ class ShortenerService:
     # COUNT PLATFORMS
     # ---------------------------------------------------
     @staticmethod
-    def count():
+    async def count():
         """
         Return number of available shorteners.
         """
-        doc = db.settings.find_one({"key": ShortenerService.KEY})
-        return len(doc["value"]) if doc else 0
+        settings = await settings_cache.get()
+        return len(settings.shorteners)
@@ -1,7 +1,7 @@
 # bot_admin/services/template_service.py
 
-from core.database import db
-from core.security.token_encryptor import encode_payload
+from core.async_database import adb
+from core.security.compact_tokens import encode_token
 from core.config import config
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
@@ -12,17 +12,17 @@ class TemplateService:
     # GET FILE DATA
     # ---------------------------------------------------
     @staticmethod
-    def get_file(file_db_id: str):
+    async def get_file(file_db_id: str):
         """
         Return file document from DB.
         """
-        return db.files.find_one({"file_db_id": file_db_id})
+        return await adb.files.find_one({"file_db_id": file_db_id})
 
     # ---------------------------------------------------
     # BUILD TEMPLATE TEXT + KEYBOARD
     # ---------------------------------------------------
     @staticmethod
-    def generate_template(file_data: dict):
+    async def generate_template(file_data: dict):
         """
         Takes the file metadata and generates:
         - Template text (Post - X ...)
@@ -43,9 +43,9 @@ class TemplateService:
             "post_no": post_no
         }
 
-        encoded = encode_payload(payload)
+        encoded = await encode_token(payload, "get")
         bot_username = config.BOT_B_USERNAME
-        final_link = f"https://t.me/{bot_username}?start={encoded}"
+        final_link = f"https://t.me/{bot_username}?start=get_{encoded}"
 
         # ----------------------------------------------
         # TEXT TEMPLATE (EXACT FORMAT YOU REQUESTED)
@@ -76,15 +76,15 @@ class TemplateService:
     # FULL API → Generate FULL Template from DB ID
     # ---------------------------------------------------
     @staticmethod
-    def generate_by_id(file_db_id: str):
+    async def generate_by_id(file_db_id: str):
         """
         High-level function:
         1. Fetch file
         2. Generate template text + keyboard
         """
 
-        file_data = TemplateService.get_file(file_db_id)
+        file_data = await TemplateService.get_file(file_db_id)
         if not file_data:
             return None, None  # file not found
 
-        return TemplateService.generate_template(file_data)
+        return await TemplateService.generate_template(file_data)
@@ -2,7 +2,7 @@
 
 import random
 import string
-from core.database import db
+from core.settings_cache import settings_cache
 
 
 # ---------------------------------------------------
@@ -12,11 +12,8 @@ async def is_admin(user_id: int) -> bool:
     """
     Check whether a user is an admin.
     """
-    doc = db.settings.find_one({"key": "admins"})
-    if not doc or "value" not in doc:
-        return False
-
-    return user_id in doc["value"]
+    settings = await settings_cache.get()
+    return user_id in settings.admins
 
 
 # ---------------------------------------------------
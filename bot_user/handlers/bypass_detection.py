@@ -2,8 +2,9 @@
 
 from aiogram import Router, types
 from aiogram.filters import CommandStart
-from core.security.token_encryptor import decode_payload
-from core.database import db
+from core.security.compact_tokens import decode_token
+from core.async_database import adb
+from core.utils.time_utils import now
 from bot_user.keyboards.inline_buttons import try_again_keyboard
 from bot_user.handlers.force_sub_checker import check_force_sub
 
@@ -25,10 +26,10 @@ async def bypass_detected(message: types.Message):
     data = message.text.replace("/start ", "")
 
     # Remove prefix
-    token = data.replace("bypass_", "")  
+    token = data.replace("bypass_", "", 1)
 
     # Try decoding payload
-    payload = decode_payload(token)
+    payload = await decode_token(token, "bypass")
     if not payload:
         return await message.answer(
             "⚠ **Invalid or corrupted verification token.**",
@@ -50,12 +51,13 @@ async def bypass_detected(message: types.Message):
     # ---------------------------------------
     # LOG THE BYPASS ATTEMPT
     # ---------------------------------------
-    db.bypass.insert_one({
+    await adb.bypass.insert_one({
         "user_id": user_id,
         "token": token,
         "payload": payload,
         "file_id": file_id,
-        "post_no": post_no
+        "post_no": post_no,
+        "created_at": now()
     })
 
     # ---------------------------------------
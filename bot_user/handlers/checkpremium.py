@@ -2,9 +2,9 @@
 
 from aiogram import Router, types
 from aiogram.filters import Command
-from core.database import db
 from core.utils.time_utils import now
 from bot_admin.services.premium_service import PremiumService
+from bot_user.services.access_service import AccessService
 
 router = Router()
 
@@ -18,12 +18,12 @@ async def check_premium(message: types.Message):
     user_id = message.from_user.id
     current_time = now()
 
-    user = db.users.find_one({"user_id": user_id})
+    access = await AccessService.get(user_id)
 
     # -----------------------------------------
     # USER NOT FOUND IN DB → Not premium
     # -----------------------------------------
-    if not user or not user.get("is_premium"):
+    if access.premium_until is None:
         return await message.reply(
             "💎 **Premium Status:** NOT ACTIVE\n\n"
             "›› You do not have an active premium plan.\n"
@@ -31,14 +31,15 @@ async def check_premium(message: types.Message):
             parse_mode="Markdown"
         )
 
-    expiry = user.get("premium_expiry")
+    expiry = access.premium_until
 
     # -----------------------------------------
     # EXPIRED → Clean up premium
     # -----------------------------------------
     if expiry <= current_time:
         # Remove premium status
-        PremiumService.revoke_premium(user_id)
+        await PremiumService.revoke_premium(user_id)
+        AccessService.invalidate(user_id)
 
         return await message.reply(
             "💎 **Premium Status:** EXPIRED\n\n"
@@ -1,10 +1,15 @@
 # bot_user/handlers/click_here_flow.py
 
+from datetime import timedelta
+
 from aiogram import Router, types
 from aiogram.filters import CommandStart
-from core.security.token_encryptor import decode_payload
-from core.database import db
+from core.async_database import adb
+from core.utils.time_utils import now
+from core.security.compact_tokens import decode_token
 from bot_user.handlers.force_sub_checker import check_force_sub
+from bot_user.services.access_service import AccessService
+from bot_user.services.auto_delete_service import auto_delete_scheduler
 from bot_user.keyboards.inline_buttons import clickhere_keyboard, close_message_keyboard
 
 router = Router()
@@ -21,6 +26,7 @@ Steps:
 2. Check force-sub
 3. Check premium OR verification status
 4. Show "Click Here" template (matching your screenshot)
+5. Schedule both messages for auto-delete (same window as deliveries)
 """
 
 @router.message(CommandStart(deep_link_prefix="click_"))
@@ -29,9 +35,9 @@ async def click_here_handler(message: types.Message):
 
     # Extract encoded payload
     data = message.text.replace("/start ", "")
-    encoded = data.replace("click_", "")
+    encoded = data.replace("click_", "", 1)
 
-    payload = decode_payload(encoded)
+    payload = await decode_token(encoded, "click")
     if not payload:
         return await message.answer(
             "⚠ **Invalid or corrupted link.**",
@@ -51,21 +57,9 @@ async def click_here_handler(message: types.Message):
     # -----------------------------------------
     # CHECK IF USER IS VERIFIED OR PREMIUM
     # -----------------------------------------
-    user = db.users.find_one({"user_id": user_id})
-    valid_verified = False
-
-    if user:
-        # Premium overrides everything
-        if user.get("is_premium") and user.get("premium_expiry"):
-            if user["premium_expiry"] > message.date:
-                valid_verified = True
+    access = await AccessService.get(user_id)
 
-        # Verification check
-        if user.get("is_verified") and user.get("verified_until"):
-            if user["verified_until"] > message.date:
-                valid_verified = True
-
-    if not valid_verified:
+    if not access.has_access:
         return await message.answer(
             "⚠ **Your verification has expired.**\n"
             "Please verify again to access this file.",
@@ -78,7 +72,7 @@ async def click_here_handler(message: types.Message):
     # -----------------------------------------
 
     # 1️⃣ Send the “INFO” block
-    await message.answer(
+    sent1 = await message.answer(
         "✔️ Your file download window is active.\n\n"
         "You can click below to get your file again.",
         reply_markup=close_message_keyboard(),
@@ -86,9 +80,22 @@ async def click_here_handler(message: types.Message):
     )
 
     # 2️⃣ Send the CLICK HERE button block
-    await message.answer(
+    sent2 = await message.answer(
         f"📦 **Post - {post_no}**\n\n"
         "Click the button below to download your file again.",
         reply_markup=clickhere_keyboard(encoded),
         parse_mode="Markdown"
     )
+
+    # 3️⃣ Auto-delete both blocks like a delivery (cron job is fallback)
+    delivery = {
+        "user_id": user_id,
+        "file_id": file_id,
+        "post_no": post_no,
+        "chat_id": message.chat.id,
+        "msg1_id": sent1.message_id,
+        "click_message_id": sent2.message_id,
+        "delete_after": now() + timedelta(minutes=5)
+    }
+    await adb.temp_delivery.insert_one(delivery)  # sets delivery["_id"]
+    auto_delete_scheduler.schedule(delivery)
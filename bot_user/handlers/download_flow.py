@@ -2,11 +2,14 @@
 
 from aiogram import Router, types
 from aiogram.filters import CommandStart
-from core.security.token_encryptor import decode_payload
-from core.database import db
+from core.security.compact_tokens import decode_token
+from core.async_database import adb
 from core.utils.time_utils import now
+from core.user_reachability import revive
 from bot_user.handlers.force_sub_checker import check_force_sub
-from bot_user.keyboards.inline_buttons import verify_keyboard, premium_offer_keyboard
+from bot_user.services.access_service import AccessService
+from bot_user.services.auto_delete_service import auto_delete_scheduler
+from bot_user.keyboards.inline_buttons import verify_keyboard
 from bot_user.keyboards.inline_buttons import clickhere_keyboard
 from datetime import timedelta
 
@@ -26,11 +29,14 @@ async def start_download(message: types.Message):
 
     user_id = message.from_user.id
 
+    # User is back → include in broadcasts again
+    await revive(user_id)
+
     # -----------------------------------------
     # EXTRACT PAYLOAD
     # -----------------------------------------
-    encoded = message.text.replace("/start ", "").replace("get_", "")
-    payload = decode_payload(encoded)
+    encoded = message.text.replace("/start ", "").replace("get_", "", 1)
+    payload = await decode_token(encoded, "get")
 
     if not payload:
         return await message.answer(
@@ -57,25 +63,10 @@ async def start_download(message: types.Message):
     # -----------------------------------------
     # CHECK USER STATUS (PREMIUM OR VERIFIED)
     # -----------------------------------------
-    user = db.users.find_one({"user_id": user_id})
-    current = now()
-
-    premium_active = False
-    verified_active = False
-
-    if user:
-        # PREMIUM CHECK
-        if user.get("is_premium") and user.get("premium_expiry"):
-            if user["premium_expiry"] > current:
-                premium_active = True
-
-        # VERIFICATION CHECK
-        if user.get("is_verified") and user.get("verified_until"):
-            if user["verified_until"] > current:
-                verified_active = True
+    access = await AccessService.get(user_id)
 
     # USER IS VERIFIED → deliver file directly
-    if premium_active or verified_active:
+    if access.has_access:
         return await deliver_file(message, file_id, post_no)
 
     # -----------------------------------------
@@ -133,23 +124,29 @@ async def deliver_file(message: types.Message, file_id: str, post_no: int):
     delete_after_min = 5
     delete_after = timedelta(minutes=delete_after_min)
 
-    # Store messages for cleanup system (CRON)
-    db.temp_delivery.insert_one({
-        "user_id": user_id,
-        "file_id": file_id,
-        "post_no": post_no,
-        "msg1_id": sent1.message_id,
-        "msg2_id": sent2.message_id,
-        "chat_id": sent1.chat.id,
-        "delete_after": now() + delete_after
-    })
-
     # -----------------------------------------
     # SEND "CLICK HERE" INFO BLOCK (message 3)
     # -----------------------------------------
-    await message.answer(
+    sent3 = await message.answer(
         f"✔ Your file for **Post - {post_no}** is delivered.\n"
         "Click below to get it again before expiry.",
         reply_markup=clickhere_keyboard(file_id),
         parse_mode="Markdown"
     )
+
+    # Store messages for the auto-delete scheduler (cron job is fallback)
+    delivery = {
+        "user_id": user_id,
+        "file_id": file_id,
+        "post_no": post_no,
+        "msg1_id": sent1.message_id,
+        "msg2_id": sent2.message_id,
+        "click_message_id": sent3.message_id,
+        "chat_id": sent1.chat.id,
+        "delete_after": now() + delete_after
+    }
+    await adb.temp_delivery.insert_one(delivery)  # sets delivery["_id"]
+    auto_delete_scheduler.schedule(delivery)
+
+    # Remember the post for segmented broadcasts
+    await adb.users.update_one({"user_id": user_id}, {"$addToSet": {"downloaded_posts": post_no}})
@@ -1,10 +1,13 @@
 # bot_user/handlers/file_delivery.py
 
-from aiogram import types
+from aiogram import Router, types
 from core.utils.time_utils import now
-from core.database import db
+from core.async_database import adb
 from datetime import timedelta
 from bot_user.keyboards.inline_buttons import clickhere_keyboard
+from bot_user.services.auto_delete_service import auto_delete_scheduler
+
+router = Router()
 
 
 async def deliver_file_core(message: types.Message, file_id: str, post_no: int):
@@ -14,9 +17,9 @@ async def deliver_file_core(message: types.Message, file_id: str, post_no: int):
     1️⃣ Send two copies of the ZIP file with caption:
         "password - Legalstuff321"
 
-    2️⃣ Store both messages in DB for auto-delete
+    2️⃣ Send CLICK HERE UI so user can get file again later
 
-    3️⃣ Send CLICK HERE UI so user can get file again later
+    3️⃣ Store all three messages in DB for auto-delete
     """
 
     user_id = message.from_user.id
@@ -43,25 +46,31 @@ async def deliver_file_core(message: types.Message, file_id: str, post_no: int):
     delete_after_minutes = 5    # You can make this editable from admin bot later
     delete_time = now() + timedelta(minutes=delete_after_minutes)
 
+    # ----------------------------------------------------
+    # SEND THE CLICK HERE UI (Post-Download Message)
+    # ----------------------------------------------------
+    sent3 = await message.answer(
+        f"✔ **File for Post - {post_no} Delivered Successfully!**\n\n"
+        "Your file will auto-delete soon. Click below if you want to re-download.",
+        reply_markup=clickhere_keyboard(file_id, post_no),
+        parse_mode="Markdown"
+    )
+
     # ----------------------------------------------------
     # SAVE TO TEMP COLLECTION FOR BACKGROUND DELETER
     # ----------------------------------------------------
-    db.temp_delivery.insert_one({
+    delivery = {
         "user_id": user_id,
         "file_id": file_id,
         "post_no": post_no,
         "chat_id": message.chat.id,
         "msg1_id": sent1.message_id,
         "msg2_id": sent2.message_id,
+        "click_message_id": sent3.message_id,
         "delete_after": delete_time
-    })
+    }
+    await adb.temp_delivery.insert_one(delivery)  # sets delivery["_id"]
+    auto_delete_scheduler.schedule(delivery)
 
-    # ----------------------------------------------------
-    # SEND THE CLICK HERE UI (Post-Download Message)
-    # ----------------------------------------------------
-    await message.answer(
-        f"✔ **File for Post - {post_no} Delivered Successfully!**\n\n"
-        "Your file will auto-delete soon. Click below if you want to re-download.",
-        reply_markup=clickhere_keyboard(file_id, post_no),
-        parse_mode="Markdown"
-    )
+    # Remember the post for segmented broadcasts
+    await adb.users.update_one({"user_id": user_id}, {"$addToSet": {"downloaded_posts": post_no}})
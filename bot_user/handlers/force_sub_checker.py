@@ -2,7 +2,7 @@
 
 from aiogram import Router, types
 from aiogram.exceptions import TelegramBadRequest
-from core.database import db
+from core.settings_cache import settings_cache
 from bot_user.keyboards.inline_buttons import force_sub_keyboard
 
 router = Router()
@@ -20,8 +20,8 @@ async def check_force_sub(message: types.Message) -> bool:
     # -----------------------------------------
     # FETCH FORCE-SUB LIST
     # -----------------------------------------
-    doc = db.settings.find_one({"key": "force_sub"})
-    channels = doc["value"] if doc else []
+    settings = await settings_cache.get()
+    channels = settings.force_sub
 
     # If no force-sub channels configured → allow access
     if not channels:
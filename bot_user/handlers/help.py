@@ -2,8 +2,7 @@
 
 from aiogram import Router, types
 from aiogram.filters import Command
-from core.database import db
-from core.utils.time_utils import now
+from bot_user.services.access_service import AccessService
 
 router = Router()
 
@@ -11,18 +10,14 @@ router = Router()
 @router.message(Command("help"))
 async def user_help(message: types.Message):
     user_id = message.from_user.id
-    user = db.users.find_one({"user_id": user_id})
-    current = now()
+    access = await AccessService.get(user_id)
 
     # Determine user status
     status_text = "🟥 Not Verified"
-    if user:
-        # Premium
-        if user.get("is_premium") and user.get("premium_expiry", current) > current:
-            status_text = "🟩 Premium User"
-        # Verified
-        elif user.get("is_verified") and user.get("verified_until", current) > current:
-            status_text = "🟦 Verified User"
+    if access.is_premium:
+        status_text = "🟩 Premium User"
+    elif access.is_verified:
+        status_text = "🟦 Verified User"
 
     text = (
         f"👋 **Hello, {message.from_user.first_name}!**\n\n"
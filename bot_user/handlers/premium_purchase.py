@@ -3,7 +3,7 @@
 from aiogram import Router, types
 from aiogram.filters import CommandStart
 from datetime import timedelta
-from core.database import db
+from core.settings_cache import settings_cache
 from core.utils.time_utils import now
 from core.config import config
 from bot_admin.utils.helpers import generate_order_id
@@ -26,7 +26,7 @@ async def premium_start_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
 
     # Fetch all premium plans
-    plans = PlanService.list_plans()
+    plans = await PlanService.list_plans()
 
     if not plans:
         return await callback.message.edit_text(
@@ -50,7 +50,7 @@ async def choose_plan(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     _, plan_id = callback.data.split("_", 1)
 
-    plan = PlanService.get_plan(plan_id)
+    plan = await PlanService.get_plan(plan_id)
     if not plan:
         return await callback.message.edit_text("❌ Plan no longer exists.")
 
@@ -61,11 +61,11 @@ async def choose_plan(callback: types.CallbackQuery):
     order_id = generate_order_id()
 
     # QR expiry time from DB
-    qr_setting = db.settings.find_one({"key": "qr_expiry"})
-    qr_expiry_minutes = qr_setting["value"] if qr_setting else 10
+    settings = await settings_cache.get()
+    qr_expiry_minutes = settings.qr_expiry_minutes
 
     # Create order
-    OrderService.create_order(
+    await OrderService.create_order(
         order_id=order_id,
         user_id=user_id,
         plan_id=plan_id,
@@ -74,14 +74,11 @@ async def choose_plan(callback: types.CallbackQuery):
     )
 
     # Generate UPI QR LINK
-    upi_doc = db.settings.find_one({"key": "upi_id"})
-    name_doc = db.settings.find_one({"key": "upi_name"})
-    upi_id = upi_doc["value"] if upi_doc else "no_upi_set@upi"
-    pay_name = name_doc["value"] if name_doc else "ADMIN"
+    upi_id = settings.upi_id
+    pay_name = settings.upi_name
 
     # Unique price?
-    unique_mode = db.settings.find_one({"key": "unique_paise"})
-    unique_on = unique_mode["value"] == "on" if unique_mode else False
+    unique_on = settings.unique_paise
 
     if unique_on:
         # Example: 40.23 / 40.87 etc
@@ -123,12 +120,12 @@ async def verify_payment(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     _, order_id = callback.data.split("_", 1)
 
-    order = OrderService.get_order(order_id)
+    order = await OrderService.get_order(order_id)
     if not order:
         return await callback.message.edit_text("❌ Order not found.")
 
     # Check QR expiry
-    if OrderService.is_order_expired(order_id):
+    if await OrderService.is_order_expired(order_id):
         return await callback.message.edit_text(
             "⛔ **QR Code Expired**\n\n"
             "Please generate a new payment request.",
@@ -166,7 +163,7 @@ async def verify_payment(callback: types.CallbackQuery):
 @router.callback_query(lambda c: c.data == "premium_back")
 async def premium_back(callback: types.CallbackQuery):
 
-    plans = PlanService.list_plans()
+    plans = await PlanService.list_plans()
     if not plans:
         return await callback.message.edit_text(
             "⚠ No premium plans available.",
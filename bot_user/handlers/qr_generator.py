@@ -1,7 +1,7 @@
 # bot_user/handlers/qr_generator.py
 
 from datetime import timedelta
-from core.database import db
+from core.settings_cache import settings_cache
 from core.utils.time_utils import now
 from core.config import config
 from bot_admin.utils.helpers import generate_order_id
@@ -22,7 +22,7 @@ async def generate_upi_qr(user_id: int, plan_id: str):
     # ---------------------------
     # PLAN VALIDATION
     # ---------------------------
-    plan = PlanService.get_plan(plan_id)
+    plan = await PlanService.get_plan(plan_id)
     if not plan:
         return None, None, None, None
 
@@ -31,8 +31,8 @@ async def generate_upi_qr(user_id: int, plan_id: str):
     # ---------------------------
     # UNIQUE PRICE MODE
     # ---------------------------
-    unique_mode = db.settings.find_one({"key": "unique_paise"})
-    unique_on = unique_mode["value"] == "on" if unique_mode else False
+    settings = await settings_cache.get()
+    unique_on = settings.unique_paise
 
     if unique_on:
         # Example: 40.23 / 40.87 / 40.51
@@ -44,10 +44,9 @@ async def generate_upi_qr(user_id: int, plan_id: str):
     # ---------------------------
     order_id = generate_order_id()
 
-    qr_setting = db.settings.find_one({"key": "qr_expiry"})
-    qr_expiry_minutes = qr_setting["value"] if qr_setting else 10
+    qr_expiry_minutes = settings.qr_expiry_minutes
 
-    OrderService.create_order(
+    await OrderService.create_order(
         order_id=order_id,
         user_id=user_id,
         plan_id=plan_id,
@@ -58,11 +57,8 @@ async def generate_upi_qr(user_id: int, plan_id: str):
     # ---------------------------
     # UPI SETTINGS
     # ---------------------------
-    upi_doc = db.settings.find_one({"key": "upi_id"})
-    name_doc = db.settings.find_one({"key": "upi_name"})
-
-    upi_id = upi_doc["value"] if upi_doc else "no_upi_set@upi"
-    pay_name = name_doc["value"] if name_doc else "ADMIN"
+    upi_id = settings.upi_id
+    pay_name = settings.upi_name
 
     # ---------------------------
     # GENERATE UPI PAY URL
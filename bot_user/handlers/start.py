@@ -2,8 +2,10 @@
 
 from aiogram import Router, types
 from aiogram.filters import CommandStart
-from core.database import db
+from core.async_database import adb
 from core.utils.time_utils import now
+from bot_user.services.access_service import AccessService
+from core.user_reachability import revive
 
 router = Router()
 
@@ -22,9 +24,9 @@ async def user_start(message: types.Message):
     # -----------------------------------------
     # REGISTER USER IF NOT EXISTS
     # -----------------------------------------
-    user = db.users.find_one({"user_id": user_id})
-    if not user:
-        db.users.insert_one({
+    access = await AccessService.get(user_id)
+    if not access.exists:
+        await adb.users.insert_one({
             "user_id": user_id,
             "joined_at": current,
             "is_verified": False,
@@ -32,19 +34,20 @@ async def user_start(message: types.Message):
             "is_premium": False,
             "premium_expiry": None
         })
+        AccessService.invalidate(user_id)
+    else:
+        # User is back → include in broadcasts again
+        await revive(user_id)
 
     # -----------------------------------------
     # DETERMINE USER STATUS
     # -----------------------------------------
     status = "🟥 Not Verified"
 
-    if user:
-        # Premium
-        if user.get("is_premium") and user.get("premium_expiry", current) > current:
-            status = "💎 Premium User"
-        # Verified
-        elif user.get("is_verified") and user.get("verified_until", current) > current:
-            status = "🟦 Verified User"
+    if access.is_premium:
+        status = "💎 Premium User"
+    elif access.is_verified:
+        status = "🟦 Verified User"
 
     # -----------------------------------------
     # WELCOME MESSAGE (CLEAN UI)
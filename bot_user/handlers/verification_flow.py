@@ -2,11 +2,16 @@
 
 from aiogram import Router, types
 from aiogram.filters import CommandStart
-from core.database import db
-from core.security.token_encryptor import encode_payload, decode_payload
+from core.async_database import adb
+from core.settings_cache import settings_cache
+from core.security.compact_tokens import encode_token, decode_token, consume_token
 from core.utils.time_utils import now
+from core.shortener_health import shortener_health
+from core.shortlink_pool import ShortlinkPool
 from bot_user.handlers.force_sub_checker import check_force_sub
-from bot_admin.services.shortener_service import ShortenerService
+from bot_user.services.access_service import AccessService
+from bot_user.services.shortener_service import UserShortenerService
+from bot_user.services.shortlink_prefetcher import shortlink_prefetcher
 from bot_user.keyboards.inline_buttons import (
     verify_now_button,
     get_premium_button,
@@ -29,7 +34,7 @@ async def verification_start_handler(message: types.Message):
     The bot must:
     - Decode the payload
     - Check force-sub
-    - Generate shortlink
+    - Take a prefetched shortlink (or shorten inline)
     - Send them to the redirect link
     """
 
@@ -37,9 +42,10 @@ async def verification_start_handler(message: types.Message):
 
     # Extract encoded payload
     raw = message.text.replace("/start ", "")
-    encoded = raw.replace("verify_", "")
+    encoded = raw.replace("verify_", "", 1)
 
-    payload = decode_payload(encoded)
+    # verify_ carries the post's download (get_) token
+    payload = await decode_token(encoded, "get")
     if not payload:
         return await invalid_token(message)
 
@@ -52,23 +58,27 @@ async def verification_start_handler(message: types.Message):
     if not ok:
         return
 
-    # Step 2 — Create verification token (for redirect server)
-    verify_token = encode_payload({
+    verify_payload = {
         "user_id": user_id,
         "file_id": file_id,
         "post_no": post_no
-    })
+    }
+    settings = await settings_cache.get()
 
-    # Build redirect link
-    redirect_url = f"{db.settings.find_one({'key':'redirect_base'})['value']}?token={verify_token}"
+    # Step 2 — Ready shortlink from the pool (bound to this user + file now)
+    domains = [s["domain"] for s in shortener_health.order(settings.shorteners)]
+    ticket = await ShortlinkPool.take(domains, verify_payload)
 
-    # Step 3 — Choose a shortener
-    selected = ShortenerService.get_random()
-    if not selected:
-        # No shortener configured → send redirect directly
-        short_url = redirect_url
+    if ticket:
+        short_url = ticket["short_url"]
+        shortlink_prefetcher.kick()
     else:
-        short_url = build_shortened_link(selected, redirect_url)
+        # Pool empty / disabled → verification token + inline shortening
+        verify_token = await encode_token(verify_payload, "redirect", ephemeral=True)
+        redirect_url = f"{settings.redirect_base}?token={verify_token}"
+
+        # Falls back to redirect_url if no shortener works in time
+        short_url = await UserShortenerService.shorten_url(redirect_url)
 
     # Step 4 — Show verification instruction
     await message.answer(
@@ -96,33 +106,43 @@ async def verified_success_handler(message: types.Message):
     """
 
     raw = message.text.replace("/start ", "")
-    encoded = raw.replace("verified_", "")
+    encoded = raw.replace("verified_", "", 1)
 
-    payload = decode_payload(encoded)
+    payload = await decode_token(encoded, "verified")
     if not payload:
         return await invalid_token(message)
 
+    # Each verification counts once (shared with every bot process)
+    if not await consume_token(encoded):
+        return await message.answer(
+            "⚠ **This verification link was already used.**\n\n"
+            "Tap VERIFY NOW again to start a new verification.",
+            parse_mode="Markdown"
+        )
+
     user_id = payload.get("user_id")
     file_id = payload.get("file_id")
     post_no = payload.get("post_no")
 
     # Free access duration
-    doc = db.settings.find_one({"key": "free_access_hours"})
-    free_hours = doc["value"] if doc else 1
+    settings = await settings_cache.get()
+    free_hours = settings.free_access_hours
 
     expiry = now() + timedelta(hours=free_hours)
 
     # Update user DB
-    db.users.update_one(
+    await adb.users.update_one(
         {"user_id": user_id},
         {
             "$set": {
                 "is_verified": True,
-                "verified_until": expiry
+                "verified_until": expiry,
+                "last_verified_at": now()
             }
         },
         upsert=True
     )
+    AccessService.invalidate(user_id)
 
     # Send success message as a NEW MESSAGE
     await message.answer(
@@ -146,21 +166,3 @@ async def invalid_token(message: types.Message):
         "Please try verifying again.",
         parse_mode="Markdown"
     )
-
-
-# ===================================================================
-# SHORTENING API CALLER
-# ===================================================================
-def build_shortened_link(shortener, redirect_url):
-    """
-    Dummy shortener builder.
-    Real implementation:
-    GET https://domain/api?api=API_KEY&url=...
-    """
-    domain = shortener["domain"]
-    api = shortener["api_key"]
-
-    # In production, you'd do an HTTP request to the shortener.
-    # Here we emulate the behavior by constructing a fake shortened URL.
-    # Your redirect server will catch real verification.
-    return f"https://{domain}/api?api={api}&url={redirect_url}"
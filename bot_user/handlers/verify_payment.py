@@ -3,11 +3,12 @@
 import asyncio
 from aiogram import Router, types
 from aiogram.filters import CommandStart
-from core.database import db
+from core.async_database import adb
 from core.utils.time_utils import now
 from bot_admin.services.order_service import OrderService
 from bot_admin.services.premium_service import PremiumService
 from bot_admin.services.plan_service import PlanService
+from bot_user.services.access_service import AccessService
 from bot_user.keyboards.inline_buttons import (
     payment_verify_keyboard,
     premium_back_keyboard
@@ -46,7 +47,7 @@ async def verify_payment_callback(callback: types.CallbackQuery):
 # ================================================================
 async def show_payment_state(message: types.Message, order_id: str):
     user_id = message.from_user.id
-    order = OrderService.get_order(order_id)
+    order = await OrderService.get_order(order_id)
 
     # ----------------------------------------------------
     # ORDER DOESN'T EXIST
@@ -60,7 +61,7 @@ async def show_payment_state(message: types.Message, order_id: str):
     # ----------------------------------------------------
     # ORDER EXPIRED (QR EXPIRED)
     # ----------------------------------------------------
-    if OrderService.is_order_expired(order_id):
+    if await OrderService.is_order_expired(order_id):
         return await message.answer(
             "⛔ **QR Code Expired**\n\n"
             "Please generate a new payment request.",
@@ -111,7 +112,7 @@ async def activate_premium_for_user(message: types.Message, order: dict):
     user_id = order["user_id"]
     plan_id = order["plan_id"]
 
-    plan = PlanService.get_plan(plan_id)
+    plan = await PlanService.get_plan(plan_id)
     if not plan:
         return await message.answer(
             "⚠ Plan no longer exists. Contact admin.",
@@ -119,7 +120,8 @@ async def activate_premium_for_user(message: types.Message, order: dict):
         )
 
     plan_days = plan["days"]
-    expiry = PremiumService.activate_premium(user_id, plan_days, plan_id)
+    expiry = await PremiumService.activate_premium(user_id, plan_days, plan_id)
+    AccessService.invalidate(user_id)
 
     # VERIFIED SUCCESSFUL MESSAGE
     await message.answer(
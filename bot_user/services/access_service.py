@@ -0,0 +1,173 @@
+# bot_user/services/access_service.py
+
+"""
+Access State Resolver
+---------------------
+
+Single place that answers "can this user download right now?".
+
+ - Fetches ONLY the access fields of the user document (projection)
+ - Computes premium / verified / manual-grant status in one place
+ - Caches the result per user in a bounded LRU; each entry lives until
+   the earliest grant expiry (capped by ACCESS_CACHE_TTL_SECONDS, or
+   ACCESS_CACHE_NEGATIVE_TTL_SECONDS when the user has no access)
+
+Repeated DOWNLOAD clicks from the same user are served from memory.
+
+Anything in this process that changes a user's premium/verification
+fields must call AccessService.invalidate(user_id) afterwards.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from core.async_database import adb
+from core.config import config
+from core.utils.time_utils import now
+
+
+def _aware(value) -> Optional[datetime]:
+    """
+    Mongo returns naive datetimes unless the client is tz-aware;
+    treat them as UTC so comparisons with now() never fail.
+    """
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+# ---------------------------------------------------------------------------
+# ACCESS STATE
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class AccessState:
+    user_id: int
+    exists: bool = False
+    premium_until: Optional[datetime] = None
+    premium_plan: Optional[str] = None
+    verified_until: Optional[datetime] = None
+    manual_verified_until: Optional[datetime] = None
+
+    @staticmethod
+    def from_user(user_id: int, user: Optional[dict]) -> "AccessState":
+        if not user:
+            return AccessState(user_id=user_id)
+
+        return AccessState(
+            user_id=user_id,
+            exists=True,
+            premium_until=_aware(user.get("premium_expiry")) if user.get("is_premium") else None,
+            premium_plan=user.get("premium_plan"),
+            verified_until=_aware(user.get("verified_until")) if user.get("is_verified") else None,
+            manual_verified_until=_aware(user.get("manual_verified_until"))
+        )
+
+    # ---------------------------------------------------
+    # STATUS
+    # ---------------------------------------------------
+    @property
+    def is_premium(self) -> bool:
+        return self.premium_until is not None and self.premium_until > now()
+
+    @property
+    def is_verified(self) -> bool:
+        current = now()
+        return any(
+            expiry is not None and expiry > current
+            for expiry in (self.verified_until, self.manual_verified_until)
+        )
+
+    @property
+    def has_access(self) -> bool:
+        return self.is_premium or self.is_verified
+
+    @property
+    def status(self) -> str:
+        """
+        "premium" / "verified" / "normal"
+        """
+        if self.is_premium:
+            return "premium"
+        if self.is_verified:
+            return "verified"
+        return "normal"
+
+    @property
+    def next_change(self) -> Optional[datetime]:
+        """
+        Earliest future expiry of any active grant (None if no grant).
+        """
+        current = now()
+        upcoming = [
+            expiry for expiry in (self.premium_until, self.verified_until, self.manual_verified_until)
+            if expiry is not None and expiry > current
+        ]
+        return min(upcoming) if upcoming else None
+
+
+# ---------------------------------------------------------------------------
+# RESOLVER + CACHE
+# ---------------------------------------------------------------------------
+class AccessService:
+
+    PROJECTION = {
+        "_id": 0,
+        "is_premium": 1,
+        "premium_expiry": 1,
+        "premium_plan": 1,
+        "is_verified": 1,
+        "verified_until": 1,
+        "manual_verified_until": 1,
+    }
+
+    # user_id -> (monotonic deadline, AccessState)
+    _cache: "OrderedDict[int, tuple]" = OrderedDict()
+
+    # ---------------------------------------------------
+    # RESOLVE ACCESS STATE
+    # ---------------------------------------------------
+    @staticmethod
+    async def get(user_id: int) -> AccessState:
+        """
+        Return the user's access state, from cache when possible.
+        """
+        cache = AccessService._cache
+        entry = cache.get(user_id)
+        if entry and entry[0] > time.monotonic():
+            cache.move_to_end(user_id)
+            return entry[1]
+
+        user = await adb.users.find_one({"user_id": user_id}, AccessService.PROJECTION)
+        state = AccessState.from_user(user_id, user)
+        AccessService._store(state)
+        return state
+
+    @staticmethod
+    def _store(state: AccessState):
+        change = state.next_change
+        if change is None:
+            ttl = config.ACCESS_CACHE_NEGATIVE_TTL_SECONDS
+        else:
+            ttl = min(
+                (change - now()).total_seconds(),
+                config.ACCESS_CACHE_TTL_SECONDS
+            )
+
+        cache = AccessService._cache
+        cache[state.user_id] = (time.monotonic() + ttl, state)
+        cache.move_to_end(state.user_id)
+
+        while len(cache) > config.ACCESS_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    # ---------------------------------------------------
+    # INVALIDATE (after any local write to access fields)
+    # ---------------------------------------------------
+    @staticmethod
+    def invalidate(user_id: int):
+        AccessService._cache.pop(user_id, None)
@@ -0,0 +1,169 @@
+# bot_user/services/auto_delete_service.py
+
+"""
+Auto-Delete Scheduler
+---------------------
+
+Deletes delivered file messages at their exact `delete_after` time,
+inside the User Bot process.
+
+ - deliver_file / deliver_file_core / click_here_handler call
+   `auto_delete_scheduler.schedule()` right after saving the temp_delivery
+   entry, once every message (files + CLICK HERE block) has been sent
+ - On startup, pending entries are recovered from `temp_delivery`
+ - A min-heap keyed by `delete_after` drives a single timer task
+ - Due entries are processed together: Telegram deletions run with
+   bounded concurrency, then ONE `delete_many` removes their DB entries
+
+jobs/cleanup_files.py remains as a fallback for entries left behind
+while the bot was offline.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from datetime import timezone
+
+from aiogram import Bot
+
+from core.async_database import adb
+from core.config import config
+
+logger = logging.getLogger(__name__)
+
+
+def _timestamp(value) -> float:
+    """
+    datetime → epoch seconds (naive values from Mongo are UTC).
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class AutoDeleteScheduler:
+
+    PROJECTION = {
+        "chat_id": 1,
+        "msg1_id": 1,
+        "msg2_id": 1,
+        "click_message_id": 1,
+        "delete_after": 1,
+    }
+
+    def __init__(self, concurrency: int, batch_size: int):
+        self._concurrency = concurrency
+        self._batch_size = batch_size
+        self._heap = []
+        self._seq = itertools.count()
+        self._wakeup = None
+        self._task = None
+        self._bot = None
+
+    # ---------------------------------------------------------
+    # START / STOP (called from user_main)
+    # ---------------------------------------------------------
+    async def start(self, bot: Bot):
+        """
+        Recover pending deletions from DB and start the timer task.
+        """
+        self._bot = bot
+        self._wakeup = asyncio.Event()
+
+        recovered = 0
+        cursor = adb.temp_delivery.find({}, AutoDeleteScheduler.PROJECTION).sort("delete_after", 1)
+        async for entry in cursor:
+            self._push(entry)
+            recovered += 1
+
+        logger.info(f"[AutoDelete] Recovered {recovered} pending deletions")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ---------------------------------------------------------
+    # SCHEDULE A DELIVERY FOR DELETION
+    # ---------------------------------------------------------
+    def schedule(self, entry: dict):
+        """
+        entry = temp_delivery document (must include `_id`).
+        """
+        if self._wakeup is None:
+            # Scheduler not running → cron fallback will handle it
+            return
+
+        was_first = not self._heap or _timestamp(entry["delete_after"]) < self._heap[0][0]
+        self._push(entry)
+        if was_first:
+            self._wakeup.set()
+
+    def _push(self, entry: dict):
+        due = _timestamp(entry["delete_after"])
+        heapq.heappush(self._heap, (due, next(self._seq), entry))
+
+    # ---------------------------------------------------------
+    # TIMER LOOP
+    # ---------------------------------------------------------
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            due = []
+            current = time.time()
+            while self._heap and self._heap[0][0] <= current and len(due) < self._batch_size:
+                due.append(heapq.heappop(self._heap)[2])
+
+            try:
+                await self._process(due)
+            except Exception as e:
+                logger.error(f"[AutoDelete] Batch failed: {e}")
+
+    async def _process(self, entries: list):
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def delete_entry(entry):
+            message_ids = [
+                entry.get(key) for key in ("msg1_id", "msg2_id", "click_message_id")
+                if entry.get(key)
+            ]
+            async with semaphore:
+                try:
+                    await self._bot.delete_messages(entry["chat_id"], message_ids)
+                except Exception:
+                    # Already deleted / chat gone → nothing left to do
+                    pass
+
+        await asyncio.gather(*(delete_entry(entry) for entry in entries))
+
+        await adb.temp_delivery.delete_many(
+            {"_id": {"$in": [entry["_id"] for entry in entries]}}
+        )
+        logger.info(f"[AutoDelete] Deleted {len(entries)} deliveries")
+
+
+# Global scheduler instance (started in user_main.py)
+auto_delete_scheduler = AutoDeleteScheduler(
+    concurrency=config.AUTO_DELETE_CONCURRENCY,
+    batch_size=config.AUTO_DELETE_BATCH_SIZE
+)
@@ -1,6 +1,6 @@
 # bot_user/services/force_sub_service.py
 
-from core.database import db
+from core.settings_cache import settings_cache
 
 
 class ForceSubService:
@@ -11,7 +11,7 @@ class ForceSubService:
     # GET ALL FORCE-SUB CHANNELS
     # ---------------------------------------------------------
     @staticmethod
-    def get_channels():
+    async def get_channels():
         """
         Returns list of required channels:
         [
@@ -19,43 +19,34 @@ class ForceSubService:
           {"channel": "@Movies", "button_text": "MOVIES"},
         ]
         """
-        doc = db.settings.find_one({"key": ForceSubService.KEY})
-        return doc["value"] if doc else []
+        settings = await settings_cache.get()
+        return settings.force_sub
 
     # ---------------------------------------------------------
     # ADD CHANNEL (Admin Bot Use)
     # ---------------------------------------------------------
     @staticmethod
-    def add_channel(username: str, button_text: str):
+    async def add_channel(username: str, button_text: str):
         """
         Add a force-sub channel:
         username = "@Backup"
         button_text = "BACKUP"
         """
-        db.settings.update_one(
-            {"key": ForceSubService.KEY},
-            {"$addToSet": {
-                "value": {
-                    "channel": username,
-                    "button_text": button_text
-                }
-            }},
-            upsert=True
-        )
+        await settings_cache.add_to_set(ForceSubService.KEY, {
+            "channel": username,
+            "button_text": button_text
+        })
         return True
 
     # ---------------------------------------------------------
     # REMOVE CHANNEL (Admin Bot Use)
     # ---------------------------------------------------------
     @staticmethod
-    def remove_channel(username: str):
+    async def remove_channel(username: str):
         """
         Remove entry by channel username.
         """
-        db.settings.update_one(
-            {"key": ForceSubService.KEY},
-            {"$pull": {"value": {"channel": username}}}
-        )
+        await settings_cache.pull(ForceSubService.KEY, {"channel": username})
         return True
 
     # ---------------------------------------------------------
@@ -63,7 +54,7 @@ class ForceSubService:
     # (Does NOT send UI; only backend validation)
     # ---------------------------------------------------------
     @staticmethod
-    def get_not_joined_channels(chat_member_results: dict):
+    async def get_not_joined_channels(chat_member_results: dict):
         """
         chat_member_results = {
             "@Backup": True/False,
@@ -76,7 +67,7 @@ class ForceSubService:
         ]
         """
         missing = []
-        all_channels = ForceSubService.get_channels()
+        all_channels = await ForceSubService.get_channels()
 
         for item in all_channels:
             username = item["channel"]
@@ -1,6 +1,6 @@
 # bot_user/services/order_service.py
 
-from core.database import db
+from core.async_database import adb
 from core.utils.time_utils import now
 from bot_admin.services.order_service import OrderService as AdminOrderService
 from bot_admin.services.plan_service import PlanService
@@ -12,38 +12,38 @@ class UserOrderService:
     # GET ORDER (READ-ONLY FOR USER BOT)
     # ---------------------------------------------------------
     @staticmethod
-    def get(order_id: str):
+    async def get(order_id: str):
         """
         Fetch order using admin order service.
         Returns None if not found.
         """
-        return AdminOrderService.get_order(order_id)
+        return await AdminOrderService.get_order(order_id)
 
     # ---------------------------------------------------------
     # CHECK IF ORDER IS EXPIRED (QR EXPIRED)
     # ---------------------------------------------------------
     @staticmethod
-    def is_expired(order_id: str) -> bool:
+    async def is_expired(order_id: str) -> bool:
         """
         QR expiry check wrapper.
         """
-        return AdminOrderService.is_order_expired(order_id)
+        return await AdminOrderService.is_order_expired(order_id)
 
     # ---------------------------------------------------------
     # CHECK IF CONFIRM WINDOW IS EXPIRED (10 hours)
     # ---------------------------------------------------------
     @staticmethod
-    def is_confirm_window_expired(order_id: str) -> bool:
+    async def is_confirm_window_expired(order_id: str) -> bool:
         """
         Checks if admin confirmation time has elapsed.
         """
-        return AdminOrderService.is_confirm_window_expired(order_id)
+        return await AdminOrderService.is_confirm_window_expired(order_id)
 
     # ---------------------------------------------------------
     # GET PLAN DETAILS FOR THIS ORDER
     # ---------------------------------------------------------
     @staticmethod
-    def get_plan(order) -> dict:
+    async def get_plan(order) -> dict:
         """
         Returns premium plan document associated with an order.
         """
@@ -51,7 +51,7 @@ class UserOrderService:
         if not plan_id:
             return None
 
-        return PlanService.get_plan(plan_id)
+        return await PlanService.get_plan(plan_id)
 
     # ---------------------------------------------------------
     # CHECK IF ORDER IS PAID
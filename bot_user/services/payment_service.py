@@ -1,6 +1,6 @@
 # bot_user/services/payment_service.py
 
-from core.database import db
+from core.async_database import adb
 from core.utils.time_utils import now
 from bot_admin.services.order_service import OrderService
 from bot_admin.services.plan_service import PlanService
@@ -17,11 +17,11 @@ class PaymentService:
     # GET ORDER OBJECT
     # ---------------------------------------------------------
     @staticmethod
-    def get_order(order_id: str):
+    async def get_order(order_id: str):
         """
         Fetch order document or None.
         """
-        return OrderService.get_order(order_id)
+        return await OrderService.get_order(order_id)
 
     # ---------------------------------------------------------
     # CHECK QR EXPIRY
@@ -75,33 +75,33 @@ class PaymentService:
     # FETCH PLAN USED IN THIS ORDER
     # ---------------------------------------------------------
     @staticmethod
-    def get_plan(order: dict):
+    async def get_plan(order: dict):
         """
         Returns the plan document linked to this order.
         """
         if not order:
             return None
-        return PlanService.get_plan(order["plan_id"])
+        return await PlanService.get_plan(order["plan_id"])
 
     # ---------------------------------------------------------
     # ACTIVATES PREMIUM FOR USER (AFTER ADMIN CONFIRMATION)
     # ---------------------------------------------------------
     @staticmethod
-    def activate_premium(order: dict):
+    async def activate_premium(order: dict):
         """
         This must run only after the admin confirms payment.
         """
         user_id = order["user_id"]
         plan_id = order["plan_id"]
 
-        plan = PlanService.get_plan(plan_id)
+        plan = await PlanService.get_plan(plan_id)
         if not plan:
             return None
 
         days = plan["days"]
 
         # PremiumService handles automatic stacking
-        expiry = PremiumService.activate_premium(
+        expiry = await PremiumService.activate_premium(
             user_id=user_id,
             plan_days=days,
             plan_id=plan_id
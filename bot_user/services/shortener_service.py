@@ -3,7 +3,7 @@
 Async Shortener Service for Bot B (User Bot).
 
 Reads shortener platform entries from MongoDB (settings.key == "shorteners"),
-selects a platform (random), and attempts to shorten a redirect URL via the
+selects a platform (weighted by health, core/shortener_health.py), and attempts to shorten a redirect URL via the
 shortener's API.
 
 Admin-side shortener entries (as saved by admin) are expected to look like:
@@ -11,7 +11,9 @@ Admin-side shortener entries (as saved by admin) are expected to look like:
   "key": "shorteners",
   "value": [
     {"domain": "get2short.com", "api_key": "APIKEY123"},
-    {"domain": "earn2short.com", "api_key": "APIKEY_ABC"}
+    {"domain": "earn2short.com", "api_key": "APIKEY_ABC",
+     "profile": {"endpoint": "/api", "response": "json:shortenedUrl",
+                 "learned_at": <datetime>}}
   ]
 }
 
@@ -21,158 +23,499 @@ Behavior:
    query format: https://{domain}/api?api={api_key}&url={redirect_url}
  - If the response JSON contains a url-like field (common keys: "short", "url",
    "short_url", "shortened"), it returns that value.
- - If the call fails (network error, timeout, unexpected response), returns
-   the original redirect_url as a safe fallback.
+ - Candidate endpoints / other shortener domains are raced as hedged
+   requests under one global deadline (SHORTENER_DEADLINE_SECONDS); the
+   first valid short URL wins and the rest are cancelled.
+ - If nothing works in time (network error, timeout, unexpected response),
+   returns the original redirect_url as a safe fallback.
+ - Every outcome feeds the per-domain latency / success estimate and
+   circuit breaker; domains with an open circuit get no requests.
+
+Learned profiles:
+ - The endpoint + response field that worked for a domain is saved on its
+   settings entry ("profile"), in the background
+ - Afterwards that domain gets exactly ONE request per link, parsed with
+   the learned field only; its other patterns are sent only once that
+   request has failed (slow answers are hedged by OTHER domains)
+ - A fallback pattern that wins does not replace the profile; the
+   profile is only dropped after repeated failures, then re-learned
+ - A profile confirmed by traffic is re-saved at most once every
+   SHORTENER_PROFILE_REFRESH_HOURS; after SHORTENER_PROFILE_MAX_FAILURES
+   consecutive failures it is dropped and the domain is probed again
 
 This module uses aiohttp and is non-blocking so it can be called from async handlers.
+All calls share one pooled session (core/utils/http_client.py), so repeated
+calls to the same shortener reuse a warm keep-alive connection.
 """
 
+from datetime import timezone
 from typing import Optional, Dict, List
-import random
 import logging
 import aiohttp
 import asyncio
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urlparse
 
-from core.database import db
+from core.config import config
+from core.settings_cache import settings_cache
+from core.shortener_health import shortener_health
+from core.utils.http_client import shortener_http
+from core.utils.time_utils import now
 
 logger = logging.getLogger(__name__)
 
 
+# URL patterns tried per shortener (some platforms use different paths).
+# Many shorteners (including the ones used by similar systems) accept
+#  https://{domain}/api?api={api_key}&url={redirect_url}
+ENDPOINT_PATTERNS = {
+    "/api": "https://{domain}/api?api={api_key}&url={url}",
+    "/create": "https://{domain}/create?api={api_key}&url={url}",
+    "/shorten": "https://{domain}/shorten?api={api_key}&url={url}",
+    # fallback attempt: some shorteners accept direct forwarding
+    "/": "https://{domain}/?api={api_key}&url={url}",
+}
+
+# Common JSON keys where the shortened URL might be found
+JSON_KEYS = ("short", "short_url", "shortenedUrl", "url", "result", "data", "shortened")
+NESTED_KEYS = ("url", "short", "short_url")
+
+# Consecutive failures of a learned profile, per domain (this process)
+_profile_failures = {}
+# Pending profile writes (keeps fire-and-forget tasks referenced)
+_profile_tasks = set()
+
+
+class Candidate:
+    """
+    One API call: shortener entry + endpoint + expected response field
+    (None = try every known field).
+    `after` = candidate that must have FAILED before this one is sent
+    (a learned endpoint gates its domain's fallback patterns).
+    """
+
+    __slots__ = ("shortener", "endpoint", "url", "response", "after", "started", "error")
+
+    def __init__(self, shortener: Dict, endpoint: str, url: str, response: str = None, after=None):
+        self.shortener = shortener
+        self.endpoint = endpoint
+        self.url = url
+        self.response = response
+        self.after = after
+        self.started = None     # loop time when the request was sent
+        self.error = None       # why it failed: "timeout", "http_404", ...
+
+    @property
+    def domain_failed(self) -> bool:
+        """
+        True if the failure says something about the DOMAIN (not just a
+        wrong endpoint guess during discovery).
+        """
+        if self.learned:
+            return True
+        return self.error in ("timeout", "deadline", "network", "unexpected") or (
+            self.error or ""
+        ).startswith("http_5")
+
+    @property
+    def domain(self) -> str:
+        return self.shortener.get("domain", "?")
+
+    @property
+    def learned(self) -> bool:
+        return self.response is not None
+
+
 class UserShortenerService:
     KEY = "shorteners"
 
-    # Default HTTP settings
-    DEFAULT_TIMEOUT = 8  # seconds
-    RETRY_COUNT = 2
-
     @staticmethod
-    def get_shorteners() -> List[Dict]:
+    async def get_shorteners() -> List[Dict]:
         """
         Read configured shortener platforms from DB.
         Returns a list of dicts like: [{"domain": "get2short.com", "api_key": "ABC"}, ...]
         """
-        doc = db.settings.find_one({"key": UserShortenerService.KEY})
-        return doc["value"] if doc and "value" in doc else []
+        settings = await settings_cache.get()
+        return settings.shorteners
 
     @staticmethod
-    def get_random_shortener() -> Optional[Dict]:
+    async def get_random_shortener() -> Optional[Dict]:
         """
-        Pick a random shortener platform or return None if none configured.
+        Pick a shortener platform (weighted by latency / success, open
+        circuits skipped) or return None if none is available.
         """
-        items = UserShortenerService.get_shorteners()
+        items = await UserShortenerService.get_shorteners()
         if not items:
             return None
-        return random.choice(items)
+        return shortener_health.choose(items)
 
     @staticmethod
     async def shorten_url(redirect_url: str, preferred: Optional[Dict] = None) -> str:
         """
         Attempt to shorten `redirect_url` using a shortener platform.
 
+        Candidate requests (endpoint patterns x shortener domains) are
+        hedged: see _hedged_race(). The whole call never takes longer
+        than SHORTENER_DEADLINE_SECONDS.
+
         Args:
             redirect_url: The long URL to shorten (usually your redirect server URL).
-            preferred: Optional platform dict (overrides random selection).
+            preferred: Optional platform dict (only this one is used, no
+                       fallback to other domains).
 
         Returns:
             A shortened URL (string). On failure returns the original `redirect_url`.
         """
-        shortener = preferred or UserShortenerService.get_random_shortener()
-        if not shortener:
-            # No shortener configured — fallback to original URL
-            return redirect_url
+        if preferred:
+            shorteners = [preferred]
+        else:
+            items = await UserShortenerService.get_shorteners()
+            if not items:
+                # No shortener configured — fallback to original URL
+                return redirect_url
 
-        domain = shortener.get("domain")
-        api_key = shortener.get("api_key", "")
+            # Weighted random primary first, the others only as hedges
+            shorteners = shortener_health.order(items)
+            if not shorteners:
+                logger.warning("ShortenerService: every shortener circuit is open")
+                return redirect_url
 
-        # Build a common API call. Many shorteners (including the ones used by
-        # similar systems) accept a GET like:
-        #  https://{domain}/api?api={api_key}&url={redirect_url}
-        # We will try this pattern and parse the response.
-        encoded = quote_plus(redirect_url)
-        candidate_urls = [
-            f"https://{domain}/api?api={api_key}&url={encoded}",
-            f"https://{domain}/create?api={api_key}&url={encoded}",
-            f"https://{domain}/shorten?api={api_key}&url={encoded}",
-            # fallback attempt: some shorteners accept direct forwarding
-            f"https://{domain}/?api={api_key}&url={encoded}",
-        ]
-
-        # Try a few candidate endpoints (some platforms use different paths)
-        for url in candidate_urls:
-            short = await UserShortenerService._try_shorten(url)
-            if short:
-                return short
-
-        # Nothing worked — return original redirect_url
-        logger.warning("ShortenerService: all attempts failed for domain=%s", domain)
+        candidates = UserShortenerService._candidates(shorteners, redirect_url)
+        winner, short, response, failed = await UserShortenerService._hedged_race(candidates, redirect_url)
+
+        failed_domains = set()
+        for candidate in failed:
+            if candidate.learned:
+                UserShortenerService._profile_failed(candidate)
+            if candidate.domain_failed:
+                failed_domains.add(candidate.domain)
+
+        if winner:
+            failed_domains.discard(winner.domain)
+            latency = asyncio.get_running_loop().time() - winner.started
+            shortener_health.record_success(winner.domain, latency)
+
+        # One failure per domain and call, however many endpoints failed
+        for domain in failed_domains:
+            shortener_health.record_failure(domain)
+
+        if winner:
+            UserShortenerService._profile_succeeded(winner, response)
+            return short
+
+        # Nothing worked in time — return original redirect_url
+        logger.warning(
+            "ShortenerService: all attempts failed or timed out (domains=%s)",
+            ", ".join(s.get("domain", "?") for s in shorteners)
+        )
         return redirect_url
 
     @staticmethod
-    async def _try_shorten(api_call_url: str) -> Optional[str]:
+    def _candidates(shorteners: List[Dict], redirect_url: str) -> List[Candidate]:
+        """
+        API calls in launch order:
+         1. each domain's learned endpoint, or its most common pattern
+         2. the remaining patterns (discovery / last resort)
+        so a slow provider is hedged by another provider before its less
+        likely endpoints are probed. A learned domain's remaining patterns
+        wait until its learned endpoint has failed (`after`).
+        """
+        encoded = quote_plus(redirect_url)
+
+        def build(shortener: Dict, endpoint: str, response: str = None, after: Candidate = None) -> Candidate:
+            url = ENDPOINT_PATTERNS[endpoint].format(
+                domain=shortener.get("domain"),
+                api_key=shortener.get("api_key", ""),
+                url=encoded
+            )
+            return Candidate(shortener, endpoint, url, response, after)
+
+        first, rest = [], []
+        for shortener in shorteners:
+            profile = shortener.get("profile") or {}
+            learned = profile.get("endpoint")
+
+            if learned in ENDPOINT_PATTERNS:
+                primary = build(shortener, learned, profile.get("response"))
+                first.append(primary)
+                rest.append([build(shortener, e, after=primary) for e in ENDPOINT_PATTERNS if e != learned])
+            else:
+                endpoints = list(ENDPOINT_PATTERNS)
+                first.append(build(shortener, endpoints[0]))
+                rest.append([build(shortener, e) for e in endpoints[1:]])
+
+        # Pattern-major order across domains
+        ordered = list(first)
+        for round_ in zip(*rest):
+            ordered.extend(round_)
+        return ordered
+
+    @staticmethod
+    async def _hedged_race(candidates: List[Candidate], redirect_url: str) -> tuple:
         """
-        Perform the HTTP GET request to the shortener API and attempt to extract
-        a shortened URL from the response.
+        Hedged requests under one global deadline:
+
+         - start the first candidate
+         - every SHORTENER_HEDGE_DELAY_SECONDS without an answer (or at once
+           when a request fails) start the next READY one (its `after`
+           candidate failed), at most SHORTENER_MAX_PARALLEL in flight
+         - the first valid short URL wins; every other request is cancelled
+         - at SHORTENER_DEADLINE_SECONDS everything is cancelled
 
-        Returns the shortened URL on success, otherwise None.
+        Returns (winner, short_url, response_field, failed_candidates);
+        winner is None if nothing succeeded.
         """
-        timeout = aiohttp.ClientTimeout(total=UserShortenerService.DEFAULT_TIMEOUT)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + config.SHORTENER_DEADLINE_SECONDS
+        queue = list(candidates)
+        pending = {}            # task -> candidate
+        failed = []
+        next_launch = loop.time()
 
-        for attempt in range(UserShortenerService.RETRY_COUNT + 1):
-            try:
-                async with aiohttp.ClientSession(timeout=timeout) as session:
-                    async with session.get(api_call_url, headers={"User-Agent": "TelegramFileBot/1.0"}) as resp:
-                        text = await resp.text()
-
-                        # Try JSON first
-                        content_type = resp.headers.get("Content-Type", "")
-                        if "application/json" in content_type:
-                            try:
-                                data = await resp.json()
-                                # Common keys where shortened URL might be found
-                                for key in ("short", "short_url", "url", "result", "data", "shortened"):
-                                    if key in data:
-                                        candidate = data[key]
-                                        # If nested objects
-                                        if isinstance(candidate, dict):
-                                            # try to find nested 'url' or 'short'
-                                            for k in ("url", "short", "short_url"):
-                                                if k in candidate:
-                                                    return candidate[k]
-                                        elif isinstance(candidate, str) and candidate.startswith("http"):
-                                            return candidate
-
-                                # Some APIs return {'status':'ok','result':'https://...'}
-                                if "result" in data and isinstance(data["result"], str) and data["result"].startswith("http"):
-                                    return data["result"]
-
-                            except Exception:
-                                # JSON parsing failed — fall back to text parsing
-                                pass
-
-                        # If not JSON, try to extract URL from plain text (common for many shorteners)
-                        # Quick heuristic: find http(s) substring
-                        # This is a simple approach — not a full HTML parser (keeps dependency light)
-                        idx = text.find("http")
-                        if idx != -1:
-                            # find end of URL (space or newline)
-                            end = len(text)
-                            for sep in (" ", "\n", "\r", '"', "'"):
-                                pos = text.find(sep, idx)
-                                if pos != -1:
-                                    end = min(end, pos)
-                            candidate = text[idx:end].strip()
-                            if candidate.startswith("http"):
-                                return candidate
-
-            except asyncio.TimeoutError:
-                logger.warning("ShortenerService: timeout for %s (attempt %d)", api_call_url, attempt + 1)
-            except aiohttp.ClientError as e:
-                logger.warning("ShortenerService: network error for %s: %s (attempt %d)", api_call_url, e, attempt + 1)
-            except Exception as e:
-                logger.exception("ShortenerService: unexpected error for %s: %s", api_call_url, e)
+        try:
+            while queue or pending:
+                current = loop.time()
+                if current >= deadline:
+                    break
+
+                ready = UserShortenerService._next_ready(queue, failed)
+                if ready is not None and len(pending) < config.SHORTENER_MAX_PARALLEL and (not pending or current >= next_launch):
+                    candidate = queue.pop(ready)
+                    task = asyncio.create_task(UserShortenerService._try_shorten(candidate, redirect_url))
+                    pending[task] = candidate
+                    next_launch = current + config.SHORTENER_HEDGE_DELAY_SECONDS
+                    ready = UserShortenerService._next_ready(queue, failed)
 
-            # small backoff between retries
-            await asyncio.sleep(0.4 * (attempt + 1))
+                if not pending:
+                    # Only gated candidates left, and nothing can release them
+                    break
 
+                wake_at = deadline
+                if ready is not None and len(pending) < config.SHORTENER_MAX_PARALLEL:
+                    wake_at = min(deadline, next_launch)
+
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=max(0.0, wake_at - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    candidate = pending.pop(task)
+                    result = task.result()
+                    if result:
+                        short, response = result
+                        return candidate, short, response, failed
+                    failed.append(candidate)
+
+                if done:
+                    # A candidate failed: don't wait for the hedge delay
+                    next_launch = loop.time()
+
+            # Deadline: whatever is still running was too slow
+            for candidate in pending.values():
+                candidate.error = "deadline"
+                failed.append(candidate)
+            return None, None, None, failed
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def _next_ready(queue: List[Candidate], failed: List[Candidate]) -> Optional[int]:
+        """
+        Index of the first queued candidate that may be sent now.
+        """
+        for index, candidate in enumerate(queue):
+            if candidate.after is None or candidate.after in failed:
+                return index
         return None
+
+    @staticmethod
+    def _is_short_url(candidate, redirect_url: str) -> bool:
+        if not isinstance(candidate, str) or not candidate.startswith(("http://", "https://")):
+            return False
+        if candidate == redirect_url or any(c.isspace() for c in candidate):
+            return False
+        return bool(urlparse(candidate).netloc)
+
+    @staticmethod
+    def _extract_json(data, redirect_url: str, response: str = None) -> Optional[tuple]:
+        """
+        Find the short URL in a JSON body.
+        Returns (short_url, "json:<key>" | "json:<key>.<nested>") or None.
+        With `response` given, only that field is read.
+        """
+        if not isinstance(data, dict):
+            return None
+
+        is_short = UserShortenerService._is_short_url
+
+        if response:
+            key, _, nested = response.removeprefix("json:").partition(".")
+            value = data.get(key)
+            if nested and isinstance(value, dict):
+                value = value.get(nested)
+            return (value, response) if is_short(value, redirect_url) else None
+
+        for key in JSON_KEYS:
+            if key in data:
+                candidate = data[key]
+                # If nested objects
+                if isinstance(candidate, dict):
+                    for k in NESTED_KEYS:
+                        if is_short(candidate.get(k), redirect_url):
+                            return candidate[k], f"json:{key}.{k}"
+                elif is_short(candidate, redirect_url):
+                    return candidate, f"json:{key}"
+
+        return None
+
+    @staticmethod
+    def _extract_text(text: str, redirect_url: str) -> Optional[tuple]:
+        """
+        Extract URL from plain text (common for many shorteners).
+        Quick heuristic: find http(s) substring — not a full HTML parser
+        (keeps dependency light).
+        """
+        idx = text.find("http")
+        if idx == -1:
+            return None
+
+        # find end of URL (space or newline)
+        end = len(text)
+        for sep in (" ", "\n", "\r", '"', "'"):
+            pos = text.find(sep, idx)
+            if pos != -1:
+                end = min(end, pos)
+        candidate = text[idx:end].strip()
+
+        if UserShortenerService._is_short_url(candidate, redirect_url):
+            return candidate, "text"
+        return None
+
+    @staticmethod
+    async def _try_shorten(candidate: Candidate, redirect_url: str) -> Optional[tuple]:
+        """
+        Perform ONE HTTP GET request to the shortener API and attempt to
+        extract a shortened URL from the response (no retries: the hedged
+        race provides the redundancy).
+
+        Returns (short_url, response_field) on success, otherwise None.
+        """
+        session = await shortener_http.session()
+        candidate.started = asyncio.get_running_loop().time()
+        candidate.error = "parse"
+
+        try:
+            async with session.get(candidate.url) as resp:
+                if resp.status >= 400:
+                    candidate.error = f"http_{resp.status}"
+                    return None
+
+                text = await resp.text()
+
+                if candidate.learned:
+                    # Known shape: parse exactly the learned field
+                    if candidate.response == "text":
+                        return UserShortenerService._extract_text(text, redirect_url)
+                    try:
+                        data = await resp.json(content_type=None)
+                    except ValueError:
+                        return None
+                    return UserShortenerService._extract_json(data, redirect_url, candidate.response)
+
+                # Try JSON first
+                content_type = resp.headers.get("Content-Type", "")
+                if "application/json" in content_type:
+                    try:
+                        found = UserShortenerService._extract_json(await resp.json(), redirect_url)
+                        if found:
+                            return found
+                    except ValueError:
+                        # JSON parsing failed — fall back to text parsing
+                        pass
+
+                # HTML is an error / landing page, not an API answer
+                if "text/html" in content_type:
+                    return None
+
+                return UserShortenerService._extract_text(text, redirect_url)
+
+        except asyncio.CancelledError:
+            # Lost the race (or deadline reached)
+            raise
+        except asyncio.TimeoutError:
+            candidate.error = "timeout"
+            logger.warning("ShortenerService: timeout for %s%s", candidate.domain, candidate.endpoint)
+        except aiohttp.ClientError as e:
+            candidate.error = "network"
+            logger.warning("ShortenerService: network error for %s%s: %s", candidate.domain, candidate.endpoint, e)
+        except Exception as e:
+            candidate.error = "unexpected"
+            logger.exception("ShortenerService: unexpected error for %s%s: %s", candidate.domain, candidate.endpoint, e)
+
+        return None
+
+    # ------------------------------------------------------------
+    # LEARNED PROFILES (persisted in settings.shorteners)
+    # ------------------------------------------------------------
+    @staticmethod
+    def _profile_succeeded(candidate: Candidate, response: str):
+        if candidate.after is not None:
+            # Fallback after the learned endpoint failed: keep the profile
+            # (and its failure count) until it is dropped, then re-learn
+            return
+
+        domain = candidate.domain
+        _profile_failures.pop(domain, None)
+
+        profile = candidate.shortener.get("profile") or {}
+        same = profile.get("endpoint") == candidate.endpoint and profile.get("response") == response
+
+        if same:
+            learned_at = profile.get("learned_at")
+            if learned_at is not None and learned_at.tzinfo is None:
+                learned_at = learned_at.replace(tzinfo=timezone.utc)
+            age = (now() - learned_at).total_seconds() if learned_at else float("inf")
+            if age < config.SHORTENER_PROFILE_REFRESH_HOURS * 3600:
+                return
+
+        UserShortenerService._save_profile(domain, {
+            "endpoint": candidate.endpoint,
+            "response": response,
+            "learned_at": now()
+        })
+
+    @staticmethod
+    def _profile_failed(candidate: Candidate):
+        domain = candidate.domain
+        _profile_failures[domain] = _profile_failures.get(domain, 0) + 1
+
+        if _profile_failures[domain] >= config.SHORTENER_PROFILE_MAX_FAILURES:
+            _profile_failures.pop(domain, None)
+            logger.warning("ShortenerService: dropping learned profile for %s", domain)
+            UserShortenerService._save_profile(domain, None)
+
+    @staticmethod
+    def _save_profile(domain: str, profile: Optional[Dict]):
+        """
+        Write (or clear) the profile in the background; never delays the
+        user and never fails the request.
+        """
+        async def write():
+            try:
+                await settings_cache.set_item_field(
+                    UserShortenerService.KEY, {"domain": domain}, "profile", profile
+                )
+                if profile:
+                    logger.info(
+                        "ShortenerService: learned %s → %s (%s)",
+                        domain, profile["endpoint"], profile["response"]
+                    )
+            except Exception as e:
+                logger.warning("ShortenerService: failed to save profile for %s: %s", domain, e)
+
+        task = asyncio.create_task(write())
+        _profile_tasks.add(task)
+        task.add_done_callback(_profile_tasks.discard)
@@ -0,0 +1,139 @@
+# bot_user/services/shortlink_prefetcher.py
+
+"""
+Shortlink Prefetcher
+--------------------
+
+Keeps SHORTLINK_POOL_SIZE ready shortlinks per configured shortener in
+`link_tickets` (core/shortlink_pool.py), inside the User Bot process.
+
+ - Refills every SHORTLINK_POOL_REFILL_SECONDS, and right away when
+   verification_flow takes a link (`kick()`)
+ - Shortener calls run here, off the VERIFY NOW hot path, with bounded
+   concurrency per domain
+ - Domains with an open circuit (core/shortener_health.py) are skipped;
+   a domain that fails to shorten is left alone until the next round
+ - Nothing is prefetched until the redirect base URL is configured
+"""
+
+import asyncio
+import logging
+
+from core.config import config
+from core.settings_cache import settings_cache
+from core.shortener_health import shortener_health
+from core.shortlink_pool import ShortlinkPool
+from bot_user.services.shortener_service import UserShortenerService
+
+logger = logging.getLogger(__name__)
+
+
+class ShortlinkPrefetcher:
+
+    def __init__(self, pool_size: int, refill_seconds: float, concurrency: int):
+        self._pool_size = pool_size
+        self._refill_seconds = refill_seconds
+        self._concurrency = concurrency
+        self._wakeup = None
+        self._task = None
+
+    # ---------------------------------------------------------
+    # START / STOP (called from user_main)
+    # ---------------------------------------------------------
+    async def start(self):
+        if self._pool_size <= 0:
+            logger.info("[ShortlinkPool] Disabled (SHORTLINK_POOL_SIZE=0)")
+            return
+
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def kick(self):
+        """
+        A pooled link was used: refill soon instead of at the next tick.
+        """
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    # ---------------------------------------------------------
+    # REFILL LOOP
+    # ---------------------------------------------------------
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+
+            try:
+                await self._refill()
+            except Exception as e:
+                logger.error(f"[ShortlinkPool] Refill failed: {e}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._refill_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _refill(self):
+        settings = await settings_cache.get()
+        if not settings.redirect_base:
+            return
+
+        for shortener in settings.shorteners:
+            domain = shortener.get("domain")
+            if shortener_health.weight(domain) == 0:
+                continue
+
+            missing = self._pool_size - await ShortlinkPool.available(domain)
+            if missing > 0:
+                added = await self._fill(shortener, settings.redirect_base, missing)
+                if added:
+                    logger.info(f"[ShortlinkPool] {domain}: +{added} shortlinks")
+
+    async def _fill(self, shortener: dict, redirect_base: str, count: int) -> int:
+        """
+        Create up to `count` shortlinks for one domain.
+        Stops at the first failure (shortener down / rejecting us).
+        """
+        domain = shortener.get("domain")
+        added = 0
+        failed = False
+
+        async def create_one():
+            nonlocal added, failed
+            if failed:
+                return
+
+            ticket_id = ShortlinkPool.new_ticket_id()
+            redirect_url = f"{redirect_base}?token={ticket_id}"
+            short_url = await UserShortenerService.shorten_url(redirect_url, preferred=shortener)
+
+            if short_url == redirect_url:
+                failed = True
+                return
+
+            await ShortlinkPool.add(ticket_id, domain, short_url)
+            added += 1
+
+        for start in range(0, count, self._concurrency):
+            batch = min(self._concurrency, count - start)
+            await asyncio.gather(*(create_one() for _ in range(batch)))
+            if failed:
+                break
+
+        return added
+
+
+# Global prefetcher instance (started in user_main.py)
+shortlink_prefetcher = ShortlinkPrefetcher(
+    pool_size=config.SHORTLINK_POOL_SIZE,
+    refill_seconds=config.SHORTLINK_POOL_REFILL_SECONDS,
+    concurrency=config.SHORTLINK_POOL_CONCURRENCY
+)
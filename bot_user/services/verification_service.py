@@ -1,9 +1,11 @@
 # bot_user/services/verification_service.py
 
 from datetime import timedelta
-from core.database import db
+from core.async_database import adb
+from core.settings_cache import settings_cache
 from core.utils.time_utils import now
-from core.security.token_encryptor import encode_payload, decode_payload
+from core.security import compact_tokens
+from bot_user.services.access_service import AccessService
 
 
 class VerificationService:
@@ -12,118 +14,116 @@ class VerificationService:
     # CREATE A NEW VERIFICATION TOKEN (FOR REDIRECT SERVER)
     # -----------------------------------------------------------------------
     @staticmethod
-    def create_verification_token(user_id: int, file_id: str = None, post_no: int = None) -> str:
+    async def create_verification_token(
+        user_id: int, file_id: str = None, post_no: int = None, purpose: str = "verified"
+    ) -> str:
         """
         Creates an encoded verification token.
         This token is used by redirect server and returned through:
-           /start verified_<token>
-           /start bypass_<token>
+           /start verified_<token>   (purpose="verified")
+           /start bypass_<token>     (purpose="bypass")
         """
         payload = {
             "user_id": user_id,
             "file_id": file_id,
             "post_no": post_no,
         }
-        return encode_payload(payload)
+        return await compact_tokens.encode_token(payload, purpose, ephemeral=True)
 
     # -----------------------------------------------------------------------
     # DECODE VERIFICATION TOKEN
     # -----------------------------------------------------------------------
     @staticmethod
-    def decode_token(encoded: str):
+    async def decode_token(encoded: str, purpose: str = "verified"):
         """
-        Safely decode token. Returns dict or None.
+        Safely decode token. Returns dict or None
+        (also for a token issued for another purpose).
         """
-        return decode_payload(encoded)
+        return await compact_tokens.decode_token(encoded, purpose)
 
     # -----------------------------------------------------------------------
     # MARK USER AS VERIFIED
     # -----------------------------------------------------------------------
     @staticmethod
-    def apply_verification(user_id: int) -> int:
+    async def apply_verification(user_id: int) -> int:
         """
         Applies verification time as configured by admin.
         Returns number of hours of verification.
         """
 
-        doc = db.settings.find_one({"key": "free_access_hours"})
-        hours = doc["value"] if doc else 1
+        settings = await settings_cache.get()
+        hours = settings.free_access_hours
 
         expiry = now() + timedelta(hours=hours)
 
-        db.users.update_one(
+        await adb.users.update_one(
             {"user_id": user_id},
             {
                 "$set": {
                     "is_verified": True,
-                    "verified_until": expiry
+                    "verified_until": expiry,
+                    "last_verified_at": now()
                 }
             },
             upsert=True
         )
 
         # Log verification
-        db.verification.insert_one({
+        await adb.verification.insert_one({
             "user_id": user_id,
             "timestamp": now(),
             "hours": hours,
             "expires": expiry
         })
 
+        AccessService.invalidate(user_id)
+
         return hours
 
     # -----------------------------------------------------------------------
     # CHECK IF USER IS STILL VERIFIED
     # -----------------------------------------------------------------------
     @staticmethod
-    def is_verified(user_id: int) -> bool:
-        user = db.users.find_one({"user_id": user_id})
-        if not user:
-            return False
-
-        expiry = user.get("verified_until")
-        if not expiry:
-            return False
-
-        return expiry > now()
+    async def is_verified(user_id: int) -> bool:
+        access = await AccessService.get(user_id)
+        return access.is_verified
 
     # -----------------------------------------------------------------------
     # GET VERIFICATION EXPIRY DATE
     # -----------------------------------------------------------------------
     @staticmethod
-    def get_expiry(user_id: int):
-        user = db.users.find_one({"user_id": user_id})
-        if not user:
-            return None
-        return user.get("verified_until")
+    async def get_expiry(user_id: int):
+        access = await AccessService.get(user_id)
+        return access.verified_until
 
     # -----------------------------------------------------------------------
     # REVOKE VERIFICATION (optional)
     # -----------------------------------------------------------------------
     @staticmethod
-    def revoke(user_id: int):
+    async def revoke(user_id: int):
         """
         Forces verification expiry immediately.
         """
-        db.users.update_one(
+        await adb.users.update_one(
             {"user_id": user_id},
             {
                 "$set": {"is_verified": False},
                 "$unset": {"verified_until": ""}
             }
         )
+        AccessService.invalidate(user_id)
         return True
 
     # -----------------------------------------------------------------------
     # CLEAN EXPIRED VERIFICATIONS (used by cron job)
     # -----------------------------------------------------------------------
     @staticmethod
-    def cleanup_expired():
+    async def cleanup_expired():
         """
         Removes verification status for all expired users.
         Called by jobs/cleanup_verification.py
         """
-        db.users.update_many(
+        await adb.users.update_many(
             {"verified_until": {"$lt": now()}},
             {
                 "$set": {"is_verified": False},
@@ -8,6 +8,10 @@ from aiogram.enums import ParseMode
 from bot_user import setup_user_handlers
 from core.config import config
 from core.database import init_db
+from core.async_database import shutdown_executor
+from core.utils.http_client import shortener_http
+from bot_user.services.auto_delete_service import auto_delete_scheduler
+from bot_user.services.shortlink_prefetcher import shortlink_prefetcher
 
 
 async def main():
@@ -48,6 +52,16 @@ async def main():
 
     logging.info("User Bot Handlers Loaded Successfully.")
 
+    # ---------------------------------------------------
+    # START AUTO-DELETE SCHEDULER (recovers pending deletions)
+    # ---------------------------------------------------
+    await auto_delete_scheduler.start(bot)
+
+    # ---------------------------------------------------
+    # START SHORTLINK PREFETCHER (ready links for VERIFY NOW)
+    # ---------------------------------------------------
+    await shortlink_prefetcher.start()
+
     # ---------------------------------------------------
     # START POLLING
     # ---------------------------------------------------
@@ -55,6 +69,12 @@ async def main():
         await dp.start_polling(bot)
     except Exception as e:
         logging.error(f"❌ Polling crashed: {e}")
+    finally:
+        await auto_delete_scheduler.stop()
+        await shortlink_prefetcher.stop()
+        await shortener_http.close()
+        await bot.session.close()
+        shutdown_executor(wait=False)
 
 
 if __name__ == "__main__":
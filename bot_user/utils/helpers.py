@@ -2,8 +2,9 @@
 
 import asyncio
 from aiogram import types
-from core.database import db
+from core.async_database import adb
 from core.utils.time_utils import now
+from bot_user.services.access_service import AccessService
 
 
 class UserHelpers:
@@ -12,12 +13,12 @@ class UserHelpers:
     # REGISTER USER IF FIRST TIME
     # ---------------------------------------------------------
     @staticmethod
-    def register_user_if_needed(user_id: int):
+    async def register_user_if_needed(user_id: int):
         """
         Creates a new DB user if not exists.
         """
-        if not db.users.find_one({"user_id": user_id}):
-            db.users.insert_one({
+        if not await adb.users.find_one({"user_id": user_id}):
+            await adb.users.insert_one({
                 "user_id": user_id,
                 "joined_at": now(),
                 "is_verified": False,
@@ -86,22 +87,9 @@ class UserHelpers:
     # GET USER STATUS (PREMIUM / VERIFIED / NORMAL)
     # ---------------------------------------------------------
     @staticmethod
-    def get_user_status(user_id: int) -> str:
-        user = db.users.find_one({"user_id": user_id})
-        current = now()
-
-        if not user:
-            return "normal"
-
-        # Premium
-        if user.get("is_premium") and user.get("premium_expiry", current) > current:
-            return "premium"
-
-        # Verified
-        if user.get("is_verified") and user.get("verified_until", current) > current:
-            return "verified"
-
-        return "normal"
+    async def get_user_status(user_id: int) -> str:
+        access = await AccessService.get(user_id)
+        return access.status
 
     # ---------------------------------------------------------
     # EXTRACT DEEPLINK PAYLOAD SAFELY
@@ -0,0 +1,258 @@
+# core/async_database.py
+
+"""
+Async Database Facade
+---------------------
+
+Non-blocking access to MongoDB for aiogram handlers and FastAPI routes.
+
+pymongo is a blocking driver: calling it directly inside `async def`
+code stalls the whole event loop for the duration of every round trip,
+so one slow query delays every other user's update.
+
+This module wraps the existing pymongo client (and its connection pool)
+in a Motor-style async API. Each operation runs on a dedicated thread
+pool sized to the Mongo connection pool, and the event loop keeps
+serving other updates while the query is in flight.
+
+Usage:
+    from core.async_database import adb
+
+    user = await adb.users.find_one({"user_id": 123})
+    await adb.users.update_one({"user_id": 123}, {"$set": {...}})
+
+    async for doc in adb.users.find({}, {"user_id": 1}).batch_size(500):
+        ...
+
+`adb` resolves the database lazily, so it is safe to import before
+init_db() has run.
+"""
+
+import asyncio
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from core import database
+from core.config import config
+
+
+# ---------------------------------------------------------------------------
+# SHARED THREAD POOL (one per process)
+# ---------------------------------------------------------------------------
+_executor = None
+
+# Optional callback(operation, seconds) for every DB call (metrics)
+_observer = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=config.DB_EXECUTOR_WORKERS,
+            thread_name_prefix="mongo-io"
+        )
+    return _executor
+
+
+async def run_sync(func, *args, **kwargs):
+    """
+    Run a blocking callable on the DB thread pool and await its result.
+    """
+    loop = asyncio.get_running_loop()
+    if _observer is None:
+        return await loop.run_in_executor(_get_executor(), partial(func, *args, **kwargs))
+
+    start = time.perf_counter()
+    try:
+        return await loop.run_in_executor(_get_executor(), partial(func, *args, **kwargs))
+    finally:
+        _observer(getattr(func, "__name__", "call"), time.perf_counter() - start)
+
+
+def set_observer(callback):
+    """
+    Time every DB call: callback(operation_name, seconds), called on the
+    event loop thread. None disables it.
+    """
+    global _observer
+    _observer = callback
+
+
+def shutdown_executor(wait: bool = True):
+    """
+    Stop the DB thread pool (call on process shutdown).
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
+
+
+# ---------------------------------------------------------------------------
+# ASYNC CURSOR
+# ---------------------------------------------------------------------------
+class AsyncCursor:
+    """
+    Lazy async wrapper around `Collection.find()`.
+
+    Supports chaining like a pymongo cursor:
+        adb.orders.find({...}).sort("created_at", -1).limit(30)
+
+    Documents are pulled from the server in batches on the thread pool.
+    """
+
+    DEFAULT_BATCH_SIZE = 100
+
+    def __init__(self, collection: "AsyncCollection", *args, **kwargs):
+        self._collection = collection
+        self._args = args
+        self._kwargs = kwargs
+        self._sort = None
+        self._limit = 0
+        self._skip = 0
+        self._batch_size = AsyncCursor.DEFAULT_BATCH_SIZE
+
+    def sort(self, key_or_list, direction=None):
+        if direction is not None:
+            self._sort = [(key_or_list, direction)]
+        elif isinstance(key_or_list, str):
+            self._sort = [(key_or_list, 1)]
+        else:
+            self._sort = list(key_or_list)
+        return self
+
+    def limit(self, limit: int):
+        self._limit = limit
+        return self
+
+    def skip(self, skip: int):
+        self._skip = skip
+        return self
+
+    def batch_size(self, batch_size: int):
+        self._batch_size = batch_size
+        return self
+
+    def _build(self):
+        cursor = self._collection.sync.find(*self._args, **self._kwargs)
+        if self._sort:
+            cursor = cursor.sort(self._sort)
+        if self._skip:
+            cursor = cursor.skip(self._skip)
+        if self._limit:
+            cursor = cursor.limit(self._limit)
+        return cursor.batch_size(self._batch_size)
+
+    async def to_list(self, length: int = None) -> list:
+        """
+        Fetch the whole result (or the first `length` docs) in one hop.
+        """
+        def _fetch():
+            cursor = self._build()
+            if length:
+                return list(itertools.islice(cursor, length))
+            return list(cursor)
+
+        return await run_sync(_fetch)
+
+    async def __aiter__(self):
+        cursor = await run_sync(self._build)
+        try:
+            while True:
+                batch = await run_sync(
+                    lambda: list(itertools.islice(cursor, self._batch_size))
+                )
+                if not batch:
+                    break
+                for doc in batch:
+                    yield doc
+        finally:
+            await run_sync(cursor.close)
+
+
+# ---------------------------------------------------------------------------
+# ASYNC COLLECTION
+# ---------------------------------------------------------------------------
+class AsyncCollection:
+    """
+    Async mirror of the pymongo Collection methods used in this project.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+
+    @property
+    def sync(self):
+        """Underlying pymongo collection (resolved at call time)."""
+        return database.get_db()[self._name]
+
+    async def find_one(self, *args, **kwargs):
+        return await run_sync(self.sync.find_one, *args, **kwargs)
+
+    def find(self, *args, **kwargs) -> AsyncCursor:
+        return AsyncCursor(self, *args, **kwargs)
+
+    async def insert_one(self, document, **kwargs):
+        return await run_sync(self.sync.insert_one, document, **kwargs)
+
+    async def insert_many(self, documents, **kwargs):
+        return await run_sync(self.sync.insert_many, documents, **kwargs)
+
+    async def update_one(self, filter, update, **kwargs):
+        return await run_sync(self.sync.update_one, filter, update, **kwargs)
+
+    async def update_many(self, filter, update, **kwargs):
+        return await run_sync(self.sync.update_many, filter, update, **kwargs)
+
+    async def find_one_and_update(self, filter, update, **kwargs):
+        return await run_sync(self.sync.find_one_and_update, filter, update, **kwargs)
+
+    async def delete_one(self, filter, **kwargs):
+        return await run_sync(self.sync.delete_one, filter, **kwargs)
+
+    async def delete_many(self, filter, **kwargs):
+        return await run_sync(self.sync.delete_many, filter, **kwargs)
+
+    async def count_documents(self, filter, **kwargs) -> int:
+        return await run_sync(self.sync.count_documents, filter, **kwargs)
+
+    async def estimated_document_count(self, **kwargs) -> int:
+        return await run_sync(self.sync.estimated_document_count, **kwargs)
+
+    async def bulk_write(self, requests, **kwargs):
+        return await run_sync(self.sync.bulk_write, requests, **kwargs)
+
+    async def aggregate(self, pipeline, **kwargs) -> list:
+        return await run_sync(lambda: list(self.sync.aggregate(pipeline, **kwargs)))
+
+
+# ---------------------------------------------------------------------------
+# ASYNC DATABASE
+# ---------------------------------------------------------------------------
+class AsyncDatabase:
+    """
+    Attribute access returns an AsyncCollection:
+        adb.users, adb.settings, adb["orders"]
+    """
+
+    def __init__(self):
+        self._collections = {}
+
+    def __getitem__(self, name: str) -> AsyncCollection:
+        coll = self._collections.get(name)
+        if coll is None:
+            coll = AsyncCollection(name)
+            self._collections[name] = coll
+        return coll
+
+    def __getattr__(self, name: str) -> AsyncCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+
+# Global async database reference
+adb = AsyncDatabase()
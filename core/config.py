@@ -28,16 +28,148 @@ class Config:
     MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/telegram_file_system")
     MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "telegram_file_system")
 
+    # Connection pool size shared by every thread talking to MongoDB
+    MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 50))
+
+    # Worker threads used by the async DB facade (core/async_database.py).
+    # Never more useful than the pool size: extra threads would only wait
+    # for a free connection.
+    DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", MONGO_MAX_POOL_SIZE))
+
+    # TTL retention (MongoDB removes these documents by itself)
+    VERIFICATION_LOG_TTL_DAYS = int(os.getenv("VERIFICATION_LOG_TTL_DAYS", 7))
+    REDIRECT_LOG_TTL_HOURS = int(os.getenv("REDIRECT_LOG_TTL_HOURS", 6))
+    BYPASS_LOG_TTL_DAYS = int(os.getenv("BYPASS_LOG_TTL_DAYS", 30))
+    EXPIRED_ORDER_TTL_DAYS = int(os.getenv("EXPIRED_ORDER_TTL_DAYS", 7))
+
     # ------------------------------------------------------
     # REDIRECT SERVER CONFIG
     # ------------------------------------------------------
     # Example: "http://152.42.212.81:5000/redirect"
     REDIRECT_BASE = os.getenv("REDIRECT_BASE", "")
 
+    # Max age of the signed visit ticket issued by /redirect
+    VISIT_TICKET_MAX_AGE_SECONDS = int(os.getenv("VISIT_TICKET_MAX_AGE_SECONDS", 1800))
+    # Minimum seconds between /redirect and /return (server-enforced
+    # countdown; also shown on the countdown page)
+    VERIFY_MIN_DWELL_SECONDS = int(os.getenv("VERIFY_MIN_DWELL_SECONDS", 10))
+    # Also write every visit to redirect_logs (async, off the request path)
+    REDIRECT_AUDIT_LOG = os.getenv("REDIRECT_AUDIT_LOG", "off").lower() in ("1", "on", "true", "yes")
+    # Serve the countdown page as one precompressed static document:
+    # /redirect then never decodes the token or touches MongoDB, and a
+    # front proxy / CDN may cache it. The page's script POSTs the token
+    # to /visit, which validates it and sets the visit ticket cookie.
+    REDIRECT_STATIC_PAGE = os.getenv("REDIRECT_STATIC_PAGE", "off").lower() in ("1", "on", "true", "yes")
+    # Prometheus text metrics on GET /metrics (redirect_server/metrics.py)
+    REDIRECT_METRICS = os.getenv("REDIRECT_METRICS", "on").lower() in ("1", "on", "true", "yes")
+
+    # Bind address / worker processes (redirect_server/gunicorn_conf.py)
+    REDIRECT_HOST = os.getenv("REDIRECT_HOST", "0.0.0.0")
+    REDIRECT_PORT = int(os.getenv("REDIRECT_PORT", 5000))
+    # 0 = one worker per CPU core
+    REDIRECT_WORKERS = int(os.getenv("REDIRECT_WORKERS", 0))
+    # Seconds a worker gets to finish in-flight requests on reload / stop
+    REDIRECT_GRACEFUL_TIMEOUT = int(os.getenv("REDIRECT_GRACEFUL_TIMEOUT", 30))
+
     # Secret key for token encryption
     # If not present, generate a secure default key
     TOKEN_SECRET = os.getenv("TOKEN_SECRET", "THIS_IS_NOT_SECURE_CHANGE_ME")
 
+    # Key rotation (core/security/key_ring.py): "kid:secret,kid:secret",
+    # newest first. Empty → TOKEN_SECRET is the only key.
+    TOKEN_KEYS = os.getenv("TOKEN_KEYS", "")
+
+    # Deep-link token format (core/security/compact_tokens.py):
+    #   "compact" → 22-char ID stored in `tokens` (fits Telegram's 64 chars)
+    #   "fernet"  → self-contained encrypted token (150+ chars)
+    TOKEN_MODE = os.getenv("TOKEN_MODE", "compact").lower()
+    # Compact tokens kept in memory per process
+    TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 50000))
+    # Lifetime of per-user tokens (verify_ / verified_ / bypass_)
+    TOKEN_EPHEMERAL_TTL_HOURS = int(os.getenv("TOKEN_EPHEMERAL_TTL_HOURS", 24))
+    # Memoized Fernet decoding (core/security/token_encryptor.py), 0 = off
+    TOKEN_DECODE_CACHE_SIZE = int(os.getenv("TOKEN_DECODE_CACHE_SIZE", 10000))
+    TOKEN_DECODE_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_DECODE_CACHE_TTL_SECONDS", 600))
+
+    # ------------------------------------------------------
+    # SETTINGS CACHE
+    # ------------------------------------------------------
+    # How often (seconds) a process checks whether another process
+    # changed the settings collection (core/settings_cache.py)
+    SETTINGS_REFRESH_SECONDS = float(os.getenv("SETTINGS_REFRESH_SECONDS", 5))
+
+    # ------------------------------------------------------
+    # USER ACCESS CACHE (bot_user/services/access_service.py)
+    # ------------------------------------------------------
+    ACCESS_CACHE_SIZE = int(os.getenv("ACCESS_CACHE_SIZE", 10000))
+    # Max lifetime of a cached premium/verified state. Grants made by the
+    # Admin Bot (another process) become visible after at most this long.
+    ACCESS_CACHE_TTL_SECONDS = float(os.getenv("ACCESS_CACHE_TTL_SECONDS", 300))
+    # Lifetime of a cached "no access" state
+    ACCESS_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv("ACCESS_CACHE_NEGATIVE_TTL_SECONDS", 30))
+
+    # ------------------------------------------------------
+    # AUTO-DELETE SCHEDULER (User Bot)
+    # ------------------------------------------------------
+    # Max parallel Telegram delete calls
+    AUTO_DELETE_CONCURRENCY = int(os.getenv("AUTO_DELETE_CONCURRENCY", 10))
+    # Max deliveries handled (and removed from DB) per batch
+    AUTO_DELETE_BATCH_SIZE = int(os.getenv("AUTO_DELETE_BATCH_SIZE", 200))
+
+    # ------------------------------------------------------
+    # BROADCAST ENGINE (Admin Bot)
+    # ------------------------------------------------------
+    # Telegram allows ~30 msg/sec globally for a bot; stay slightly below
+    BROADCAST_RATE_PER_SECOND = float(os.getenv("BROADCAST_RATE_PER_SECOND", 25))
+    # Concurrent senders (each chat only receives one call per broadcast,
+    # so the per-chat limit of 1 msg/sec is never hit)
+    BROADCAST_WORKERS = int(os.getenv("BROADCAST_WORKERS", 25))
+    # Users fetched per cursor batch = users per progress checkpoint
+    BROADCAST_BATCH_SIZE = int(os.getenv("BROADCAST_BATCH_SIZE", 500))
+    # Retries per user after TelegramRetryAfter / network errors
+    BROADCAST_MAX_RETRIES = int(os.getenv("BROADCAST_MAX_RETRIES", 3))
+    # Min seconds between live progress message edits
+    BROADCAST_PROGRESS_SECONDS = float(os.getenv("BROADCAST_PROGRESS_SECONDS", 10))
+    # Seconds to wait for the remaining messages of an album (media group)
+    BROADCAST_ALBUM_WAIT_SECONDS = float(os.getenv("BROADCAST_ALBUM_WAIT_SECONDS", 1.5))
+
+    # ------------------------------------------------------
+    # SHORTENER HTTP CLIENT (User Bot, core/utils/http_client.py)
+    # ------------------------------------------------------
+    SHORTENER_HTTP_LIMIT = int(os.getenv("SHORTENER_HTTP_LIMIT", 100))
+    SHORTENER_HTTP_LIMIT_PER_HOST = int(os.getenv("SHORTENER_HTTP_LIMIT_PER_HOST", 20))
+    SHORTENER_DNS_CACHE_SECONDS = int(os.getenv("SHORTENER_DNS_CACHE_SECONDS", 300))
+    # Idle keep-alive connections are closed after this long
+    SHORTENER_KEEPALIVE_SECONDS = float(os.getenv("SHORTENER_KEEPALIVE_SECONDS", 60))
+    # Per shortener API request
+    SHORTENER_TIMEOUT_SECONDS = float(os.getenv("SHORTENER_TIMEOUT_SECONDS", 8))
+    # Hard budget for one shorten_url() call (all hedged requests)
+    SHORTENER_DEADLINE_SECONDS = float(os.getenv("SHORTENER_DEADLINE_SECONDS", 4))
+    # Start the next candidate if no answer after this long
+    SHORTENER_HEDGE_DELAY_SECONDS = float(os.getenv("SHORTENER_HEDGE_DELAY_SECONDS", 0.5))
+    # Max concurrent requests per shorten_url() call
+    SHORTENER_MAX_PARALLEL = int(os.getenv("SHORTENER_MAX_PARALLEL", 3))
+    # Learned endpoint profiles (settings.shorteners[].profile)
+    SHORTENER_PROFILE_REFRESH_HOURS = float(os.getenv("SHORTENER_PROFILE_REFRESH_HOURS", 24))
+    SHORTENER_PROFILE_MAX_FAILURES = int(os.getenv("SHORTENER_PROFILE_MAX_FAILURES", 3))
+    # Health-weighted selection + circuit breaker (core/shortener_health.py)
+    SHORTENER_EWMA_ALPHA = float(os.getenv("SHORTENER_EWMA_ALPHA", 0.2))
+    SHORTENER_BREAKER_FAILURES = int(os.getenv("SHORTENER_BREAKER_FAILURES", 5))
+    SHORTENER_BREAKER_OPEN_SECONDS = float(os.getenv("SHORTENER_BREAKER_OPEN_SECONDS", 60))
+    # How often the User Bot saves stats for the Admin Bot's /listshorteners
+    SHORTENER_STATS_FLUSH_SECONDS = float(os.getenv("SHORTENER_STATS_FLUSH_SECONDS", 30))
+
+    # ------------------------------------------------------
+    # SHORTLINK POOL (User Bot, core/shortlink_pool.py)
+    # ------------------------------------------------------
+    # Ready shortlinks kept per shortener (0 = off, shorten inline)
+    SHORTLINK_POOL_SIZE = int(os.getenv("SHORTLINK_POOL_SIZE", 20))
+    SHORTLINK_POOL_REFILL_SECONDS = float(os.getenv("SHORTLINK_POOL_REFILL_SECONDS", 30))
+    # Concurrent shortener calls per domain while refilling
+    SHORTLINK_POOL_CONCURRENCY = int(os.getenv("SHORTLINK_POOL_CONCURRENCY", 3))
+    # Unused shortlinks are discarded after this long
+    SHORTLINK_POOL_MAX_AGE_HOURS = int(os.getenv("SHORTLINK_POOL_MAX_AGE_HOURS", 24))
+
     # ------------------------------------------------------
     # VERIFICATION SETTINGS
     # ------------------------------------------------------
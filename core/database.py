@@ -3,7 +3,7 @@
 import logging
 import time
 from pymongo import MongoClient, ASCENDING
-from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError, OperationFailure
 
 from core.config import config
 
@@ -27,7 +27,7 @@ def init_db(retries: int = 10, delay: int = 2):
         try:
             client = MongoClient(
                 mongo_uri,
-                maxPoolSize=50,
+                maxPoolSize=config.MONGO_MAX_POOL_SIZE,
                 serverSelectionTimeoutMS=5000
             )
             # Trigger connection check
@@ -47,6 +47,31 @@ def init_db(retries: int = 10, delay: int = 2):
     raise Exception("❌ Could not connect to MongoDB after multiple attempts.")
 
 
+def close_db():
+    """
+    Close the MongoDB client (and its connection pool).
+    """
+    global db
+
+    if db is not None:
+        db.client.close()
+        db = None
+        logging.info("[DB] MongoDB connection closed.")
+
+
+def get_db():
+    """
+    Return the initialized database handle.
+
+    `from core.database import db` binds the value at import time (None
+    before init_db() runs), so long-lived modules should resolve the
+    handle through this function instead.
+    """
+    if db is None:
+        raise RuntimeError("Database not initialized. Call init_db() first.")
+    return db
+
+
 # ---------------------------------------------------------------------------
 # CREATE NECESSARY INDEXES — HIGH PERFORMANCE & CLEAN STORAGE
 # ---------------------------------------------------------------------------
@@ -60,6 +85,14 @@ def _create_indexes():
     db.users.create_index([("user_id", ASCENDING)], unique=True)
     db.users.create_index([("premium_expiry", ASCENDING)])
     db.users.create_index([("verified_until", ASCENDING)])
+    db.users.create_index([("blocked_at", ASCENDING)])
+    # Broadcast segments (bot_admin/services/segment_service.py).
+    # The cursor sorts on user_id and resumes with user_id > last, so by
+    # equality-sort-range: equality field first, user_id before a range
+    db.users.create_index([("downloaded_posts", ASCENDING), ("user_id", ASCENDING)])
+    db.users.create_index([("user_id", ASCENDING), ("last_verified_at", ASCENDING)])
+    db.users.create_index([("user_id", ASCENDING), ("joined_at", ASCENDING)])
+    db.users.create_index([("user_id", ASCENDING), ("premium_expiry", ASCENDING)])
 
     # ---------------- FILES ----------------
     db.files.create_index([("file_db_id", ASCENDING)], unique=True)
@@ -73,14 +106,57 @@ def _create_indexes():
     db.orders.create_index([("expires_at", ASCENDING)])
     db.orders.create_index([("confirm_until", ASCENDING)])
 
+    # Expired orders are removed by MongoDB itself once `expired_at` is
+    # older than EXPIRED_ORDER_TTL_DAYS (paid orders never get the field)
+    _ensure_ttl_index(db.orders, "expired_at", config.EXPIRED_ORDER_TTL_DAYS * 86400)
+
     # ---------------- SETTINGS ----------------
     db.settings.create_index([("key", ASCENDING)], unique=True)
 
     # ---------------- VERIFICATION LOGS ----------------
     db.verification.create_index([("user_id", ASCENDING)])
     db.verification.create_index([("timestamp", ASCENDING)])
+    _ensure_ttl_index(db.verification, "expires", config.VERIFICATION_LOG_TTL_DAYS * 86400)
+
+    # ---------------- REDIRECT LOGS (bypass detection) ----------------
+    _ensure_ttl_index(db.redirect_logs, "visited_at", config.REDIRECT_LOG_TTL_HOURS * 3600)
+
+    # ---------------- BYPASS ATTEMPTS ----------------
+    _ensure_ttl_index(db.bypass, "created_at", config.BYPASS_LOG_TTL_DAYS * 86400)
 
     # ---------------- TEMP DELIVERY (auto-delete jobs) ----------------
     db.temp_delivery.create_index([("delete_after", ASCENDING)])
 
+    # ---------------- COMPACT DEEP-LINK TOKENS ----------------
+    db.tokens.create_index([("token_id", ASCENDING)], unique=True)
+    # Only per-user tokens carry expires_at; public links never expire
+    db.tokens.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+
+    # ---------------- SHORTLINK POOL (core/shortlink_pool.py) ----------------
+    db.link_tickets.create_index([("ticket_id", ASCENDING)], unique=True)
+    db.link_tickets.create_index([("domain", ASCENDING), ("status", ASCENDING), ("created_at", ASCENDING)])
+    db.link_tickets.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+
+    # ---------------- SHORTENER HEALTH (core/shortener_health.py) ----------------
+    db.shortener_stats.create_index([("domain", ASCENDING)], unique=True)
+
+    # ---------------- BROADCASTS (progress checkpoints) ----------------
+    db.broadcasts.create_index([("broadcast_id", ASCENDING)], unique=True)
+    db.broadcasts.create_index([("status", ASCENDING)])
+
     logging.info("[DB] All indexes initialized successfully.")
+
+
+def _ensure_ttl_index(collection, field: str, seconds: int):
+    """
+    Create a TTL index on `field`, or update its expiry in place
+    if the retention period changed in config.
+    """
+    try:
+        collection.create_index([(field, ASCENDING)], expireAfterSeconds=seconds)
+    except OperationFailure:
+        collection.database.command(
+            "collMod",
+            collection.name,
+            index={"keyPattern": {field: 1}, "expireAfterSeconds": seconds}
+        )
@@ -12,10 +12,12 @@ Fields tracked:
  - joined_at
  - verification state + expiry
  - premium state + expiry + plan_id
+ - last_verified_at / downloaded_posts (broadcast segments)
+ - reachability (blocked_at / last_error, see core/user_reachability.py)
  - statistics-friendly structure
 """
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from typing import Optional
 
@@ -40,6 +42,14 @@ class UserModel:
     premium_expiry: Optional[datetime]
     premium_plan: Optional[str]
 
+    # Broadcast segments
+    last_verified_at: Optional[datetime] = None
+    downloaded_posts: list = field(default_factory=list)
+
+    # Reachability (None = user can be messaged)
+    blocked_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+
     def to_dict(self):
         d = asdict(self)
         d["joined_at"] = self.joined_at
@@ -61,6 +71,12 @@ class UserModel:
             is_premium=data.get("is_premium", False),
             premium_expiry=data.get("premium_expiry"),
             premium_plan=data.get("premium_plan"),
+
+            last_verified_at=data.get("last_verified_at"),
+            downloaded_posts=data.get("downloaded_posts", []),
+
+            blocked_at=data.get("blocked_at"),
+            last_error=data.get("last_error"),
         )
 
     @staticmethod
@@ -0,0 +1,304 @@
+# core/security/compact_tokens.py
+
+"""
+Compact Deep-Link Tokens
+------------------------
+
+Telegram accepts at most 64 characters in `?start=` (and 64 bytes in
+callback_data), but a Fernet token is 150+ characters.
+
+In compact mode (TOKEN_MODE=compact, default) a token is a 22-char ID:
+
+    token_id = base64url( HMAC-SHA256(key_ring.current_secret,
+                   kind + purpose + ":" + nonce + ":" + canonical_json)[:16] )
+
+and the payload is stored server-side in the `tokens` collection
+(unique index on token_id):
+
+{
+  "token_id": "Xb3...22 chars",
+  "payload": {...},
+  "purpose": "get" | "click" | "redirect" | "verified" | "bypass",
+  "nonce": "" | "<random>",
+  "kid": "k2",                         # key ring ID the HMAC was made with
+  "ephemeral": false,
+  "created_at": <datetime>,
+  "expires_at": <datetime> | absent    # TTL index (ephemeral tokens only)
+}
+
+ - A token only decodes for the purpose it was issued for: a redirect
+   token cannot be replayed as verified_, nor bypass_ renamed to verified_
+ - Permanent tokens (public post links) have no nonce: same payload →
+   same ID, stored once
+ - Ephemeral tokens (per user, TOKEN_EPHEMERAL_TTL_HOURS) get a fresh
+   nonce on every issue, so every verification has its own token
+ - IDs cannot be forged: the stored payload is re-hashed on lookup,
+   with the key named by the document's kid (core/security/key_ring.py),
+   so rotating TOKEN_KEYS keeps every published link working as long
+   as its key stays listed
+ - An in-process LRU serves hot links without touching MongoDB
+ - Fernet tokens (TOKEN_MODE=fernet or links published before) are
+   still decoded; the purpose travels inside the encrypted payload
+ - Fernet tokens issued before purposes existed are accepted only when
+   their payload "action" matches (published get_ / click_ links)
+ - consume_token() makes verified_ single-use across processes
+   (`used_at`, set with one conditional update)
+
+Links stay short for every prefix:
+    get_ / verify_ / click_ / bypass_ / verified_  + 22 chars
+
+Telegram caps a start parameter at 64 chars of [A-Za-z0-9_-]. Fernet
+tokens (tagged <kid>_<token>) are far longer, so every Fernet token is
+checked by check_start_param() and a warning is logged once when deep
+links will be rejected: use TOKEN_MODE=compact.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import re
+import secrets
+import time
+from collections import OrderedDict
+from datetime import timedelta, timezone
+
+from pymongo.errors import DuplicateKeyError
+
+from core.async_database import adb
+from core.config import config
+from core.security.key_ring import key_ring, KeyRing
+from core.security.signature_checker import SignatureChecker
+from core.security.token_encryptor import encode_payload, decode_payload
+from core.utils.time_utils import now
+
+
+ID_BYTES = 16
+ID_LENGTH = 22   # len(base64url(16 bytes)) without padding
+_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{22}$")
+PURPOSE_FIELD = "purpose"
+
+# Telegram start parameter limit, and the longest deep-link prefix
+MAX_START_PARAM = 64
+LONGEST_PREFIX = "verified_"
+
+logger = logging.getLogger(__name__)
+_length_warned = False
+
+
+def check_start_param(token: str) -> str:
+    """
+    Warn (once per process) when `token` cannot fit a Telegram start
+    parameter behind the longest prefix. Returns the token unchanged.
+    """
+    global _length_warned
+    if token and len(LONGEST_PREFIX) + len(token) > MAX_START_PARAM and not _length_warned:
+        _length_warned = True
+        logger.warning(
+            "[Tokens] %s-char deep links exceed Telegram's %d-char start "
+            "parameter; Telegram will reject them (use TOKEN_MODE=compact)",
+            len(LONGEST_PREFIX) + len(token), MAX_START_PARAM
+        )
+    return token
+
+
+class CompactTokenStore:
+
+    def __init__(self, keys: KeyRing, cache_size: int):
+        self._keys = keys
+        self._cache_size = cache_size
+        # token_id -> (expires epoch or None, purpose, payload)
+        self._cache = OrderedDict()
+
+    # ---------------------------------------------------------
+    # ID
+    # ---------------------------------------------------------
+    @staticmethod
+    def make_id(secret: str, payload: dict, purpose: str, nonce: str = "", ephemeral: bool = False) -> str:
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+        kind = b"e:" if ephemeral else b"p:"
+        bound = f"{purpose}:{nonce}:".encode()
+        digest = hmac.new(secret.encode(), kind + bound + canonical, hashlib.sha256).digest()[:ID_BYTES]
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+    def new_document(self, payload: dict, purpose: str, ephemeral: bool = False) -> dict:
+        """
+        `tokens` document for a new token, signed with the current key.
+        """
+        nonce = secrets.token_urlsafe(8) if ephemeral else ""
+        return {
+            "token_id": self.make_id(self._keys.current_secret, payload, purpose, nonce, ephemeral),
+            "payload": payload,
+            PURPOSE_FIELD: purpose,
+            "nonce": nonce,
+            "kid": self._keys.current_kid,
+            "ephemeral": ephemeral,
+            "created_at": now()
+        }
+
+    def verify_document(self, token_id: str, doc: dict):
+        """
+        Purpose of a stored token if `doc` really belongs to `token_id`
+        (re-hashed with the key it was issued with), else None.
+        """
+        payload = doc.get("payload")
+        purpose = doc.get(PURPOSE_FIELD)
+        if not isinstance(payload, dict) or not isinstance(purpose, str):
+            return None
+
+        secret = self._keys.secret(doc.get("kid"))
+        if secret is None:
+            # Unknown / retired key
+            return None
+
+        expected = self.make_id(secret, payload, purpose, doc.get("nonce", ""), bool(doc.get("ephemeral")))
+        return purpose if hmac.compare_digest(expected, token_id) else None
+
+    @staticmethod
+    def is_compact(token: str) -> bool:
+        return bool(token) and len(token) == ID_LENGTH and bool(_ID_PATTERN.match(token))
+
+    # ---------------------------------------------------------
+    # ENCODE
+    # ---------------------------------------------------------
+    async def encode(self, payload: dict, purpose: str, ttl_seconds: float = None) -> str:
+        """
+        Store payload and return its compact ID.
+        ttl_seconds=None → permanent (public post links, stored once).
+        Otherwise a new single-issue token with its own nonce.
+        """
+        ephemeral = ttl_seconds is not None
+        doc = self.new_document(payload, purpose, ephemeral)
+        token_id = doc["token_id"]
+
+        if not ephemeral and token_id in self._cache:
+            self._cache.move_to_end(token_id)
+            return token_id
+
+        expires_at = None
+        if ephemeral:
+            expires_at = now() + timedelta(seconds=ttl_seconds)
+            doc["expires_at"] = expires_at
+            await adb.tokens.insert_one(doc)
+        else:
+            await adb.tokens.update_one({"token_id": token_id}, {"$setOnInsert": doc}, upsert=True)
+
+        self._remember(token_id, purpose, payload, expires_at)
+        return token_id
+
+    # ---------------------------------------------------------
+    # DECODE
+    # ---------------------------------------------------------
+    async def decode(self, token_id: str, purpose: str) -> dict:
+        """
+        Return payload or None if unknown / expired / tampered /
+        issued for another purpose.
+        """
+        if not self.is_compact(token_id):
+            return None
+
+        cached = self._cache.get(token_id)
+        if cached:
+            expires, cached_purpose, payload = cached
+            if expires is not None and expires <= time.time():
+                self._cache.pop(token_id, None)
+                return None
+            self._cache.move_to_end(token_id)
+            return dict(payload) if cached_purpose == purpose else None
+
+        doc = await adb.tokens.find_one(
+            {"token_id": token_id},
+            {"_id": 0, "payload": 1, PURPOSE_FIELD: 1, "nonce": 1, "kid": 1, "ephemeral": 1, "expires_at": 1}
+        )
+        if not doc:
+            return None
+
+        stored_purpose = self.verify_document(token_id, doc)
+        if stored_purpose is None:
+            return None
+        payload = doc["payload"]
+
+        expires_at = doc.get("expires_at")
+        if expires_at is not None:
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            if expires_at <= now():
+                return None
+
+        self._remember(token_id, stored_purpose, payload, expires_at)
+        return dict(payload) if stored_purpose == purpose else None
+
+    def _remember(self, token_id: str, purpose: str, payload: dict, expires_at):
+        expires = expires_at.timestamp() if expires_at is not None else None
+        self._cache[token_id] = (expires, purpose, payload)
+        self._cache.move_to_end(token_id)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+
+# Global store shared by both bots and the redirect server
+compact_tokens = CompactTokenStore(key_ring, config.TOKEN_CACHE_SIZE)
+
+
+# -----------------------------------------------------------
+# UNIFIED API USED BY ALL DEEP-LINK FLOWS
+# -----------------------------------------------------------
+async def encode_token(payload: dict, purpose: str, ephemeral: bool = False) -> str:
+    """
+    payload → deep-link token (compact ID or Fernet, per TOKEN_MODE).
+    purpose = the deep-link prefix it is issued for ("get", "click",
+    "verify", "verified", "bypass") or "redirect" (?token= on the
+    redirect server).
+    ephemeral=True → per-user, single-issue tokens that expire after
+    TOKEN_EPHEMERAL_TTL_HOURS.
+    """
+    if config.TOKEN_MODE != "compact":
+        return check_start_param(encode_payload({**payload, PURPOSE_FIELD: purpose}))
+
+    ttl = config.TOKEN_EPHEMERAL_TTL_HOURS * 3600 if ephemeral else None
+    return await compact_tokens.encode(payload, purpose, ttl)
+
+
+async def decode_token(token: str, purpose: str) -> dict:
+    """
+    Deep-link token → payload, or None (also when the token was issued
+    for another purpose). Accepts both formats.
+    """
+    if not token:
+        return None
+    if CompactTokenStore.is_compact(token):
+        return await compact_tokens.decode(token, purpose)
+
+    # Result tokens from the redirect server may be signed packets
+    payload = decode_payload(SignatureChecker.unpack_and_verify(token) or token)
+    if not payload:
+        return None
+    token_purpose = payload.pop(PURPOSE_FIELD, None) or payload.get("action")
+    return payload if token_purpose == purpose else None
+
+
+async def consume_token(token: str) -> bool:
+    """
+    Mark a single-use token (verified_) as used, atomically and shared by
+    every process. Returns False if it was already used.
+    Compact tokens get `used_at` on their own document; Fernet tokens a
+    marker document (digest) that expires with the ephemeral TTL.
+    """
+    if CompactTokenStore.is_compact(token):
+        result = await adb.tokens.update_one(
+            {"token_id": token, "used_at": {"$exists": False}},
+            {"$set": {"used_at": now()}}
+        )
+        return result.modified_count == 1
+
+    used_at = now()
+    try:
+        await adb.tokens.insert_one({
+            "token_id": "used:" + hashlib.sha256(token.encode()).hexdigest(),
+            "used_at": used_at,
+            "expires_at": used_at + timedelta(hours=config.TOKEN_EPHEMERAL_TTL_HOURS)
+        })
+    except DuplicateKeyError:
+        return False
+    return True
@@ -0,0 +1,86 @@
+# core/security/key_ring.py
+
+"""
+Token Key Ring
+--------------
+
+Lets TOKEN_SECRET be rotated without breaking published links.
+
+TOKEN_KEYS (env) lists every secret still accepted, newest FIRST:
+
+    TOKEN_KEYS="k3:new-secret,k2:older-secret,k1:oldest-secret"
+
+ - New tokens / signatures use the first key and carry its key ID:
+       Fernet token  → <kid>_<fernet token>
+       Signature     → <kid>_<hex hmac>
+       Compact ID    → "kid" field of its `tokens` document
+                       (core/security/compact_tokens.py)
+ - Decoding reads the key ID and picks that key directly, so the cost
+   stays O(1) however many keys are retained (unlike MultiFernet,
+   which tries every key)
+ - Untagged values (issued before key IDs existed) are checked with
+   TOKEN_SECRET only
+ - Without TOKEN_KEYS, TOKEN_SECRET is the single key with ID "0"
+
+Key IDs: 1-8 letters/digits, so the first "_" always ends the tag
+(a key ID never contains one). Tagged values stay inside Telegram's
+start parameter alphabet [A-Za-z0-9_-]. An untagged legacy Fernet token
+can contain "_" early on; a "tag" that is not a configured key ID is
+therefore treated as untagged by the decoders.
+"""
+
+import re
+from core.config import config
+
+
+KID_SEPARATOR = "_"
+_KID_PATTERN = re.compile(r"^[A-Za-z0-9]{1,8}$")
+DEFAULT_KID = "0"
+
+
+class KeyRing:
+
+    def __init__(self, spec: str, legacy_secret: str):
+        self.legacy_secret = legacy_secret
+        self.keys = {}          # kid -> secret (insertion order = newest first)
+
+        for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+            kid, sep, secret = item.partition(":")
+            kid = kid.strip()
+            if not sep or not secret or not _KID_PATTERN.match(kid):
+                raise ValueError(f"Invalid TOKEN_KEYS entry: {kid!r} (expected <kid>:<secret>)")
+            if kid in self.keys:
+                raise ValueError(f"Duplicate key ID in TOKEN_KEYS: {kid!r}")
+            self.keys[kid] = secret
+
+        if not self.keys:
+            self.keys[DEFAULT_KID] = legacy_secret
+
+        self.current_kid = next(iter(self.keys))
+
+    @property
+    def current_secret(self) -> str:
+        return self.keys[self.current_kid]
+
+    def secret(self, kid: str):
+        """
+        Secret for a key ID, or None if unknown / retired.
+        """
+        return self.keys.get(kid)
+
+    def tag(self, value: str, kid: str = None) -> str:
+        return f"{kid or self.current_kid}{KID_SEPARATOR}{value}"
+
+    @staticmethod
+    def split(tagged: str) -> tuple:
+        """
+        "<kid>_<value>" → (kid, value); untagged → (None, value).
+        """
+        kid, sep, value = tagged.partition(KID_SEPARATOR)
+        if sep and _KID_PATTERN.match(kid):
+            return kid, value
+        return None, tagged
+
+
+# Global key ring shared by token_encryptor and signature_checker
+key_ring = KeyRing(config.TOKEN_KEYS, config.TOKEN_SECRET)
@@ -13,28 +13,35 @@ Uses a shared secret key stored in:
 
 Supported:
  - generate_signature(data) → returns hex HMAC signature
- - verify_signature(data, signature) → True/False
+ - sign(data) → "<kid>_<hex>" signature with the current rotation key
+ - verify_signature(data, signature) → True/False (tagged or legacy)
+
+Key rotation: see core/security/key_ring.py.
 """
 
 import hmac
 import hashlib
 from typing import Union
 from core.config import config
+from core.security.key_ring import key_ring, KeyRing
 
+# Telegram-safe (start parameters allow [A-Za-z0-9_-] only)
+PACK_SEPARATOR = "-"
 
 class SignatureChecker:
-    SECRET = config.TOKEN_SECRET.encode()  # ensure bytes
+    SECRET = config.TOKEN_SECRET.encode()  # ensure bytes (untagged signatures)
 
     # --------------------------------------------------------------------
     # GENERATE SIGNATURE (HMAC-SHA256)
     # --------------------------------------------------------------------
     @staticmethod
-    def generate_signature(data: Union[str, bytes]) -> str:
+    def generate_signature(data: Union[str, bytes], secret: bytes = None) -> str:
         """
         Generates an HMAC-SHA256 signature for the given data.
 
         Args:
             data: string or bytes to sign.
+            secret: key to use (default: TOKEN_SECRET).
 
         Returns:
             Hex digest string (64 chars).
@@ -43,13 +50,21 @@ class SignatureChecker:
             data = data.encode()
 
         signature = hmac.new(
-            SignatureChecker.SECRET,
+            secret or SignatureChecker.SECRET,
             msg=data,
             digestmod=hashlib.sha256
         ).hexdigest()
 
         return signature
 
+    @staticmethod
+    def sign(data: Union[str, bytes]) -> str:
+        """
+        Signature with the current rotation key, tagged: <kid>_<hex>
+        """
+        secret = key_ring.current_secret.encode()
+        return key_ring.tag(SignatureChecker.generate_signature(data, secret))
+
     # --------------------------------------------------------------------
     # VERIFY SIGNATURE (CONSTANT TIME COMPARISON)
     # --------------------------------------------------------------------
@@ -60,7 +75,7 @@ class SignatureChecker:
 
         Args:
             data: original string or bytes
-            signature: incoming HMAC hex digest
+            signature: incoming "<kid>_<hex>" or legacy hex digest
 
         Returns:
             True if signature matches, False otherwise.
@@ -68,8 +83,18 @@ class SignatureChecker:
         if isinstance(data, str):
             data = data.encode()
 
-        expected = SignatureChecker.generate_signature(data)
-        return hmac.compare_digest(expected, signature)
+        kid, digest = KeyRing.split(signature)
+        if kid is None:
+            secret = SignatureChecker.SECRET
+        else:
+            secret = key_ring.secret(kid)
+            if secret is None:
+                # Unknown / retired key
+                return False
+            secret = secret.encode()
+
+        expected = SignatureChecker.generate_signature(data, secret)
+        return hmac.compare_digest(expected, digest)
 
     # --------------------------------------------------------------------
     # SAFE PAYLOAD + SIGNATURE COMBO (PREFIXED)
@@ -78,26 +103,28 @@ class SignatureChecker:
     def pack(data: str) -> str:
         """
         Combine data + signature into a single safe packet:
-            <data>::<signature>
+            <data>-<kid>_<signature>
 
-        Useful for passing through redirect URLs.
+        Only [A-Za-z0-9_-], so it can travel in a Telegram start
+        parameter; the signature never contains "-", so the last "-"
+        splits the packet.
         """
-        sig = SignatureChecker.generate_signature(data)
-        return f"{data}::{sig}"
+        sig = SignatureChecker.sign(data)
+        return f"{data}{PACK_SEPARATOR}{sig}"
 
     @staticmethod
     def unpack(packet: str):
         """
-        Extracts (data, signature) from 'data::signature'.
+        Extracts (data, signature) from 'data-signature'.
 
         Returns:
             (data, signature) or (None, None) on error.
         """
-        if "::" not in packet:
+        if PACK_SEPARATOR not in packet:
             return None, None
 
         try:
-            data, sig = packet.rsplit("::", 1)
+            data, sig = packet.rsplit(PACK_SEPARATOR, 1)
             return data, sig
         except:
             return None, None
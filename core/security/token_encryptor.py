@@ -15,12 +15,94 @@ Used for:
  - Redirect server communication
 
 This prevents users from forging tokens or modifying payloads.
+
+Tokens are tagged with a key ID (<kid>_<fernet token>, see key_ring.py),
+so TOKEN_SECRET can be rotated while old links keep working; the key
+is picked directly from the tag.
+
+Decoding is memoized: a popular public post sends thousands of users
+through the same get_<token>, so validated payloads are cached by token
+digest (bounded, TTL, thread-safe). Invalid tokens are never cached.
 """
 
 import json
 import base64
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from cryptography.fernet import Fernet, InvalidToken
 from core.config import config
+from core.security.key_ring import key_ring, KeyRing
+
+
+# -----------------------------------------------------------
+# DECODE CACHE (token digest → validated payload)
+# -----------------------------------------------------------
+class DecodeCache:
+    """
+    Bounded LRU with TTL eviction and hit/miss counters.
+    Safe to share between threads (redirect server workers, DB executor).
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        key = DecodeCache._key(token)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires, payload = entry
+            if expires <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+
+        # Callers may mutate the dict → never hand out the cached object
+        return dict(payload)
+
+    def put(self, token: str, payload: dict):
+        if self.max_size <= 0:
+            return
+
+        key = DecodeCache._key(token)
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, dict(payload))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
 
 
 class TokenEncryptor:
@@ -51,8 +133,15 @@ class TokenEncryptor:
         # Convert to URL-safe base64 (Fernet key requirement)
         return base64.urlsafe_b64encode(raw)
 
-    # Build Fernet instance
-    _fernet = Fernet(_prepare_key(config.TOKEN_SECRET))
+    # Fernet instances: one per key ID + one for untagged legacy tokens
+    _fernets = {}
+    _legacy_fernet = Fernet(_prepare_key(config.TOKEN_SECRET))
+
+    # Validated payloads of recently decoded tokens
+    decode_cache = DecodeCache(
+        config.TOKEN_DECODE_CACHE_SIZE,
+        config.TOKEN_DECODE_CACHE_TTL_SECONDS
+    )
 
     # -----------------------------------------------------------
     # ENCODE PAYLOAD → TOKEN (string)
@@ -60,12 +149,14 @@ class TokenEncryptor:
     @staticmethod
     def encode_payload(payload: dict) -> str:
         """
-        Converts dict → JSON → Bytes → Fernet token (URL-safe base64 string).
+        Converts dict → JSON → Bytes → Fernet token (URL-safe base64 string),
+        tagged with the current key ID. The "=" padding is stripped, so the
+        token only uses Telegram's start parameter alphabet.
         """
         try:
             json_bytes = json.dumps(payload, separators=(",", ":")).encode()
-            token = TokenEncryptor._fernet.encrypt(json_bytes)
-            return token.decode()
+            token = TokenEncryptor._fernets[key_ring.current_kid].encrypt(json_bytes)
+            return key_ring.tag(token.decode().rstrip("="))
         except Exception:
             return None
 
@@ -73,20 +164,46 @@ class TokenEncryptor:
     # DECODE TOKEN → PAYLOAD (dict)
     # -----------------------------------------------------------
     @staticmethod
-    def decode_payload(token: str) -> dict:
+    def decode_payload(token: str, use_cache: bool = True) -> dict:
         """
         Converts encrypted token back to dict.
         Returns None if tampered or invalid.
         """
+        if not token:
+            return None
+
+        if use_cache:
+            cached = TokenEncryptor.decode_cache.get(token)
+            if cached is not None:
+                return cached
+
+        kid, raw = KeyRing.split(token)
+        fernet = TokenEncryptor._fernets.get(kid) if kid else None
+        if fernet is None:
+            # Untagged (legacy) token, or a "tag" that is no configured key:
+            # a retired key's token fails the legacy key as well
+            raw = token
+            fernet = TokenEncryptor._legacy_fernet
+
         try:
-            decrypted = TokenEncryptor._fernet.decrypt(token.encode())
+            # Restore the base64 padding stripped by encode_payload()
+            decrypted = fernet.decrypt((raw + "=" * (-len(raw) % 4)).encode())
             data = json.loads(decrypted.decode())
-            return data
         except InvalidToken:
             return None
         except Exception:
             return None
 
+        if use_cache and isinstance(data, dict):
+            TokenEncryptor.decode_cache.put(token, data)
+        return data
+
+
+TokenEncryptor._fernets = {
+    kid: Fernet(TokenEncryptor._prepare_key(secret))
+    for kid, secret in key_ring.keys.items()
+}
+
 
 # -----------------------------------------------------------
 # EXPOSE SIMPLE FUNCTIONS USED IN ALL BOTS
@@ -0,0 +1,229 @@
+# core/settings_cache.py
+
+"""
+Settings Cache
+--------------
+
+Process-wide, typed, in-memory view of the `settings` collection.
+
+Hot paths (force-sub check, premium purchase, verification, is_admin)
+used to issue one `settings.find_one` per key on every update. This
+module loads ALL settings in a single query and serves reads from memory.
+
+Invalidation:
+ - Every write made through this module bumps a version counter stored
+   in the settings collection itself ({"key": "__version__"}) and drops
+   the local copy immediately.
+ - Other processes (Admin Bot writes, User Bot reads) poll that counter
+   at most once every SETTINGS_REFRESH_SECONDS and reload only when it
+   changed.
+
+The snapshot is shared by every caller, so it is deep-frozen when built:
+lists become tuples and dicts read-only mappings (MappingProxyType).
+Mutating a returned value raises instead of silently changing the cache.
+
+Usage:
+    from core.settings_cache import settings_cache
+
+    settings = await settings_cache.get()
+    settings.qr_expiry_minutes
+    settings.force_sub
+
+    await settings_cache.set("upi_id", "me@upi")
+    await settings_cache.add_to_set("admins", 12345)
+    await settings_cache.pull("shorteners", {"domain": "x.com"})
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, List, Mapping, Optional, Tuple
+
+from core.async_database import adb
+from core.config import config
+
+
+VERSION_KEY = "__version__"
+
+
+def _freeze(value):
+    """
+    Read-only deep copy: list → tuple, dict → MappingProxyType.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+# ---------------------------------------------------------------------------
+# TYPED SNAPSHOT
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class AppSettings:
+    """
+    Immutable snapshot of all admin-configurable settings.
+    Missing keys fall back to the defaults from core/config.py.
+    """
+
+    force_sub: Tuple[Mapping[str, Any], ...] = ()
+    free_access_hours: int = config.FREE_ACCESS_HOURS_DEFAULT
+    redirect_base: str = config.REDIRECT_BASE
+    qr_expiry_minutes: int = config.QR_EXPIRY_MINUTES_DEFAULT
+    upi_id: str = config.UPI_ID or "no_upi_set@upi"
+    upi_name: str = config.UPI_NAME
+    unique_paise: bool = config.UNIQUE_PAISE_MODE == "on"
+    shorteners: Tuple[Mapping[str, Any], ...] = ()
+    admins: Tuple[int, ...] = ()
+    admin_contact: Optional[str] = None
+    verify_guide: Optional[str] = None
+    auto_confirm: bool = False
+    payment_mode: str = "manual"
+    allow_proof: bool = False
+    version: int = 0
+
+    # Every raw key/value pair, for settings without a typed field
+    raw: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+
+    @staticmethod
+    def from_docs(docs: List[dict]) -> "AppSettings":
+        raw = _freeze({d["key"]: d.get("value") for d in docs if "key" in d})
+        defaults = AppSettings()
+
+        def pick(key, default):
+            value = raw.get(key)
+            return default if value is None else value
+
+        return AppSettings(
+            force_sub=pick("force_sub", ()),
+            free_access_hours=pick("free_access_hours", defaults.free_access_hours),
+            redirect_base=pick("redirect_base", defaults.redirect_base),
+            qr_expiry_minutes=pick("qr_expiry", defaults.qr_expiry_minutes),
+            upi_id=pick("upi_id", defaults.upi_id),
+            upi_name=pick("upi_name", defaults.upi_name),
+            unique_paise=pick("unique_paise", "on" if defaults.unique_paise else "off") == "on",
+            shorteners=pick("shorteners", ()),
+            admins=pick("admins", ()),
+            admin_contact=raw.get("admin_contact"),
+            verify_guide=raw.get("verify_guide"),
+            auto_confirm=pick("auto_confirm", "off") == "on",
+            payment_mode=pick("payment_mode", defaults.payment_mode),
+            allow_proof=pick("allow_proof", "off") == "on",
+            version=pick(VERSION_KEY, 0),
+            raw=raw
+        )
+
+
+# ---------------------------------------------------------------------------
+# CACHE
+# ---------------------------------------------------------------------------
+class SettingsCache:
+
+    def __init__(self, refresh_seconds: float):
+        self._refresh_seconds = refresh_seconds
+        self._settings: Optional[AppSettings] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    # ---------------------------------------------------
+    # READ
+    # ---------------------------------------------------
+    async def get(self) -> AppSettings:
+        """
+        Return the current settings snapshot.
+        Costs no DB round trip while the snapshot is fresh.
+        """
+        if self._is_fresh():
+            return self._settings
+
+        async with self._lock:
+            if self._is_fresh():
+                return self._settings
+
+            if self._settings is None or await self._remote_version() != self._settings.version:
+                docs = await adb.settings.find({}).to_list()
+                self._settings = AppSettings.from_docs(docs)
+
+            self._checked_at = time.monotonic()
+            return self._settings
+
+    async def value(self, key: str, default=None):
+        """
+        Raw value of any settings key.
+        """
+        settings = await self.get()
+        value = settings.raw.get(key)
+        return default if value is None else value
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._settings is not None
+            and time.monotonic() - self._checked_at < self._refresh_seconds
+        )
+
+    async def _remote_version(self) -> int:
+        doc = await adb.settings.find_one({"key": VERSION_KEY}, {"value": 1})
+        return doc["value"] if doc else 0
+
+    # ---------------------------------------------------
+    # WRITE (always bumps the version)
+    # ---------------------------------------------------
+    async def set(self, key: str, value):
+        await adb.settings.update_one(
+            {"key": key},
+            {"$set": {"value": value}},
+            upsert=True
+        )
+        await self._bump()
+
+    async def add_to_set(self, key: str, item):
+        await adb.settings.update_one(
+            {"key": key},
+            {"$addToSet": {"value": item}},
+            upsert=True
+        )
+        await self._bump()
+
+    async def pull(self, key: str, match):
+        await adb.settings.update_one(
+            {"key": key},
+            {"$pull": {"value": match}}
+        )
+        await self._bump()
+
+    async def set_item_field(self, key: str, match: dict, field: str, value):
+        """
+        Set (value=None: remove) one field of the list item matching
+        `match`, e.g. a learned profile on one shortener entry.
+        """
+        if value is None:
+            update = {"$unset": {f"value.$.{field}": ""}}
+        else:
+            update = {"$set": {f"value.$.{field}": value}}
+
+        result = await adb.settings.update_one(
+            {"key": key, "value": {"$elemMatch": match}},
+            update
+        )
+        if result.matched_count:
+            await self._bump()
+
+    async def _bump(self):
+        await adb.settings.update_one(
+            {"key": VERSION_KEY},
+            {"$inc": {"value": 1}},
+            upsert=True
+        )
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Drop the local snapshot; the next get() reloads from MongoDB.
+        """
+        self._settings = None
+
+
+# Global settings cache
+settings_cache = SettingsCache(config.SETTINGS_REFRESH_SECONDS)
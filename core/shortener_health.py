@@ -0,0 +1,247 @@
+# core/shortener_health.py
+
+"""
+Shortener Health
+----------------
+
+Per-domain latency / success estimates + circuit breaker, used to pick
+shorteners instead of `random.choice`.
+
+Per domain (in memory, per process):
+    latency   : EWMA of successful request time (seconds)
+    success   : EWMA of outcomes (1 = short URL, 0 = timeout / error)
+    state     : "closed" → normal
+                "open"   → SHORTENER_BREAKER_FAILURES consecutive failures;
+                           gets NO traffic for SHORTENER_BREAKER_OPEN_SECONDS
+                "half_open" → after that: small share of traffic; the first
+                           success closes it, the first failure re-opens it
+
+Selection weight = success / latency (half-open: a tenth of that), so a
+shortener twice as fast gets twice the traffic, and a flaky one fades
+out long before its breaker opens. Unknown domains start optimistic.
+
+The User Bot writes a snapshot to `shortener_stats` every
+SHORTENER_STATS_FLUSH_SECONDS; the Admin Bot shows it in /listshorteners
+and weights its own picks from it (stats_weight), since it never sends
+shortener requests itself.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from datetime import timezone
+from typing import Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from core.async_database import adb
+from core.config import config
+from core.utils.time_utils import now
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Prior for unknown domains: assume healthy and reasonably fast
+INITIAL_LATENCY = 1.0
+# Never divide by (almost) zero latency
+MIN_LATENCY = 0.05
+HALF_OPEN_FACTOR = 0.1
+
+
+class DomainHealth:
+
+    __slots__ = ("latency", "success", "state", "consecutive_failures", "opened_at", "requests", "failures")
+
+    def __init__(self):
+        self.latency = INITIAL_LATENCY
+        self.success = 1.0
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.requests = 0
+        self.failures = 0
+
+
+class ShortenerHealth:
+
+    def __init__(self, alpha: float, failure_threshold: int, open_seconds: float, flush_seconds: float):
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.flush_seconds = flush_seconds
+        self._domains: Dict[str, DomainHealth] = {}
+        self._flushed_at = time.monotonic()
+        self._flush_task = None
+
+    def _get(self, domain: str) -> DomainHealth:
+        health = self._domains.get(domain)
+        if health is None:
+            health = self._domains[domain] = DomainHealth()
+        return health
+
+    # ---------------------------------------------------
+    # OUTCOMES
+    # ---------------------------------------------------
+    def record_success(self, domain: str, latency: float):
+        health = self._get(domain)
+        health.requests += 1
+        health.latency += self.alpha * (latency - health.latency)
+        health.success += self.alpha * (1.0 - health.success)
+        health.consecutive_failures = 0
+
+        if health.state != CLOSED:
+            logger.info("[ShortenerHealth] %s recovered, circuit closed", domain)
+            health.state = CLOSED
+
+        self._maybe_flush()
+
+    def record_failure(self, domain: str):
+        health = self._get(domain)
+        health.requests += 1
+        health.failures += 1
+        health.success += self.alpha * (0.0 - health.success)
+        health.consecutive_failures += 1
+
+        if health.state == HALF_OPEN or (
+            health.state == CLOSED and health.consecutive_failures >= self.failure_threshold
+        ):
+            logger.warning(
+                "[ShortenerHealth] %s failing (%d in a row), circuit open for %.0fs",
+                domain, health.consecutive_failures, self.open_seconds
+            )
+            health.state = OPEN
+            health.opened_at = time.monotonic()
+
+        self._maybe_flush()
+
+    # ---------------------------------------------------
+    # SELECTION
+    # ---------------------------------------------------
+    def weight(self, domain: str) -> float:
+        """
+        Selection weight; 0 = circuit open (no traffic).
+        """
+        health = self._domains.get(domain)
+        if health is None:
+            return 1.0 / INITIAL_LATENCY
+
+        if health.state == OPEN:
+            if time.monotonic() - health.opened_at < self.open_seconds:
+                return 0.0
+            health.state = HALF_OPEN
+
+        weight = health.success / max(health.latency, MIN_LATENCY)
+        if health.state == HALF_OPEN:
+            weight *= HALF_OPEN_FACTOR
+        return weight
+
+    def order(self, shorteners: List[dict]) -> List[dict]:
+        """
+        Weighted random order of the shorteners whose circuit is not open
+        (Efraimidis–Spirakis: key = u^(1/w), highest first).
+        """
+        keyed = []
+        for shortener in shorteners:
+            weight = self.weight(shortener.get("domain", ""))
+            if weight > 0:
+                keyed.append((random.random() ** (1.0 / weight), shortener))
+
+        keyed.sort(key=lambda item: item[0], reverse=True)
+        return [shortener for _, shortener in keyed]
+
+    def choose(self, shorteners: List[dict]) -> Optional[dict]:
+        ordered = self.order(shorteners)
+        return ordered[0] if ordered else None
+
+    # ---------------------------------------------------
+    # STATS (shared with the Admin Bot through MongoDB)
+    # ---------------------------------------------------
+    def snapshot(self) -> List[dict]:
+        return [
+            {
+                "domain": domain,
+                "state": health.state,
+                "latency_ms": round(health.latency * 1000),
+                "success_rate": round(health.success, 3),
+                "weight": round(self.weight(domain), 3),
+                "requests": health.requests,
+                "failures": health.failures,
+                "consecutive_failures": health.consecutive_failures,
+            }
+            for domain, health in self._domains.items()
+        ]
+
+    async def flush(self):
+        stats = self.snapshot()
+        if not stats:
+            return
+
+        updated_at = now()
+        await adb.shortener_stats.bulk_write([
+            UpdateOne({"domain": s["domain"]}, {"$set": {**s, "updated_at": updated_at}}, upsert=True)
+            for s in stats
+        ], ordered=False)
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._flushed_at < self.flush_seconds:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+
+        self._flushed_at = time.monotonic()
+
+        async def write():
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning("[ShortenerHealth] Failed to save stats: %s", e)
+
+        self._flush_task = asyncio.create_task(write())
+
+    @staticmethod
+    def stats_weight(stats: Optional[dict]) -> float:
+        """
+        Selection weight from a saved snapshot (load_stats), for processes
+        without live outcomes. An open circuit counts as half-open once
+        SHORTENER_BREAKER_OPEN_SECONDS have passed since the snapshot.
+        """
+        if not stats:
+            return 1.0 / INITIAL_LATENCY
+
+        state = stats.get("state", CLOSED)
+        if state == OPEN:
+            updated_at = stats.get("updated_at")
+            if updated_at is not None and updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=timezone.utc)
+            if updated_at is None or (now() - updated_at).total_seconds() < config.SHORTENER_BREAKER_OPEN_SECONDS:
+                return 0.0
+            state = HALF_OPEN
+
+        latency = stats.get("latency_ms", INITIAL_LATENCY * 1000) / 1000
+        weight = stats.get("success_rate", 1.0) / max(latency, MIN_LATENCY)
+        if state == HALF_OPEN:
+            weight *= HALF_OPEN_FACTOR
+        return weight
+
+    @staticmethod
+    async def load_stats() -> Dict[str, dict]:
+        """
+        Last saved stats per domain (for the Admin Bot).
+        """
+        return {
+            doc["domain"]: doc
+            async for doc in adb.shortener_stats.find({}, {"_id": 0})
+        }
+
+
+# Global per-process health tracker
+shortener_health = ShortenerHealth(
+    alpha=config.SHORTENER_EWMA_ALPHA,
+    failure_threshold=config.SHORTENER_BREAKER_FAILURES,
+    open_seconds=config.SHORTENER_BREAKER_OPEN_SECONDS,
+    flush_seconds=config.SHORTENER_STATS_FLUSH_SECONDS
+)
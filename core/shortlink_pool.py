@@ -0,0 +1,168 @@
+# core/shortlink_pool.py
+
+"""
+Shortlink Pool
+--------------
+
+Ready-made shortlinks so "VERIFY NOW" never waits for a shortener API.
+
+The User Bot prefetches, per shortener domain, shortlinks that point at
+the redirect server with an OPAQUE ticket ID instead of a user token:
+
+    <redirect_base>?token=lt-<22 random chars>
+
+and stores them in `link_tickets`:
+
+{
+  "ticket_id": "lt-...",
+  "domain": "get2short.com",
+  "short_url": "https://get2short.com/AbCd",
+  "status": "pooled" | "bound",
+  "created_at": <datetime>,
+  "expires_at": <datetime>,          # TTL index
+  # once a user clicked VERIFY NOW:
+  "payload": {"user_id": ..., "file_id": ..., "post_no": ...},
+  "bound_at": <datetime>
+}
+
+ - take() atomically binds ONE pooled ticket to the user + file
+   (find_one_and_update), so a shortlink is never handed out twice
+ - Domains whose pool ran dry are remembered and skipped by take()
+   until the prefetcher refills them (add / available), so an empty
+   pool costs no round trip on the hot path
+ - The redirect server resolves bound tickets like any other token
+   (RedirectTokenHandler.decode_incoming_token)
+ - Pooled tickets expire after SHORTLINK_POOL_MAX_AGE_HOURS (shorteners
+   may drop old links), bound ones after TOKEN_EPHEMERAL_TTL_HOURS
+"""
+
+import secrets
+from collections import OrderedDict
+from datetime import timedelta, timezone
+from typing import List, Optional
+
+from pymongo import ReturnDocument
+
+from core.async_database import adb
+from core.config import config
+from core.utils.time_utils import now
+
+
+TICKET_PREFIX = "lt-"
+TICKET_LENGTH = len(TICKET_PREFIX) + 22     # token_urlsafe(16) → 22 chars
+
+POOLED = "pooled"
+BOUND = "bound"
+
+# Bound tickets never change: resolved payloads are cached in memory
+_resolved = OrderedDict()
+_RESOLVED_CACHE_SIZE = 10000
+
+# Domains take() found empty; cleared as soon as the pool has stock again
+_empty_domains = set()
+
+
+class ShortlinkPool:
+
+    @staticmethod
+    def is_ticket(token: str) -> bool:
+        return bool(token) and len(token) == TICKET_LENGTH and token.startswith(TICKET_PREFIX)
+
+    @staticmethod
+    def new_ticket_id() -> str:
+        return TICKET_PREFIX + secrets.token_urlsafe(16)
+
+    # ---------------------------------------------------
+    # PREFETCHER SIDE
+    # ---------------------------------------------------
+    @staticmethod
+    async def add(ticket_id: str, domain: str, short_url: str):
+        created_at = now()
+        await adb.link_tickets.insert_one({
+            "ticket_id": ticket_id,
+            "domain": domain,
+            "short_url": short_url,
+            "status": POOLED,
+            "created_at": created_at,
+            "expires_at": created_at + timedelta(hours=config.SHORTLINK_POOL_MAX_AGE_HOURS)
+        })
+        _empty_domains.discard(domain)
+
+    @staticmethod
+    async def available(domain: str) -> int:
+        count = await adb.link_tickets.count_documents({
+            "domain": domain,
+            "status": POOLED,
+            "expires_at": {"$gt": now()}
+        })
+        if count:
+            _empty_domains.discard(domain)
+        return count
+
+    # ---------------------------------------------------
+    # VERIFY NOW (hot path)
+    # ---------------------------------------------------
+    @staticmethod
+    async def take(domains: List[str], payload: dict) -> Optional[dict]:
+        """
+        Bind a pooled shortlink (first domain with one left) to `payload`.
+        Returns the ticket document or None if every pool is empty.
+
+        Domains are tried in the given (health) order, skipping those
+        known to be empty: normally one round trip, none when every
+        pool is dry.
+        """
+        bound_at = now()
+
+        for domain in domains:
+            if domain in _empty_domains:
+                continue
+
+            ticket = await adb.link_tickets.find_one_and_update(
+                {"domain": domain, "status": POOLED, "expires_at": {"$gt": bound_at}},
+                {"$set": {
+                    "status": BOUND,
+                    "payload": payload,
+                    "bound_at": bound_at,
+                    "expires_at": bound_at + timedelta(hours=config.TOKEN_EPHEMERAL_TTL_HOURS)
+                }},
+                sort=[("created_at", 1)],
+                return_document=ReturnDocument.AFTER
+            )
+            if ticket:
+                return ticket
+            _empty_domains.add(domain)
+
+        return None
+
+    # ---------------------------------------------------
+    # REDIRECT SERVER
+    # ---------------------------------------------------
+    @staticmethod
+    async def resolve(ticket_id: str) -> Optional[dict]:
+        """
+        Payload of a bound, unexpired ticket, else None.
+        """
+        cached = _resolved.get(ticket_id)
+        if cached is None:
+            doc = await adb.link_tickets.find_one(
+                {"ticket_id": ticket_id, "status": BOUND},
+                {"payload": 1, "expires_at": 1}
+            )
+            if not doc:
+                return None
+
+            expires_at = doc["expires_at"]
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            cached = (doc["payload"], expires_at)
+
+            _resolved[ticket_id] = cached
+            if len(_resolved) > _RESOLVED_CACHE_SIZE:
+                _resolved.popitem(last=False)
+
+        payload, expires_at = cached
+        if expires_at <= now():
+            _resolved.pop(ticket_id, None)
+            return None
+        return dict(payload)
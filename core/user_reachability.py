@@ -0,0 +1,80 @@
+# core/user_reachability.py
+
+"""
+User Reachability
+-----------------
+
+Users who blocked the bot (or deleted their account) are flagged in
+`users` instead of being retried forever:
+
+    blocked_at : datetime | None   → None / missing = reachable
+    last_error : str | None        → Telegram error text
+
+ - BroadcastService flags them in bulk after every batch
+ - Admin → user notifications flag them on TelegramForbiddenError
+ - /start (normal or deep-link) revives the user automatically
+ - Broadcast cursors and /stats only count REACHABLE users
+
+`users.blocked_at` is indexed (core/database.py).
+"""
+
+from aiogram.exceptions import TelegramForbiddenError, TelegramBadRequest
+
+from core.async_database import adb
+from core.utils.time_utils import now
+
+# Matches documents without the field as well (existing users)
+REACHABLE = {"blocked_at": None}
+UNREACHABLE = {"blocked_at": {"$ne": None}}
+
+
+def reachable(query: dict = None) -> dict:
+    """
+    Restrict a users query to reachable users.
+    """
+    if not query:
+        return dict(REACHABLE)
+    return {"$and": [query, REACHABLE]}
+
+
+def is_dead_chat_error(error: Exception) -> bool:
+    """
+    True when retrying this chat later is pointless.
+    """
+    if isinstance(error, TelegramForbiddenError):
+        return True
+    if isinstance(error, TelegramBadRequest):
+        return "chat not found" in str(error).lower()
+    return False
+
+
+async def mark_blocked(user_ids: dict):
+    """
+    user_ids = {user_id: "error text"} → flag all of them.
+    """
+    if not user_ids:
+        return
+
+    # Group by error text → one update_many per distinct error
+    by_error = {}
+    for user_id, error in user_ids.items():
+        by_error.setdefault(error, []).append(user_id)
+
+    current = now()
+    for error, ids in by_error.items():
+        await adb.users.update_many(
+            {"user_id": {"$in": ids}},
+            {"$set": {"blocked_at": current, "last_error": error}}
+        )
+
+
+async def revive(user_id: int):
+    """
+    Clear the blocked flag (no-op write filter when not blocked).
+    Called on every /start on purpose: the flag is set by the Admin Bot,
+    so no cached state of this process can tell whether it is set.
+    """
+    await adb.users.update_one(
+        {"user_id": user_id, **UNREACHABLE},
+        {"$set": {"blocked_at": None, "last_error": None}}
+    )
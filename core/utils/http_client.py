@@ -0,0 +1,86 @@
+# core/utils/http_client.py
+
+"""
+Shared Pooled HTTP Client
+-------------------------
+
+One aiohttp ClientSession per process instead of one per request:
+
+ - Keep-alive connections are reused, so a warm call costs one request
+   instead of TCP + TLS handshakes + request
+ - DNS answers are cached (`dns_cache_seconds`)
+ - Total / per-host connection limits protect slow providers and us
+ - Each call can pass its own `timeout=aiohttp.ClientTimeout(...)`
+
+The session is created lazily inside the running event loop; call
+`close()` on shutdown.
+
+Usage:
+    session = await shortener_http.session()
+    async with session.get(url, timeout=...) as resp:
+        ...
+"""
+
+import asyncio
+import aiohttp
+
+from core.config import config
+
+
+class SharedHttpClient:
+
+    def __init__(
+        self,
+        limit: int,
+        limit_per_host: int,
+        dns_cache_seconds: int,
+        keepalive_seconds: float,
+        timeout_seconds: float,
+        headers: dict = None
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_seconds = dns_cache_seconds
+        self.keepalive_seconds = keepalive_seconds
+        self.timeout = aiohttp.ClientTimeout(total=timeout_seconds)
+        self.headers = headers or {}
+        self._session = None
+        self._lock = asyncio.Lock()
+
+    async def session(self) -> aiohttp.ClientSession:
+        if self._session is not None and not self._session.closed:
+            return self._session
+
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    ttl_dns_cache=self.dns_cache_seconds,
+                    use_dns_cache=True,
+                    keepalive_timeout=self.keepalive_seconds
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=self.timeout,
+                    headers=self.headers
+                )
+            return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            # Let SSL transports finish closing (aiohttp recommendation)
+            await asyncio.sleep(0.25)
+        self._session = None
+
+
+# Shared by all shortener API calls in the User Bot
+shortener_http = SharedHttpClient(
+    limit=config.SHORTENER_HTTP_LIMIT,
+    limit_per_host=config.SHORTENER_HTTP_LIMIT_PER_HOST,
+    dns_cache_seconds=config.SHORTENER_DNS_CACHE_SECONDS,
+    keepalive_seconds=config.SHORTENER_KEEPALIVE_SECONDS,
+    timeout_seconds=config.SHORTENER_TIMEOUT_SECONDS,
+    headers={"User-Agent": "TelegramFileBot/1.0"}
+)
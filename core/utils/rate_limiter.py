@@ -0,0 +1,58 @@
+# core/utils/rate_limiter.py
+
+"""
+Async Token Bucket
+------------------
+
+Smooths bursts of Telegram API calls to a steady rate.
+
+ - `rate` tokens are added per second, up to `capacity`
+ - `acquire()` waits until a token is available (FIFO)
+ - `pause(seconds)` stops ALL callers, e.g. after TelegramRetryAfter
+
+No external dependencies.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float, capacity: int = None):
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                current = time.monotonic()
+
+                if current < self._paused_until:
+                    await asyncio.sleep(self._paused_until - current)
+                    continue
+
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (current - self._updated) * self.rate
+                )
+                self._updated = current
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """
+        Block every caller for `seconds` (flood-wait from Telegram).
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+        # Refill restarts when the pause ends (no burst right after it)
+        self._updated = self._paused_until
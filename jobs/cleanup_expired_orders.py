@@ -9,7 +9,12 @@ This script:
  - Marks orders with confirm window exceeded as "expired"
  - Removes extremely old expired orders (older than 7 days)
 
-This ensures your orders collection stays clean and optimized.
+Every step is a single server-side bulk operation, so a run costs the
+same number of round trips no matter how many orders match.
+
+Expired orders get an `expired_at` timestamp; the TTL index on that
+field (core/database.py) deletes them after EXPIRED_ORDER_TTL_DAYS.
+Step 3 only catches legacy orders expired before `expired_at` existed.
 
 Run via:
     python jobs/cleanup_expired_orders.py
@@ -19,16 +24,16 @@ Or schedule with cron:
 """
 
 import sys
-import logging
+import time
 from datetime import timedelta
 
 # Load core system
 sys.path.append(".")
 
-from core.database import init_db, db
+from core.config import config
+from core.database import init_db, get_db
 from core.utils.time_utils import now
 from core.utils.logger import get_job_logger
-from bot_admin.services.order_service import OrderService
 
 
 logger = get_job_logger("cleanup_expired_orders")
@@ -37,54 +42,50 @@ logger = get_job_logger("cleanup_expired_orders")
 def cleanup_expired_orders():
     logger.info("---- Cleanup Expired Orders Job Started ----")
 
+    started = time.perf_counter()
+    db = get_db()
     current = now()
 
     # ----------------------------------------------------------
     # 1) EXPIRE QR-EXPIRED ORDERS
     # ----------------------------------------------------------
-    qr_expired_orders = db.orders.find({
-        "status": "pending",
-        "expires_at": {"$lt": current}
-    })
-
-    count_qr = 0
-    for order in qr_expired_orders:
-        OrderService.mark_expired(order["order_id"])
-        count_qr += 1
+    result = db.orders.update_many(
+        {"status": "pending", "expires_at": {"$lt": current}},
+        {"$set": {"status": "expired", "expired_at": current}}
+    )
+    count_qr = result.modified_count
 
     logger.info(f"QR-expired orders marked as expired: {count_qr}")
 
     # ----------------------------------------------------------
     # 2) EXPIRE ORDERS BEYOND CONFIRM WINDOW (10 hours default)
     # ----------------------------------------------------------
-    confirm_expired_orders = db.orders.find({
-        "status": "pending",
-        "confirm_until": {"$lt": current}
-    })
-
-    count_confirm = 0
-    for order in confirm_expired_orders:
-        OrderService.mark_expired(order["order_id"])
-        count_confirm += 1
+    result = db.orders.update_many(
+        {"status": "pending", "confirm_until": {"$lt": current}},
+        {"$set": {"status": "expired", "expired_at": current}}
+    )
+    count_confirm = result.modified_count
 
     logger.info(f"Confirm-window expired orders marked: {count_confirm}")
 
     # ----------------------------------------------------------
-    # 3) HARD DELETE VERY OLD EXPIRED ORDERS (default: 7 days)
+    # 3) HARD DELETE VERY OLD LEGACY EXPIRED ORDERS
+    #    (orders with `expired_at` are removed by the TTL index)
     # ----------------------------------------------------------
-    old_expired_orders = db.orders.find({
+    result = db.orders.delete_many({
         "status": "expired",
-        "expires_at": {"$lt": current - timedelta(days=7)}
+        "expired_at": {"$exists": False},
+        "expires_at": {"$lt": current - timedelta(days=config.EXPIRED_ORDER_TTL_DAYS)}
     })
+    delete_count = result.deleted_count
 
-    delete_count = 0
-    for order in old_expired_orders:
-        db.orders.delete_one({"order_id": order["order_id"]})
-        delete_count += 1
-
-    logger.info(f"Deleted old expired orders (>7 days): {delete_count}")
+    logger.info(f"Deleted old expired orders (>{config.EXPIRED_ORDER_TTL_DAYS} days): {delete_count}")
 
-    logger.info("---- Cleanup Expired Orders Job Completed ✔ ----")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(
+        f"---- Cleanup Expired Orders Job Completed ✔ "
+        f"(touched {count_qr + count_confirm + delete_count} docs in {elapsed_ms:.1f} ms) ----"
+    )
 
 
 if __name__ == "__main__":
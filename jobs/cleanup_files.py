@@ -1,8 +1,12 @@
 # jobs/cleanup_files.py
 
 """
-Cleanup Job: Auto-delete delivered files
-----------------------------------------
+Cleanup Job: Auto-delete delivered files (FALLBACK)
+---------------------------------------------------
+
+Deliveries are normally deleted on time by the User Bot's in-process
+scheduler (bot_user/services/auto_delete_service.py). This job only
+sweeps entries left behind while the User Bot was offline.
 
 This script deletes:
   - File message #1 (zip + caption)
@@ -22,18 +26,18 @@ Structure of temp_delivery:
   "delete_after": <datetime>
 }
 
-Run via CRON every minute:
-    * * * * * /usr/bin/python3 /path/to/cleanup_files.py
+Run via CRON (a slow interval is enough now):
+    */15 * * * * /usr/bin/python3 /path/to/cleanup_files.py
 """
 
 import sys
-import logging
+import time
 
 sys.path.append(".")
 
 import asyncio
 from aiogram import Bot
-from core.database import init_db, db
+from core.database import init_db, get_db
 from core.utils.time_utils import now
 from core.config import config
 from core.utils.logger import get_job_logger
@@ -45,58 +49,47 @@ logger = get_job_logger("cleanup_files")
 async def cleanup_files():
     logger.info("---- Cleanup File Delivery Job Started ----")
 
+    started = time.perf_counter()
+    db = get_db()
     bot = Bot(token=config.BOT_B_TOKEN, parse_mode="Markdown")
 
     current = now()
 
     # Find all expired entries
-    expired_entries = db.temp_delivery.find({
+    expired_entries = list(db.temp_delivery.find({
         "delete_after": {"$lt": current}
-    })
-
-    delete_count = 0
-
-    async for entry in expired_entries:
-        chat_id = entry.get("chat_id")
-        msg1_id = entry.get("msg1_id")
-        msg2_id = entry.get("msg2_id")
-        click_id = entry.get("click_message_id")  # optional
-
-        # ----------------------------------------------
-        # Delete Message #1
-        # ----------------------------------------------
-        try:
-            await bot.delete_message(chat_id, msg1_id)
-            logger.info(f"Deleted file message 1: {msg1_id}")
-        except Exception:
-            pass
-
-        # ----------------------------------------------
-        # Delete Message #2
-        # ----------------------------------------------
-        try:
-            await bot.delete_message(chat_id, msg2_id)
-            logger.info(f"Deleted file message 2: {msg2_id}")
-        except Exception:
-            pass
-
-        # ----------------------------------------------
-        # Delete post-download "Click Here" message
-        # ----------------------------------------------
-        if click_id:
+    }))
+
+    try:
+        for entry in expired_entries:
+            message_ids = [
+                entry.get(key) for key in ("msg1_id", "msg2_id", "click_message_id")
+                if entry.get(key)
+            ]
+
+            # ----------------------------------------------
+            # Delete file messages + optional "Click Here" message
+            # ----------------------------------------------
             try:
-                await bot.delete_message(chat_id, click_id)
-                logger.info(f"Deleted click message: {click_id}")
+                await bot.delete_messages(entry.get("chat_id"), message_ids)
+                logger.info(f"Deleted messages: {message_ids}")
             except Exception:
                 pass
+    finally:
+        await bot.session.close()
 
-        # ----------------------------------------------
-        # Remove this entry from DB
-        # ----------------------------------------------
-        db.temp_delivery.delete_one({"_id": entry["_id"]})
-        delete_count += 1
-
-    logger.info(f"Expired deliveries cleaned: {delete_count}")
+    # ----------------------------------------------
+    # Remove all handled entries in one round trip
+    # ----------------------------------------------
+    delete_count = 0
+    if expired_entries:
+        result = db.temp_delivery.delete_many(
+            {"_id": {"$in": [entry["_id"] for entry in expired_entries]}}
+        )
+        delete_count = result.deleted_count
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"Expired deliveries cleaned: {delete_count} ({elapsed_ms:.1f} ms)")
     logger.info("---- Cleanup Files Job Completed ✔ ----")
 
 
@@ -6,7 +6,13 @@ Cleanup Job: Verification Expiry
 
 This script:
  - Removes verification status from users whose verification time expired
- - Deletes old verification logs (older than 7 days by default)
+ - Clears expired manual verifications granted by admins
+
+Both steps are single `update_many` calls (constant round trips per run).
+
+Old verification logs are no longer deleted here: the TTL index on
+`verification.expires` (core/database.py) removes them after
+VERIFICATION_LOG_TTL_DAYS.
 
 Run via:
     python jobs/cleanup_verification.py
@@ -16,11 +22,10 @@ Or set via cron:
 """
 
 import sys
+import time
 sys.path.append(".")
 
-from datetime import timedelta
-
-from core.database import init_db, db
+from core.database import init_db, get_db
 from core.utils.time_utils import now
 from core.utils.logger import get_job_logger
 
@@ -31,46 +36,40 @@ logger = get_job_logger("cleanup_verification")
 def cleanup_verification():
     logger.info("---- Cleanup Verification Job Started ----")
 
+    started = time.perf_counter()
+    db = get_db()
     current = now()
 
     # --------------------------------------------------------------
     # 1) REMOVE VERIFIED STATUS FROM EXPIRED USERS
     # --------------------------------------------------------------
-    expired_users = db.users.find({
-        "is_verified": True,
-        "verified_until": {"$lt": current}
-    })
-
-    count_users = 0
-    for user in expired_users:
-        db.users.update_one(
-            {"user_id": user["user_id"]},
-            {
-                "$set": {"is_verified": False},
-                "$unset": {"verified_until": ""}
-            }
-        )
-        count_users += 1
+    result = db.users.update_many(
+        {"is_verified": True, "verified_until": {"$lt": current}},
+        {
+            "$set": {"is_verified": False},
+            "$unset": {"verified_until": ""}
+        }
+    )
+    count_users = result.modified_count
 
     logger.info(f"Verification expired for users: {count_users}")
 
     # --------------------------------------------------------------
-    # 2) DELETE OLD VERIFICATION LOGS (> 7 DAYS)
+    # 2) CLEAR EXPIRED MANUAL (ADMIN-GRANTED) VERIFICATIONS
     # --------------------------------------------------------------
-    cutoff = current - timedelta(days=7)
-
-    old_logs = db.verification.find({
-        "expires": {"$lt": cutoff}
-    })
-
-    count_logs = 0
-    for log in old_logs:
-        db.verification.delete_one({"_id": log["_id"]})
-        count_logs += 1
-
-    logger.info(f"Old verification logs removed: {count_logs}")
-
-    logger.info("---- Cleanup Verification Job Completed ✔ ----")
+    result = db.users.update_many(
+        {"manual_verified_until": {"$lt": current}},
+        {"$unset": {"manual_verified_until": ""}}
+    )
+    count_manual = result.modified_count
+
+    logger.info(f"Manual verifications expired: {count_manual}")
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(
+        f"---- Cleanup Verification Job Completed ✔ "
+        f"(touched {count_users + count_manual} docs in {elapsed_ms:.1f} ms) ----"
+    )
 
 
 if __name__ == "__main__":
@@ -8,6 +8,9 @@ This job:
  - Removes premium status from users whose premium expiration time has passed.
  - Keeps the database clean and prevents users from retaining premium access.
 
+A single `update_many` does the work, so each run costs one round trip
+no matter how many users expired.
+
 Run via:
     python jobs/premium_expiry.py
 
@@ -16,9 +19,10 @@ Cron example (every 10 minutes):
 """
 
 import sys
+import time
 sys.path.append(".")
 
-from core.database import init_db, db
+from core.database import init_db, get_db
 from core.utils.time_utils import now
 from core.utils.logger import get_job_logger
 
@@ -29,30 +33,29 @@ logger = get_job_logger("premium_expiry")
 def cleanup_premium():
     logger.info("---- Premium Expiry Job Started ----")
 
+    started = time.perf_counter()
+    db = get_db()
     current = now()
 
     # -------------------------------------------------------
     # EXPIRE PREMIUM USERS
     # -------------------------------------------------------
-    expired_premium_users = db.users.find({
-        "is_premium": True,
-        "premium_expiry": {"$lt": current}
-    })
-
-    expired_count = 0
-    for user in expired_premium_users:
-        db.users.update_one(
-            {"user_id": user["user_id"]},
-            {
-                "$set": {"is_premium": False},
-                "$unset": {"premium_expiry": "", "premium_plan": ""}
-            }
-        )
-        expired_count += 1
+    result = db.users.update_many(
+        {"is_premium": True, "premium_expiry": {"$lt": current}},
+        {
+            "$set": {"is_premium": False},
+            "$unset": {"premium_expiry": "", "premium_plan": ""}
+        }
+    )
+    expired_count = result.modified_count
 
     logger.info(f"Premium users expired: {expired_count}")
 
-    logger.info("---- Premium Expiry Job Completed ✔ ----")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(
+        f"---- Premium Expiry Job Completed ✔ "
+        f"(touched {expired_count} docs in {elapsed_ms:.1f} ms) ----"
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,39 @@
+# redirect_server/gunicorn_conf.py
+
+"""
+Gunicorn config for the redirect server (production launch).
+
+    gunicorn -c redirect_server/gunicorn_conf.py redirect_server.redirect_main:app
+
+ - One uvicorn worker per CPU core (REDIRECT_WORKERS to override)
+ - The app is NOT preloaded: each worker imports it and opens its own
+   Mongo pool in the FastAPI lifespan hook, so nothing is shared
+   across the fork
+ - `kill -HUP <master pid>` starts fresh workers with the new code /
+   .env, then retires the old ones after they finish in-flight
+   requests (up to REDIRECT_GRACEFUL_TIMEOUT seconds)
+"""
+
+import multiprocessing
+import os
+
+from core.config import config
+
+
+bind = f"{config.REDIRECT_HOST}:{config.REDIRECT_PORT}"
+workers = config.REDIRECT_WORKERS or multiprocessing.cpu_count()
+worker_class = "uvicorn.workers.UvicornWorker"
+
+preload_app = False
+graceful_timeout = config.REDIRECT_GRACEFUL_TIMEOUT
+timeout = 60
+keepalive = 5
+
+# Recycle workers now and then to cap slow memory growth
+max_requests = 20000
+max_requests_jitter = 2000
+
+pidfile = os.path.join("logs", "redirect_server.pid")
+accesslog = None
+errorlog = "-"
+loglevel = "info"
@@ -0,0 +1,194 @@
+# redirect_server/metrics.py
+
+"""
+Redirect Server Metrics
+-----------------------
+
+Minimal in-process counters / gauges / histograms rendered in the
+Prometheus text format on GET /metrics.
+
+ - Everything runs on the event loop thread: no locks, one dict lookup
+   + a bisect per observation
+ - Request metrics are labelled by ROUTE TEMPLATE ("/redirect"), never
+   by raw URL, so label cardinality stays fixed
+ - DB time comes from core.async_database (set_observer), labelled by
+   route template + pymongo operation. The middleware publishes the
+   request scope in a ContextVar; the router fills scope["route"]
+   before the endpoint runs, so the observer (same task context) can
+   attribute the call. Calls outside a request get route="none"
+
+State is per worker process: with several workers, every scrape sees
+one worker (add the instance/pid in the scrape config, or sum in
+PromQL over time).
+"""
+
+import bisect
+import os
+import time
+from contextvars import ContextVar
+
+from core.async_database import set_observer
+
+
+# Seconds; covers in-memory hits (~0.1 ms) up to slow DB round trips
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# ASGI scope of the request being handled in this task (set by MetricsMiddleware)
+_request_scope: ContextVar = ContextVar("redirect_request_scope", default=None)
+
+
+def _route_of(scope: dict) -> str:
+    # Set by the router once a route matched
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{v}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.values = {}
+
+    def inc(self, *label_values, amount: float = 1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in self.values.items():
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+
+    def dec(self, *label_values, amount: float = 1):
+        self.inc(*label_values, amount=-amount)
+
+    def render(self) -> list:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        if not self.values and not self.labels:
+            lines.append(f"{self.name} 0")
+        return lines
+
+
+class Histogram:
+
+    def __init__(self, name: str, help_text: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self.series = {}        # label values -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, *label_values):
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        # Per-bucket (non-cumulative) counts; cumulated on render
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, series in self.series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labels + ("le",), key + (bound,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {series[-1]}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+# ============================================================
+# REDIRECT SERVER METRICS
+# ============================================================
+requests_total = Counter(
+    "redirect_http_requests_total", "HTTP requests by route and status.", ("route", "status")
+)
+request_seconds = Histogram(
+    "redirect_http_request_duration_seconds", "Handler latency by route.", ("route",)
+)
+in_flight = Gauge(
+    "redirect_http_requests_in_flight", "Requests currently being handled."
+)
+verifications_total = Counter(
+    "redirect_verifications_total", "/return outcomes (verified, bypass, replay).", ("outcome",)
+)
+invalid_tokens_total = Counter(
+    "redirect_invalid_tokens_total", "Missing or undecodable tokens by route.", ("route",)
+)
+db_seconds = Histogram(
+    "redirect_db_duration_seconds", "MongoDB call latency by route and operation.", ("route", "operation")
+)
+
+REGISTRY = (requests_total, request_seconds, in_flight, verifications_total, invalid_tokens_total, db_seconds)
+
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    lines.append(f'redirect_process_info{{pid="{os.getpid()}"}} 1')
+    return "\n".join(lines) + "\n"
+
+
+def _observe_db(operation: str, seconds: float):
+    scope = _request_scope.get()
+    route = _route_of(scope) if scope is not None else "none"
+    db_seconds.observe(seconds, route, operation)
+
+
+def enable_db_timing():
+    set_observer(_observe_db)
+
+
+# ============================================================
+# ASGI MIDDLEWARE
+# ============================================================
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task/stream overhead).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight.inc()
+        scope_token = _request_scope.set(scope)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_flight.dec()
+            _request_scope.reset(scope_token)
+
+            route = _route_of(scope)
+
+            requests_total.inc(route, status)
+            request_seconds.observe(elapsed, route)
@@ -1,25 +1,83 @@
 # redirect_server/redirect_main.py
 
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI, Request, Query
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from core.config import config
-from core.database import init_db
+from core.database import init_db, close_db
+from core.async_database import shutdown_executor
 from core.utils.logger import get_redirect_logger
 from redirect_server.token_handler import RedirectTokenHandler
+from redirect_server.replay_guard import ReplayGuard
+from redirect_server.static_assets import StaticAssets
+from redirect_server import metrics
 
-app = FastAPI()
 logger = get_redirect_logger()
 
+
+# ============================================================
+# LIFESPAN — per-worker DB connection
+# ============================================================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Runs inside every worker process AFTER it has been forked, so each
+    worker opens its own MongoClient pool (pymongo clients are not
+    fork-safe) and importing this module has no side effects.
+    """
+    await asyncio.get_running_loop().run_in_executor(None, init_db)
+    if config.REDIRECT_METRICS:
+        metrics.enable_db_timing()
+    logger.info("[Redirect] Worker ready")
+
+    yield
+
+    # Release DB worker threads + connections
+    shutdown_executor(wait=False)
+    close_db()
+    logger.info("[Redirect] Worker stopped")
+
+
+app = FastAPI(lifespan=lifespan)
+if config.REDIRECT_METRICS:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 # Static & Template Mounts
 app.mount("/static", StaticFiles(directory="redirect_server/static"), name="static")
 templates = Jinja2Templates(directory="redirect_server/templates")
 
-# Initialize DB
-init_db()
+# Fingerprinted script/style (+ the static countdown page), precompressed
+static_assets = StaticAssets("redirect_server/static", ["script.js", "style.css"])
+ASSET_URLS = {
+    "script_url": static_assets.url("script.js"),
+    "style_url": static_assets.url("style.css"),
+}
+if config.REDIRECT_STATIC_PAGE:
+    # Rendered once: no token / ticket inside; script.js reads ?token=
+    # and gets its visit ticket from POST /visit
+    static_assets.set_page(templates.get_template("countdown.html").render(
+        token="",
+        ticket="",
+        static_page=True,
+        countdown=config.VERIFY_MIN_DWELL_SECONDS,
+        **ASSET_URLS
+    ))
+
+# Cookie carrying the signed visit ticket (also passed as ?ticket=)
+VISIT_TICKET_COOKIE = "visit_ticket"
+
+# Single-use visit tickets (in memory, no DB; best-effort per worker).
+# The binding single-use check is the bot's verified_ handler
+# (compact_tokens.consume_token).
+used_tickets = ReplayGuard(config.VISIT_TICKET_MAX_AGE_SECONDS, bucket_seconds=60)
 
 
 # ============================================================
@@ -32,47 +90,100 @@ async def redirect_entry(request: Request, token: str = Query(default=None)):
     Steps:
      - Decode token
      - Validate
-     - Log visit for anti-bypass
+     - Issue signed visit ticket for anti-bypass
      - Show countdown page
+
+    REDIRECT_STATIC_PAGE: only the static page is served here (no token
+    decoding, no DB); the page calls POST /visit for the rest.
     """
+    if static_assets.page is not None:
+        # Same bytes for every visitor; 304 if the browser has them
+        return static_assets.page.respond(request)
+
     if not token:
         logger.warning("Redirect request with missing token")
+        metrics.invalid_tokens_total.inc("/redirect")
         return HTMLResponse("<h1>Invalid Token</h1>")
 
-    payload = RedirectTokenHandler.decode_incoming_token(token)
+    payload = await RedirectTokenHandler.decode_incoming_token(token)
     if not payload:
         logger.warning(f"Invalid token decode: {token}")
+        metrics.invalid_tokens_total.inc("/redirect")
         return HTMLResponse("<h1>Invalid or Expired Verification Token</h1>")
 
     user_id = payload.get("user_id")
-
-    # Log the visit (used for bypass detection)
-    RedirectTokenHandler.log_visit(user_id, token)
-
-    logger.info(f"[Redirect] User {user_id} visited redirect page")
+    ticket = _record_visit(user_id, token)
 
     # Show countdown.html
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         "countdown.html",
         {
             "request": request,
             "user_id": user_id,
             "file_id": payload.get("file_id"),
             "post_no": payload.get("post_no"),
-            "token": token
+            "token": token,
+            "ticket": ticket,
+            "static_page": False,
+            "countdown": config.VERIFY_MIN_DWELL_SECONDS,
+            **ASSET_URLS
         }
     )
+    _set_ticket_cookie(response, ticket)
+    return response
+
+
+# ============================================================
+# 1b) VISIT TICKET FOR THE STATIC PAGE  POST /visit?token=<token>
+# ============================================================
+@app.post("/visit")
+async def visit(token: str = Query(default=None)):
+    """
+    Called by the static countdown page (REDIRECT_STATIC_PAGE) before
+    its countdown starts: validates the token and sets the visit ticket
+    cookie. The dwell time is measured from here.
+    """
+    payload = await RedirectTokenHandler.decode_incoming_token(token) if token else None
+    if not payload:
+        logger.warning(f"Invalid token on /visit: {token}")
+        metrics.invalid_tokens_total.inc("/visit")
+        return JSONResponse({"ok": False}, status_code=400, headers={"Cache-Control": "no-store"})
+
+    ticket = _record_visit(payload.get("user_id"), token)
+
+    response = JSONResponse({"ok": True}, headers={"Cache-Control": "no-store"})
+    _set_ticket_cookie(response, ticket)
+    return response
+
+
+def _record_visit(user_id: int, token: str) -> str:
+    # Signed visit ticket (used for bypass detection, no DB)
+    ticket = RedirectTokenHandler.issue_visit_ticket(user_id, token)
+    RedirectTokenHandler.audit_visit(user_id, token)
+    logger.info(f"[Redirect] User {user_id} visited redirect page")
+    return ticket
+
+
+def _set_ticket_cookie(response, ticket: str):
+    response.set_cookie(
+        VISIT_TICKET_COOKIE,
+        ticket,
+        max_age=config.VISIT_TICKET_MAX_AGE_SECONDS,
+        httponly=True,
+        samesite="lax"
+    )
 
 
 # ============================================================
 # 2) RETURN URL — Called after countdown completes
-# GET /return?result=verified&token=<token>
+# GET /return?result=verified&token=<token>&ticket=<ticket>
 # ============================================================
 @app.get("/return")
 async def return_to_bot(
     request: Request,
     result: str = Query(default=None),
-    token: str = Query(default=None)
+    token: str = Query(default=None),
+    ticket: str = Query(default=None)
 ):
     """
     The countdown page calls this after user finishes waiting.
@@ -86,29 +197,50 @@ async def return_to_bot(
     """
 
     if not token:
+        metrics.invalid_tokens_total.inc("/return")
         return HTMLResponse("<h1>Missing Token</h1>")
 
-    payload = RedirectTokenHandler.decode_incoming_token(token)
+    payload = await RedirectTokenHandler.decode_incoming_token(token)
     if not payload:
         logger.warning("Return with invalid token")
+        metrics.invalid_tokens_total.inc("/return")
         return HTMLResponse("<h1>Invalid Token</h1>")
 
     user_id = payload.get("user_id")
     file_id = payload.get("file_id")
     post_no = payload.get("post_no")
 
-    visited = RedirectTokenHandler.did_user_visit(user_id, token)
+    # Verified in memory: HMAC over (user, token, visit time)
+    ticket = ticket or request.cookies.get(VISIT_TICKET_COOKIE)
+    visited_at = RedirectTokenHandler.verify_visit_ticket(ticket, user_id, token)
 
-    if not visited:
+    # Countdown is enforced here, not only in script.js
+    too_fast = (
+        visited_at is not None
+        and time.time() - visited_at < config.VERIFY_MIN_DWELL_SECONDS
+    )
+
+    # Each visit ticket may complete only once. The token itself is not
+    # consumed here: a new VERIFY NOW issues a new token anyway.
+    if visited_at is not None and not too_fast:
+        if not used_tickets.consume(ticket):
+            logger.warning(f"[REPLAY] User {user_id} reused a verification link.")
+            metrics.verifications_total.inc("replay")
+            return HTMLResponse("<h1>This verification link was already used</h1>")
+
+    if visited_at is None or too_fast:
         # BYPASS DETECTED
-        logger.warning(f"[BYPASS] User {user_id} attempted bypass.")
-        final_token = RedirectTokenHandler.build_bypass_token(
+        reason = "returned before countdown" if too_fast else "no valid visit ticket"
+        logger.warning(f"[BYPASS] User {user_id} attempted bypass ({reason}).")
+        metrics.verifications_total.inc("bypass")
+        final_token = await RedirectTokenHandler.build_bypass_token(
             user_id, file_id, post_no
         )
     else:
         # VERIFIED SUCCESSFULLY
         logger.info(f"[VERIFIED] User {user_id} successfully verified.")
-        final_token = RedirectTokenHandler.build_verified_token(
+        metrics.verifications_total.inc("verified")
+        final_token = await RedirectTokenHandler.build_verified_token(
             user_id, file_id, post_no
         )
 
@@ -120,7 +252,25 @@ async def return_to_bot(
 
 
 # ============================================================
-# 3) ROOT INDEX
+# 3) FINGERPRINTED ASSETS  /assets/<version>/<name>
+# ============================================================
+@app.get("/assets/{version}/{name}")
+async def assets(request: Request, version: str, name: str):
+    return static_assets.respond(request, version, name)
+
+
+# ============================================================
+# 4) METRICS  (Prometheus text format)
+# ============================================================
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    if not config.REDIRECT_METRICS:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+# ============================================================
+# 5) ROOT INDEX
 # ============================================================
 @app.get("/", response_class=HTMLResponse)
 async def home():
@@ -128,14 +278,18 @@ async def home():
 
 
 # ============================================================
-# 4) SERVER RUNNER
+# 6) SERVER RUNNER
+# Production (graceful reload with `kill -HUP`):
+#   gunicorn -c redirect_server/gunicorn_conf.py redirect_server.redirect_main:app
 # ============================================================
 if __name__ == "__main__":
     logger.info("🚀 Starting Redirect Server")
 
     uvicorn.run(
         "redirect_server.redirect_main:app",
-        host="0.0.0.0",
-        port=5000,
+        host=config.REDIRECT_HOST,
+        port=config.REDIRECT_PORT,
+        workers=config.REDIRECT_WORKERS or os.cpu_count(),
+        timeout_graceful_shutdown=config.REDIRECT_GRACEFUL_TIMEOUT,
         reload=False
     )
@@ -0,0 +1,65 @@
+# redirect_server/replay_guard.py
+
+"""
+Replay Guard
+------------
+
+In-memory, time-bucketed set of consumed visit tickets, so a replayed
+/return is rejected without any DB query.
+
+ - Keys are stored as 16-byte BLAKE2b digests
+ - Each key lives in the bucket of the time it was consumed
+   (`bucket_seconds` wide); whole buckets are dropped once they are
+   older than `retention_seconds`, so memory stays bounded and
+   cleanup is O(1) per bucket
+ - Retention must cover the ticket lifetime: a ticket older than
+   VISIT_TICKET_MAX_AGE_SECONDS is rejected anyway
+
+State is per process, so this is best-effort: with several server
+workers, a replay that reaches another worker is only stopped by the
+ticket age limit. What makes a verification single-use is the bot's
+verified_ handler (compact_tokens.consume_token, one atomic update).
+"""
+
+import hashlib
+import time
+
+
+class ReplayGuard:
+
+    def __init__(self, retention_seconds: float, bucket_seconds: float):
+        self.retention = retention_seconds
+        self.bucket_seconds = bucket_seconds
+        self._buckets = {}      # bucket index -> set(digest)
+
+    @staticmethod
+    def _digest(key: str) -> bytes:
+        return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+    def _bucket(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    def _purge(self, current: float):
+        oldest = self._bucket(current - self.retention)
+        for index in [i for i in self._buckets if i < oldest]:
+            del self._buckets[index]
+
+    def seen(self, key: str) -> bool:
+        digest = ReplayGuard._digest(key)
+        return any(digest in bucket for bucket in self._buckets.values())
+
+    def consume(self, key: str) -> bool:
+        """
+        Mark key as used. Returns False if it was already used (replay).
+        """
+        current = time.time()
+        self._purge(current)
+
+        if self.seen(key):
+            return False
+
+        self._buckets.setdefault(self._bucket(current), set()).add(ReplayGuard._digest(key))
+        return True
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._buckets.values())
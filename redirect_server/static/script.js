@@ -3,7 +3,11 @@
    ============================================================ */
 
 document.addEventListener("DOMContentLoaded", () => {
-    const token = window.VERIFY_TOKEN || null;
+    // Static page mode: token comes from the URL (?token=...); POST /visit
+    // validates it and sets the visit ticket cookie before the countdown
+    const params = new URLSearchParams(window.location.search);
+    const token = window.VERIFY_TOKEN || params.get("token");
+    const ticket = window.VISIT_TICKET || "";
 
     // Only run countdown logic if countdown element exists
     const countdownSpan = document.getElementById("countdown-seconds");
@@ -19,7 +23,8 @@ document.addEventListener("DOMContentLoaded", () => {
 
         if (seconds <= 0) {
             // Timer complete → redirect to /return
-            window.location.href = `/return?result=verified&token=${token}`;
+            window.location.href =
+                `/return?result=verified&token=${encodeURIComponent(token)}&ticket=${encodeURIComponent(ticket)}`;
             return;
         }
 
@@ -27,6 +32,19 @@ document.addEventListener("DOMContentLoaded", () => {
         setTimeout(tick, 1000);
     };
 
+    const invalid = () => {
+        const box = document.querySelector(".countdown-box");
+        if (box) {
+            box.innerHTML = "<h2 class=\"title\">Invalid or Expired Verification Token</h2>";
+        }
+    };
+
     // Begin ticking
-    setTimeout(tick, 1000);
+    if (window.STATIC_PAGE) {
+        fetch(`/visit?token=${encodeURIComponent(token)}`, { method: "POST", credentials: "same-origin" })
+            .then((resp) => (resp.ok ? setTimeout(tick, 1000) : invalid()))
+            .catch(invalid);
+    } else {
+        setTimeout(tick, 1000);
+    }
 });
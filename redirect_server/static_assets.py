@@ -0,0 +1,140 @@
+# redirect_server/static_assets.py
+
+"""
+Precompressed In-Memory Assets
+------------------------------
+
+Serves the countdown page and its script / stylesheet straight from
+memory, without template rendering or disk reads per request.
+
+ - Every asset is built ONCE at startup in three encodings:
+   identity, gzip and (if the `brotli` package is installed) br
+ - Each encoding has its own strong ETag ("<sha256>", "<sha256>-gz",
+   "<sha256>-br"), so a matching If-None-Match gets an empty 304
+ - Script / stylesheet are published under a fingerprinted path
+   (/assets/<version>/<name>) and cached as immutable for a year;
+   a new deploy changes the fingerprint instead of the cache headers
+ - The countdown page is the same for every visitor (no token inside)
+   and public for PAGE_MAX_AGE seconds, so a front proxy / CDN can
+   serve it; an outdated copy still loads via the fingerprint fallback
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:     # optional: gzip only
+    brotli = None
+
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+PAGE_MAX_AGE = 300
+
+# Smaller bodies are not worth compressing
+MIN_COMPRESS_BYTES = 256
+
+
+class PrecompressedAsset:
+
+    def __init__(self, body: bytes, content_type: str, cache_control: str = REVALIDATE):
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.version = hashlib.sha256(body).hexdigest()[:16]
+
+        # encoding -> (body, etag); None = identity
+        self.variants = {None: (body, f'"{self.version}"')}
+
+        if len(body) >= MIN_COMPRESS_BYTES:
+            gz = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(gz) < len(body):
+                self.variants["gzip"] = (gz, f'"{self.version}-gz"')
+
+            if brotli is not None:
+                br = brotli.compress(body, quality=11)
+                if len(br) < len(body):
+                    self.variants["br"] = (br, f'"{self.version}-br"')
+
+    def _pick_encoding(self, accept_encoding: str):
+        accepted = set()
+        for item in accept_encoding.split(","):
+            name, _, params = item.strip().partition(";")
+            if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+                continue
+            accepted.add(name.strip().lower())
+
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and encoding in accepted:
+                return encoding
+        return None
+
+    def respond(self, request: Request, cache_control: str = None) -> Response:
+        encoding = self._pick_encoding(request.headers.get("accept-encoding", ""))
+        body, etag = self.variants[encoding]
+
+        headers = {
+            "ETag": etag,
+            "Cache-Control": cache_control or self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        return Response(content=body, media_type=self.content_type, headers=headers)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    If-None-Match uses weak comparison (RFC 9110 §13.1.2).
+    """
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+# ============================================================
+# ASSET REGISTRY
+# ============================================================
+class StaticAssets:
+    """
+    Fingerprinted script / stylesheet files + the static countdown page.
+    """
+
+    def __init__(self, static_dir: str, names: list):
+        self.files = {}
+        for name in names:
+            with open(os.path.join(static_dir, name), "rb") as f:
+                content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                self.files[name] = PrecompressedAsset(f.read(), content_type, IMMUTABLE)
+
+        self.page = None
+
+    def url(self, name: str) -> str:
+        return f"/assets/{self.files[name].version}/{name}"
+
+    def set_page(self, html: str):
+        self.page = PrecompressedAsset(html.encode(), "text/html", f"public, max-age={PAGE_MAX_AGE}")
+
+    def respond(self, request: Request, version: str, name: str) -> Response:
+        asset = self.files.get(name)
+        if asset is None:
+            return Response(status_code=404)
+
+        # Outdated fingerprint (page cached from the previous deploy):
+        # serve the current file, but don't let it be cached as immutable
+        if version != asset.version:
+            return asset.respond(request, cache_control=REVALIDATE)
+
+        return asset.respond(request)
@@ -17,23 +17,43 @@ Flow:
 2. User loads shortlink -> shortener -> your redirect server
 3. This module:
      - decrypts token
-     - logs verification start
-4. After countdown is completed, it generates:
+     - issues a signed visit ticket (cookie + query param)
+     - optionally logs the visit (async audit trail, REDIRECT_AUDIT_LOG)
+4. /return verifies the ticket in memory (no DB round trip)
+5. After countdown is completed, it generates:
      /return?result=verified_<token>
    If bypass detected:
      /return?result=bypass_<token>
-5. Bot B interprets the final deep-link.
+6. Bot B interprets the final deep-link.
+
+Visit ticket:
+    <visited_at epoch>.<kid>_<hmac>
+    hmac = HMAC(key, "visit:<user_id>:<visited_at>:<token>")
+Bound to the user and the token, so it cannot be reused for another
+verification; older than VISIT_TICKET_MAX_AGE_SECONDS → rejected.
 
 SECURITY:
- - AES-256 token encryption via token_encryptor.py
+ - Compact HMAC token IDs via compact_tokens.py (default), or
+ - AES-256 token encryption via token_encryptor.py (TOKEN_MODE=fernet)
  - Optional HMAC signature protection via signature_checker.py
 """
 
-from datetime import datetime
-from core.security.token_encryptor import decode_payload, encode_payload
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from core.config import config
+from core.security.token_encryptor import encode_payload
+from core.security.compact_tokens import encode_token, decode_token, check_start_param, PURPOSE_FIELD
 from core.security.signature_checker import SignatureChecker
+from core.shortlink_pool import ShortlinkPool
 from core.utils.time_utils import now
-from core.database import db
+from core.async_database import adb
+
+logger = logging.getLogger(__name__)
+
+# Pending audit inserts (keeps fire-and-forget tasks referenced)
+_audit_tasks = set()
 
 
 class RedirectTokenHandler:
@@ -42,17 +62,22 @@ class RedirectTokenHandler:
     # DECODE TOKEN FROM USER BOT → PAYLOAD
     # ------------------------------------------------------------
     @staticmethod
-    def decode_incoming_token(encoded_token: str) -> dict:
+    async def decode_incoming_token(encoded_token: str) -> dict:
         """
         Decrypts token received via:
             /redirect?token=<encrypted>
+        /redirect?token=lt-<ticket id>   (prefetched shortlink)
 
         Returns dict or None if tampered/invalid.
         """
         if not encoded_token:
             return None
 
-        payload = decode_payload(encoded_token)
+        # Prefetched shortlink → ticket bound at VERIFY NOW time
+        if ShortlinkPool.is_ticket(encoded_token):
+            return await ShortlinkPool.resolve(encoded_token)
+
+        payload = await decode_token(encoded_token, "redirect")
         if not payload:
             return None
 
@@ -68,22 +93,82 @@ class RedirectTokenHandler:
     # LOG VISIT (OPTIONAL)
     # ------------------------------------------------------------
     @staticmethod
-    def log_visit(user_id: int, token: str):
+    async def log_visit(user_id: int, token: str):
         """
         Stores the timestamp of redirect server visit.
         Helps detect bypass (user must hit redirect before verifying).
         """
-        db.redirect_logs.insert_one({
+        await adb.redirect_logs.insert_one({
             "user_id": user_id,
             "token": token,
             "visited_at": now()
         })
 
+    @staticmethod
+    def audit_visit(user_id: int, token: str):
+        """
+        Fire-and-forget log_visit() when REDIRECT_AUDIT_LOG is on.
+        Never delays the response and never fails it.
+        """
+        if not config.REDIRECT_AUDIT_LOG:
+            return
+
+        async def write():
+            try:
+                await RedirectTokenHandler.log_visit(user_id, token)
+            except Exception as e:
+                logger.warning(f"[Audit] Failed to log visit for {user_id}: {e}")
+
+        task = asyncio.create_task(write())
+        _audit_tasks.add(task)
+        task.add_done_callback(_audit_tasks.discard)
+
+    # ------------------------------------------------------------
+    # SIGNED VISIT TICKET (replaces redirect_logs lookups)
+    # ------------------------------------------------------------
+    @staticmethod
+    def _ticket_data(user_id: int, visited_at: int, token: str) -> str:
+        return f"visit:{user_id}:{visited_at}:{token}"
+
+    @staticmethod
+    def issue_visit_ticket(user_id: int, token: str) -> str:
+        """
+        Called on /redirect. Proves (statelessly) that this user
+        opened the redirect page for this token, and when.
+        """
+        visited_at = int(time.time())
+        data = RedirectTokenHandler._ticket_data(user_id, visited_at, token)
+        return f"{visited_at}.{SignatureChecker.sign(data)}"
+
+    @staticmethod
+    def verify_visit_ticket(ticket: str, user_id: int, token: str):
+        """
+        Returns visited_at (epoch seconds) if the ticket is valid for
+        this user + token and not too old, else None. Pure CPU.
+        """
+        if not ticket:
+            return None
+
+        visited_at, _, signature = ticket.partition(".")
+        if not visited_at.isdigit() or not signature:
+            return None
+
+        visited_at = int(visited_at)
+        age = time.time() - visited_at
+        if age < 0 or age > config.VISIT_TICKET_MAX_AGE_SECONDS:
+            return None
+
+        data = RedirectTokenHandler._ticket_data(user_id, visited_at, token)
+        if not SignatureChecker.verify_signature(data, signature):
+            return None
+
+        return visited_at
+
     # ------------------------------------------------------------
     # BUILD VERIFIED RETURN TOKEN → bot deep-link
     # ------------------------------------------------------------
     @staticmethod
-    def build_verified_token(user_id: int, file_id: str = None, post_no: int = None) -> str:
+    async def build_verified_token(user_id: int, file_id: str = None, post_no: int = None) -> str:
         """
         Called after verification countdown is completed successfully.
         """
@@ -93,18 +178,14 @@ class RedirectTokenHandler:
             "post_no": post_no
         }
 
-        encrypted = encode_payload(payload)
-
-        # Add optional signature
-        signed_packet = SignatureChecker.pack(encrypted)
-
-        return f"verified_{signed_packet}"
+        token = await RedirectTokenHandler._build_result_token(payload, "verified")
+        return f"verified_{token}"
 
     # ------------------------------------------------------------
     # BUILD BYPASS RETURN TOKEN → bot deep-link
     # ------------------------------------------------------------
     @staticmethod
-    def build_bypass_token(user_id: int, file_id: str = None, post_no: int = None) -> str:
+    async def build_bypass_token(user_id: int, file_id: str = None, post_no: int = None) -> str:
         """
         Called when bypass detected:
          - direct access without visiting countdown page
@@ -117,23 +198,33 @@ class RedirectTokenHandler:
             "post_no": post_no
         }
 
-        encrypted = encode_payload(payload)
-        signed_packet = SignatureChecker.pack(encrypted)
+        token = await RedirectTokenHandler._build_result_token(payload, "bypass")
+        return f"bypass_{token}"
 
-        return f"bypass_{signed_packet}"
+    @staticmethod
+    async def _build_result_token(payload: dict, purpose: str) -> str:
+        if config.TOKEN_MODE == "compact":
+            # The compact ID is already an HMAC of payload + purpose
+            return await encode_token(payload, purpose, ephemeral=True)
+
+        encrypted = encode_payload({**payload, PURPOSE_FIELD: purpose})
+
+        # Add optional signature
+        return check_start_param(SignatureChecker.pack(encrypted))
 
     # ------------------------------------------------------------
     # CHECK IF USER VISITED REDIRECT PAGE (BYPASS DETECTION)
     # ------------------------------------------------------------
     @staticmethod
-    def did_user_visit(user_id: int, encrypted_token: str) -> bool:
+    async def did_user_visit(user_id: int, encrypted_token: str) -> bool:
         """
         Returns True if the user visited the redirect page
         before redirecting back to the bot.
 
-        This is your bypass detection.
+        Audit / support lookups only: /return uses the signed visit
+        ticket instead (verify_visit_ticket).
         """
-        entry = db.redirect_logs.find_one({
+        entry = await adb.redirect_logs.find_one({
             "user_id": user_id,
             "token": encrypted_token
         })
@@ -144,10 +235,10 @@ class RedirectTokenHandler:
     # CLEAN LOGS (OPTIONAL)
     # ------------------------------------------------------------
     @staticmethod
-    def cleanup_old_logs(hours: int = 6):
+    async def cleanup_old_logs(hours: int = 6):
         """
         Removes redirect logs older than X hours.
         Called by cron job.
         """
         cutoff = now() - timedelta(hours=hours)
-        db.redirect_logs.delete_many({"visited_at": {"$lt": cutoff}})
+        await adb.redirect_logs.delete_many({"visited_at": {"$lt": cutoff}})
@@ -12,7 +12,8 @@ VENV_DIR="$PROJECT_DIR/venv"
 
 ADM_BOT="bot_admin/admin_main.py"
 USR_BOT="bot_user/user_main.py"
-REDIRECT="redirect_server/redirect_main.py"
+REDIRECT_APP="redirect_server.redirect_main:app"
+REDIRECT_CONF="redirect_server/gunicorn_conf.py"
 
 LOG_DIR="$PROJECT_DIR/logs"
 mkdir -p "$LOG_DIR"
@@ -56,10 +57,13 @@ echo "[+] User Bot running in background."
 
 echo ""
 echo "-------------------------------------------"
-echo " Starting Redirect Server (Port 5000)"
+echo " Starting Redirect Server (gunicorn + uvicorn workers)"
 echo "-------------------------------------------"
 
-nohup python3 "$REDIRECT" > "$LOG_DIR/redirect_server.log" 2>&1 &
+# Bind address / worker count come from REDIRECT_HOST, REDIRECT_PORT,
+# REDIRECT_WORKERS (.env). Graceful reload:
+#   kill -HUP $(cat logs/redirect_server.pid)
+nohup gunicorn -c "$REDIRECT_CONF" "$REDIRECT_APP" > "$LOG_DIR/redirect_server.log" 2>&1 &
 echo "[+] Redirect Server running in background."
 
 echo ""
@@ -0,0 +1,57 @@
+# tests/test_compact_tokens.py
+
+"""
+Compact token IDs across a TOKEN_KEYS rotation.
+
+Only the pure HMAC part is exercised (new_document / verify_document),
+so no MongoDB is needed.
+"""
+
+from core.security.compact_tokens import CompactTokenStore
+from core.security.key_ring import KeyRing
+
+
+PAYLOAD = {"action": "get", "file_id": "BQACAgUAA", "post_no": 39}
+
+
+def _store(spec: str) -> CompactTokenStore:
+    return CompactTokenStore(KeyRing(spec, "unused-legacy-secret"), cache_size=10)
+
+
+def test_link_survives_key_rotation():
+    before = _store("k1:old-secret")
+    doc = before.new_document(PAYLOAD, "get")
+    assert doc["kid"] == "k1"
+
+    # New key first, old key still listed
+    after = _store("k2:new-secret,k1:old-secret")
+    assert after.verify_document(doc["token_id"], doc) == "get"
+
+    # New links use the new key
+    fresh = after.new_document(PAYLOAD, "get")
+    assert fresh["kid"] == "k2"
+    assert fresh["token_id"] != doc["token_id"]
+    assert after.verify_document(fresh["token_id"], fresh) == "get"
+
+
+def test_retired_key_is_rejected():
+    doc = _store("k1:old-secret").new_document(PAYLOAD, "get")
+    assert _store("k2:new-secret").verify_document(doc["token_id"], doc) is None
+
+
+def test_tampered_document_is_rejected():
+    store = _store("k1:old-secret")
+    doc = store.new_document(PAYLOAD, "get")
+
+    assert store.verify_document(doc["token_id"], {**doc, "payload": {**PAYLOAD, "post_no": 40}}) is None
+    assert store.verify_document(doc["token_id"], {**doc, "purpose": "verified"}) is None
+    assert store.verify_document(doc["token_id"], {**doc, "kid": None}) is None
+
+
+def test_ephemeral_tokens_are_unique_per_issue():
+    store = _store("k1:old-secret")
+    first = store.new_document(PAYLOAD, "redirect", ephemeral=True)
+    second = store.new_document(PAYLOAD, "redirect", ephemeral=True)
+
+    assert first["token_id"] != second["token_id"]
+    assert store.verify_document(first["token_id"], first) == "redirect"
@@ -0,0 +1,24 @@
+# tests/test_key_ring.py
+
+"""
+Key-tagged values must stay valid Telegram start parameters.
+"""
+
+import re
+
+from core.security.key_ring import KeyRing
+
+START_PARAM = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+def test_tag_is_telegram_safe_and_splits_back():
+    ring = KeyRing("k2:new-secret,k1:old-secret", "legacy")
+    value = "gAAAAABl_x-y_z"
+
+    tagged = ring.tag(value)
+    assert START_PARAM.match(tagged)
+    assert KeyRing.split(tagged) == ("k2", value)
+
+
+def test_untagged_value_is_left_alone():
+    assert KeyRing.split("0123abcdef") == (None, "0123abcdef")